@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from typing import List
 import asyncio
-import threading
 
+from app.config import settings
 from app.database import get_db
-from app.schemas import DetectionRequestSchema, DetectionRequestResponseSchema, DetectionSummarySchema
+from app.schemas import (
+    DetectionRequestSchema, DetectionRequestResponseSchema, DetectionSummarySchema,
+    BulkDetectionRequestSchema, BulkDetectionResponseSchema, CorrelationResponseSchema,
+    DomainExposureResponseSchema
+)
 from app.services.detection_service import DetectionService
 from app.models import DetectionRequest, DetectionResult
-from app.tasks.detection_tasks import run_detection_task
+from app.tasks.detection_tasks import run_detection_task, scan_new_breach_task
 
 router = APIRouter(prefix="/detection", tags=["detection"])
 
@@ -83,6 +88,29 @@ async def create_detection_request(
         print(f"❌ 탐지 요청 생성 실패: {e}")
         raise HTTPException(status_code=500, detail=f"탐지 요청 생성 실패: {str(e)}")
 
+@router.post("/bulk", response_model=BulkDetectionResponseSchema)
+async def bulk_detection(request: BulkDetectionRequestSchema):
+    """정적 DB 일괄 탐지 (수만 건을 한 번의 요청으로 조회, 결과는 저장하지 않음)"""
+    
+    if not any([request.emails, request.phones, request.names]):
+        raise HTTPException(status_code=400, detail="최소 하나의 탐지 대상이 필요합니다.")
+    
+    try:
+        # 해시 계산이 이벤트 루프를 막지 않도록 스레드에서 실행
+        results = await asyncio.to_thread(
+            detection_service.perform_bulk_detection,
+            emails=request.emails,
+            phones=request.phones,
+            names=request.names,
+            since=request.since
+        )
+        return BulkDetectionResponseSchema(**results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"❌ 일괄 탐지 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"일괄 탐지 실패: {str(e)}")
+
 def perform_detection_background_fallback(
     request_id: int,
     user_id: int,
@@ -139,6 +167,35 @@ def perform_detection_background_fallback(
         except:
             pass
 
+@router.post("/correlate", response_model=CorrelationResponseSchema)
+async def correlate_records(request: DetectionRequestSchema):
+    """레코드 교차 조회: 주어진 식별자가 모두 한 유출 레코드에 함께 있었는지와 그 레코드에서 함께 노출된 항목"""
+    
+    if not any([request.email, request.phone, request.name]):
+        raise HTTPException(status_code=400, detail="최소 하나의 탐지 대상이 필요합니다.")
+    
+    try:
+        result = await asyncio.to_thread(
+            detection_service.correlate_records,
+            email=request.email,
+            phone=request.phone,
+            name=request.name
+        )
+        return CorrelationResponseSchema(**result)
+    except Exception as e:
+        print(f"❌ 레코드 교차 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"레코드 교차 조회 실패: {str(e)}")
+
+@router.get("/domain/{domain}", response_model=DomainExposureResponseSchema)
+async def domain_exposure(domain: str, members: bool = False):
+    """조직 도메인 노출 조회: 도메인 계정이 유출 사고별로 몇 개씩 노출되었는지 (구성원을 하나씩 제출할 필요 없음)
+    members=true면 구성원 다이제스트를 저장한 경우 고유 계정 수와 이메일 SHA256 다이제스트 목록도 반환"""
+    try:
+        result = await asyncio.to_thread(detection_service.domain_exposure, domain, include_members=members)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DomainExposureResponseSchema(**result)
+
 @router.get("/requests/{request_id}", response_model=DetectionRequestResponseSchema)
 async def get_detection_request(request_id: int, db: Session = Depends(get_db)):
     """탐지 요청 조회"""
@@ -214,11 +271,73 @@ async def get_detection_summary(db: Session = Depends(get_db)):
     
     return DetectionSummarySchema(**summary)
 
+def scan_new_breach_background_fallback(breach_id: int):
+    """Celery 실패 시 백그라운드에서 새 유출 사고 역방향 조인 (대체 함수)"""
+    from app.database import SessionLocal
+    db = SessionLocal()
+    try:
+        detection_service.scan_new_breach(db, breach_id)
+    except Exception as e:
+        print(f"❌ 유출 사고 #{breach_id} 역방향 조인 실패: {e}")
+    finally:
+        db.close()
+
+def enqueue_breach_scan(breach_id: int, background_tasks: BackgroundTasks):
+    """새 유출 사고 역방향 조인 작업 등록 (Celery 실패 시 백그라운드 작업으로 대체)"""
+    try:
+        scan_new_breach_task.delay(breach_id)
+        print(f"✅ 역방향 조인 작업이 큐에 추가됨: 유출 사고 #{breach_id}")
+    except Exception as celery_error:
+        print(f"⚠️ Celery 작업 큐 추가 실패: {celery_error}")
+        background_tasks.add_task(scan_new_breach_background_fallback, breach_id)
+
 @router.post("/load-database")
-async def load_leak_database(leak_data: dict):
-    """유출 데이터베이스 로드 (관리자용)"""
+async def load_leak_database(leak_data: dict, background_tasks: BackgroundTasks):
+    """유출 데이터베이스 로드 (관리자용) - 새 유출 사고에 포함된 등록 사용자를 찾는 역방향 조인도 예약"""
     try:
-        detection_service.load_leak_database(leak_data)
-        return {"message": "유출 데이터베이스 로드 완료"}
+        breach_id = detection_service.load_leak_database(leak_data)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"데이터베이스 로드 실패: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"데이터베이스 로드 실패: {str(e)}")
+    
+    enqueue_breach_scan(breach_id, background_tasks)
+    return {"message": "유출 데이터베이스 로드 완료", "breach_id": breach_id}
+
+@router.post("/breaches/{breach_id}/scan")
+async def scan_breach(breach_id: int, background_tasks: BackgroundTasks):
+    """유출 사고 역방향 조인 (관리자용): 모든 등록 사용자/과거 탐지 대상 중 해당 사고에 포함된 사용자에게 결과 생성"""
+    detection_service.static_index.check_for_update()
+    if breach_id not in detection_service.static_detector.segments.breaches:
+        raise HTTPException(status_code=404, detail="유출 사고를 찾을 수 없습니다.")
+    
+    enqueue_breach_scan(breach_id, background_tasks)
+    return {"message": "유출 사고 역방향 조인 시작", "breach_id": breach_id}
+
+@router.post("/reload-index")
+async def reload_static_index():
+    """정적 인덱스 무중단 재로딩 (관리자용)"""
+    try:
+        status = detection_service.reload_static_index()
+        return {"message": "정적 인덱스 재로딩 시작" if status['reload_started'] else "이미 재로딩 중입니다", **status}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"정적 인덱스 재로딩 실패: {str(e)}")
+
+@router.get("/range/{prefix}", response_class=PlainTextResponse)
+async def range_query(prefix: str, request: Request, field: str = "email"):
+    """k-익명성 범위 조회: SHA256 16진수 앞 5자리만 받아 일치하는 다이제스트 나머지 자리를 한 줄씩 반환
+    (클라이언트는 대표형을 해시해야 함 - 전화번호는 E.164(+8210...), 이메일은 제공자 규칙 적용 후 소문자)
+    field=password면 비밀번호 해시 파일 알고리즘(기본 SHA-1)의 앞 5자리를 받아 '나머지 자리:출현 횟수'를 반환"""
+    try:
+        # 인덱스 갱신 확인/mmap 조회가 이벤트 루프를 막지 않도록 스레드에서 실행
+        entry = await asyncio.to_thread(detection_service.range_query, field, prefix)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {
+        'Cache-Control': f"public, max-age={settings.RANGE_CACHE_MAX_AGE}",
+        'ETag': entry['etag']
+    }
+    if request.headers.get('if-none-match') == entry['etag']:
+        return Response(status_code=304, headers=headers)
+    return PlainTextResponse(entry['body'], headers=headers)
@@ -21,11 +21,54 @@ class Settings:
     CRAWL_DELAY = float(os.getenv("CRAWL_DELAY", "2.0"))  # 초 단위 (더 안전하게 증가)
     MAX_CRAWL_PAGES = int(os.getenv("MAX_CRAWL_PAGES", "5"))  # 페이지 수 제한
     CRAWL_TIMEOUT = int(os.getenv("CRAWL_TIMEOUT", "15"))  # 크롤링 타임아웃
-    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "3"))  # 동시 요청 수 제한
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "3"))  # 동시 요청 수 제한 (호스트별)
+    CRAWL_MAX_CONNECTIONS = int(os.getenv("CRAWL_MAX_CONNECTIONS", "32"))  # 전체 동시 요청 수 (여러 호스트 병렬)
+    CRAWL_QUEUE_SIZE = int(os.getenv("CRAWL_QUEUE_SIZE", "64"))  # 가져오기/파싱/매칭 단계 사이 큐 크기
+    CRAWL_PARSE_WORKERS = int(os.getenv("CRAWL_PARSE_WORKERS", "4"))  # HTML 파싱 스레드 수
+    SHARED_CRAWL_ENABLED = os.getenv("SHARED_CRAWL_ENABLED", "false").lower() == "true"  # 시뮬레이션 대신 실제 사이트 크롤링 (동시 탐지 요청이 한 번의 크롤링을 공유)
+    SHARED_CRAWL_WINDOW = float(os.getenv("SHARED_CRAWL_WINDOW", "1.0"))  # 크롤링 시작 전 다른 요청을 모으는 시간 (초)
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"  # 크롤링 소스 사이트 HTTP 응답 디스크 캐시 (탐색 대상이 들어간 검색 요청 제외)
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "data/http_cache")  # 응답 캐시 디렉터리
+    HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", "3600"))  # 재검증 없이 사용할 최대 시간 (초, 응답 max-age가 더 짧으면 그 값)
+    HTTP_CACHE_MAX_AGE = float(os.getenv("HTTP_CACHE_MAX_AGE", "604800"))  # 재검증용으로 보관할 최대 기간 (초)
     
     # 탐지 설정
     DETECTION_TIMEOUT = int(os.getenv("DETECTION_TIMEOUT", "30"))  # 초 단위
     RISK_THRESHOLD = float(os.getenv("RISK_THRESHOLD", "0.8"))  # 위험도 임계값
+    BULK_DETECTION_MAX_ITEMS = int(os.getenv("BULK_DETECTION_MAX_ITEMS", "50000"))  # 일괄 탐지 타입별 최대 항목 수
+    
+    # 정적 유출 DB 인덱스 설정
+    STATIC_INDEX_DIR = os.getenv("STATIC_INDEX_DIR", "data/static_index")  # mmap 다이제스트 인덱스 디렉터리
+    STATIC_SNAPSHOT_PATH = os.getenv("STATIC_SNAPSHOT_PATH", "data/static_index.snapshot")  # 바이너리 인덱스 스냅샷 (있으면 우선 사용)
+    PASSWORD_HASH_PATH = os.getenv("PASSWORD_HASH_PATH", "data/password_hashes.bin")  # 정렬된 비밀번호 해시 + 출현 횟수 파일 (있으면 사용)
+    RECORD_STORE_DIR = os.getenv("RECORD_STORE_DIR", "data/breach_records")  # 컬럼형 유출 레코드 저장소 (레코드 교차 조회)
+    RECORD_CORRELATION_LIMIT = int(os.getenv("RECORD_CORRELATION_LIMIT", "100"))  # 교차 조회 최대 반환 레코드 수
+    STATIC_DOMAIN_MEMBERS = os.getenv("STATIC_DOMAIN_MEMBERS", "false").lower() == "true"  # 도메인별 노출 집계에 구성원 이메일 다이제스트도 저장
+    STATIC_BLOOM_ENABLED = os.getenv("STATIC_BLOOM_ENABLED", "true").lower() == "true"  # 미발견 조회용 Bloom 필터
+    STATIC_BLOOM_FP_RATE = float(os.getenv("STATIC_BLOOM_FP_RATE", "0.01"))  # 목표 오탐률
+    STATIC_BLOOM_BITS_PER_ENTRY = float(os.getenv("STATIC_BLOOM_BITS_PER_ENTRY", "0"))  # 원소당 비트 수 (0이면 오탐률로 계산)
+    STATIC_COMPACTION_ENABLED = os.getenv("STATIC_COMPACTION_ENABLED", "true").lower() == "true"  # 백그라운드 세그먼트 병합
+    STATIC_COMPACTION_FANOUT = int(os.getenv("STATIC_COMPACTION_FANOUT", "4"))  # 같은 레벨에 이 개수만큼 쌓이면 병합
+    STATIC_COMPACTION_INTERVAL = float(os.getenv("STATIC_COMPACTION_INTERVAL", "60"))  # 병합 점검 주기 (초)
+    STATIC_INDEX_CHECK_INTERVAL = float(os.getenv("STATIC_INDEX_CHECK_INTERVAL", "5"))  # 인덱스 갱신 확인 주기 (초)
+    PASSWORD_MAX_EDIT_DISTANCE = int(os.getenv("PASSWORD_MAX_EDIT_DISTANCE", "2"))  # 유사 비밀번호 편집 거리 임계값
+    PASSWORD_NGRAM_THRESHOLD = float(os.getenv("PASSWORD_NGRAM_THRESHOLD", "0.5"))  # 부분 문자열 유사 비밀번호 n-gram Jaccard 임계값
+    NAME_MAX_JAMO_DISTANCE = int(os.getenv("NAME_MAX_JAMO_DISTANCE", "1"))  # 유사 이름 자모 편집 거리 임계값
+    NAME_ROMAN_THRESHOLD = float(os.getenv("NAME_ROMAN_THRESHOLD", "0.6"))  # 로마자 표기 유사 이름 n-gram Jaccard 임계값
+    STATIC_SHARD_ADDRESSES = [a.strip() for a in os.getenv("STATIC_SHARD_ADDRESSES", "").split(",") if a.strip()]  # 샤드 서버 주소 (host:port, 샤드 번호 순, 2의 거듭제곱 개)
+    STATIC_SHARD_TIMEOUT = float(os.getenv("STATIC_SHARD_TIMEOUT", "5"))  # 샤드 조회 타임아웃 (초)
+    
+    # k-익명성 범위 조회 설정
+    RANGE_CACHE_SIZE = int(os.getenv("RANGE_CACHE_SIZE", "4096"))  # 캐시할 접두사 버킷 수
+    RANGE_CACHE_MAX_AGE = int(os.getenv("RANGE_CACHE_MAX_AGE", "3600"))  # CDN/브라우저 캐시 시간 (초)
+    
+    # 유출 덤프 수집 설정
+    INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "0"))  # 해시 워커 프로세스 수 (0이면 CPU 코어 수)
+    INGEST_CHUNK_LINES = int(os.getenv("INGEST_CHUNK_LINES", "200000"))  # 워커당 청크 줄 수
+    INGEST_MERGE_FAN_IN = int(os.getenv("INGEST_MERGE_FAN_IN", "64"))  # 한 번에 병합할 런 파일 수 (초과 시 단계별 병합)
+    INGEST_SORT_BUFFER_RECORDS = int(os.getenv("INGEST_SORT_BUFFER_RECORDS", "1000000"))  # 외부 정렬 시 메모리에 모을 최대 레코드 수
+    BREACH_SCAN_MAX_RETRIES = int(os.getenv("BREACH_SCAN_MAX_RETRIES", "3"))  # 새 유출 사고가 인덱스에 아직 없을 때 역방향 조인 재시도 횟수
+    BREACH_SCAN_RETRY_DELAY = int(os.getenv("BREACH_SCAN_RETRY_DELAY", "10"))  # 역방향 조인 재시도 간격 (초)
     
     # API 탐지 설정
     HIBP_API_KEY = os.getenv("HIBP_API_KEY")  # HaveIBeenPwned API 키
@@ -0,0 +1,101 @@
+from typing import Iterable, List, Optional, Tuple
+
+
+def levenshtein_distance(source: str, target: str) -> int:
+    """두 문자열의 Levenshtein 편집 거리 (Myers/Hyyrö 비트 병렬 알고리즘, 짧은 문자열 기준 O(n))"""
+    if source == target:
+        return 0
+    if len(source) > len(target):
+        source, target = target, source
+    if not source:
+        return len(target)
+
+    # source의 문자별 위치 비트마스크
+    peq = {}
+    for i, char in enumerate(source):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    length = len(source)
+    mask = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive, negative = mask, 0  # 세로 방향 +1 / -1 델타 비트
+    distance = length
+
+    for char in target:
+        eq = peq.get(char, 0)
+        xv = eq | negative
+        xh = (((eq & positive) + positive) ^ positive) | eq
+        horizontal_positive = negative | (~(xh | positive) & mask)
+        horizontal_negative = positive & xh
+
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+
+        horizontal_positive = ((horizontal_positive << 1) | 1) & mask
+        horizontal_negative = (horizontal_negative << 1) & mask
+        positive = horizontal_negative | (~(xv | horizontal_positive) & mask)
+        negative = horizontal_positive & xv
+
+    return distance
+
+
+class BKTree:
+    """Levenshtein 거리 기반 BK-트리 (삼각 부등식으로 거리 임계값 밖의 가지를 건너뜀)"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        # 노드: [단어, {부모와의 거리: 자식 노드}]
+        self._root = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        """단어 추가 (이미 있으면 무시)"""
+        if self._root is None:
+            self._root = [word, {}]
+            self._size = 1
+            return
+
+        node = self._root
+        while True:
+            distance = levenshtein_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                self._size += 1
+                return
+            node = child
+
+    def search(self, query: str, max_distance: int) -> List[Tuple[int, str]]:
+        """query와 편집 거리 max_distance 이하인 단어 목록 (거리순 정렬)"""
+        if self._root is None:
+            return []
+
+        matches = []
+        stack = [self._root]
+        while stack:
+            word, children = stack.pop()
+            distance = levenshtein_distance(query, word)
+            if distance <= max_distance:
+                matches.append((distance, word))
+
+            # |d(q, c) - d(q, n)| <= d(n, c) 이므로 [d - k, d + k] 범위의 자식만 탐색
+            for child_distance in range(max(1, distance - max_distance), distance + max_distance + 1):
+                child = children.get(child_distance)
+                if child is not None:
+                    stack.append(child)
+
+        matches.sort()
+        return matches
+
+    def closest(self, query: str, max_distance: int) -> Optional[Tuple[int, str]]:
+        """편집 거리 max_distance 이하에서 가장 가까운 단어"""
+        matches = self.search(query, max_distance)
+        return matches[0] if matches else None
+
+    def __len__(self) -> int:
+        return self._size
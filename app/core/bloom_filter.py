@@ -0,0 +1,135 @@
+import math
+import mmap
+import struct
+import numpy as np
+from typing import List, Optional
+
+BLOCK_BITS = 512  # 블록 크기 (64바이트 = 캐시 라인 1개)
+BLOCK_BYTES = BLOCK_BITS // 8
+HEADER_FORMAT = '<4sQIQ'  # magic, 블록 수, 해시 함수 수, 원소 수
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b'BLM1'
+
+
+def _as_records(digests: List[bytes]) -> np.ndarray:
+    """다이제스트 목록을 (n, 32) uint8 배열로 변환"""
+    return np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(-1, 32)
+
+
+def _hash_words(records: np.ndarray):
+    """SHA256 다이제스트에서 독립적인 64비트 해시 3개 추출 (지문용 앞 8바이트는 제외)"""
+    words = np.ascontiguousarray(records[:, 8:32]).view('<u8')
+    return words[:, 0], words[:, 1], words[:, 2] | np.uint64(1)
+
+
+class BloomFilter:
+    """블록 단위 Bloom 필터 (원소당 캐시 라인 1개만 접근)"""
+
+    def __init__(self, num_blocks: int, num_hashes: int, bits: Optional[np.ndarray] = None, count: int = 0):
+        self.num_blocks = max(1, num_blocks)
+        self.num_hashes = max(1, num_hashes)
+        self.bits = bits if bits is not None else np.zeros(self.num_blocks * BLOCK_BYTES, dtype=np.uint8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float = 0.01,
+                     bits_per_entry: Optional[float] = None) -> 'BloomFilter':
+        """원소 수와 목표 오탐률(또는 원소당 비트 수)로 필터 생성"""
+        capacity = max(1, capacity)
+        if not bits_per_entry:
+            # 최적 비트 수: m/n = -ln(p) / (ln 2)^2
+            bits_per_entry = -math.log(fp_rate) / (math.log(2) ** 2)
+        num_bits = int(math.ceil(capacity * bits_per_entry))
+        num_hashes = max(1, int(round(bits_per_entry * math.log(2))))
+        return cls(int(math.ceil(num_bits / BLOCK_BITS)), num_hashes)
+
+    @classmethod
+    def from_records_buffer(cls, buffer, count: int, fp_rate: float = 0.01,
+                            bits_per_entry: Optional[float] = None,
+                            chunk_size: int = 1 << 20) -> 'BloomFilter':
+        """정렬된 다이제스트 레코드 버퍼(mmap 등)로부터 청크 단위로 필터 생성"""
+        bloom = cls.for_capacity(count, fp_rate, bits_per_entry)
+        records = np.frombuffer(buffer, dtype=np.uint8, count=count * 32).reshape(-1, 32) if count else None
+        for start in range(0, count, chunk_size):
+            bloom.add_records(records[start:start + chunk_size])
+        return bloom
+
+    def _positions(self, records: np.ndarray):
+        """각 다이제스트의 블록 번호와 블록 내 비트 위치들 계산"""
+        h1, h2, h3 = _hash_words(records)
+        blocks = (h1 % np.uint64(self.num_blocks)).astype(np.int64)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        offsets = ((h2[:, None] + steps[None, :] * h3[:, None]) % np.uint64(BLOCK_BITS)).astype(np.int64)
+        return blocks * BLOCK_BITS, offsets
+
+    def add_records(self, records: np.ndarray):
+        """(n, 32) uint8 다이제스트 레코드 배열 추가"""
+        if len(records) == 0:
+            return
+        bases, offsets = self._positions(records)
+        positions = (bases[:, None] + offsets).ravel()
+        np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.count += len(records)
+
+    def might_contain_many(self, digests: List[bytes]) -> np.ndarray:
+        """다이제스트 배치 조회 (False면 확실히 없음)"""
+        if not digests:
+            return np.zeros(0, dtype=bool)
+        bases, offsets = self._positions(_as_records(digests))
+        positions = bases[:, None] + offsets
+        hits = (self.bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return bool(self.might_contain_many([digest])[0])
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+    @property
+    def bits_per_entry(self) -> float:
+        return self.size_bytes * 8 / max(1, self.count)
+
+    @property
+    def expected_fp_rate(self) -> float:
+        """현재 원소 수 기준 예상 오탐률 (표준 Bloom 근사식)"""
+        if self.count == 0:
+            return 0.0
+        num_bits = self.size_bytes * 8
+        return (1 - math.exp(-self.num_hashes * self.count / num_bits)) ** self.num_hashes
+
+    def get_statistics(self) -> dict:
+        """필터 통계 정보"""
+        return {
+            'entries': self.count,
+            'size_bytes': self.size_bytes,
+            'num_hashes': self.num_hashes,
+            'bits_per_entry': round(self.bits_per_entry, 2),
+            'expected_fp_rate': round(self.expected_fp_rate, 6)
+        }
+
+    def to_bytes(self) -> bytes:
+        """헤더 + 비트 배열 직렬화"""
+        return struct.pack(HEADER_FORMAT, MAGIC, self.num_blocks, self.num_hashes, self.count) + self.bits.tobytes()
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'BloomFilter':
+        """직렬화된 필터를 복사 없이 읽기 전용으로 사용 (스냅샷 mmap 구간 등)"""
+        magic, num_blocks, num_hashes, count = struct.unpack_from(HEADER_FORMAT, buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Bloom 필터 형식 오류")
+        bits = np.frombuffer(buffer, dtype=np.uint8, offset=HEADER_SIZE)
+        return cls(num_blocks, num_hashes, bits=bits, count=count)
+
+    def save(self, path: str):
+        """필터를 파일로 저장"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def open(cls, path: str) -> 'BloomFilter':
+        """저장된 필터 파일을 읽기 전용 mmap으로 열기 (프로세스 간 공유, 조회 전용)"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(buffer)
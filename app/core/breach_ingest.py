@@ -0,0 +1,222 @@
+import os
+import io
+import csv
+import glob
+import gzip
+import shutil
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.core.digest_index import DIGEST_SIZE, DigestIndex
+from app.core.segment_store import INDEX_FIELDS, SegmentStore
+from app.core.canonicalize import digest_identifier, normalize_identifier
+from app.core.domain_index import DOMAIN_MEMBER_SIZE, domain_digest, email_domain
+from app.core.external_sort import merge_unique, reduce_runs, write_run
+
+# CSV 헤더 → 탐지 타입 매핑
+CSV_COLUMN_FIELDS = {
+    'email': 'email', 'e-mail': 'email', 'mail': 'email', '이메일': 'email',
+    'phone': 'phone', 'mobile': 'phone', 'tel': 'phone', 'phone_number': 'phone', '전화번호': 'phone',
+    'name': 'name', 'full_name': 'name', 'fullname': 'name', '이름': 'name',
+}
+
+COMBO_SEPARATORS = (':', ';', '|', '\t', ',')
+
+
+def detect_dump_format(path: str) -> str:
+    """파일 이름으로 덤프 형식 추정 (csv 또는 combo)"""
+    name = path.lower()
+    for suffix in ('.gz', '.zip'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return 'csv' if name.endswith('.csv') else 'combo'
+
+
+def iter_dump_lines(path: str) -> Iterator[str]:
+    """덤프 파일을 한 줄씩 스트리밍 (gzip/zip 압축 지원)"""
+    if path.lower().endswith('.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+            yield from f
+    elif path.lower().endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.is_dir():
+                    continue
+                with archive.open(member) as raw:
+                    yield from io.TextIOWrapper(raw, encoding='utf-8', errors='replace')
+    else:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            yield from f
+
+
+def iter_chunks(lines: Iterator[str], chunk_lines: int) -> Iterator[List[str]]:
+    """줄 스트림을 고정 크기 청크로 분할"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_combo_line(line: str) -> List[Tuple[str, str]]:
+    """콤보 리스트 한 줄(email:password 등)에서 식별자 추출"""
+    line = line.strip()
+    if not line:
+        return []
+
+    identifier = line
+    for separator in COMBO_SEPARATORS:
+        if separator in line:
+            identifier = line.split(separator, 1)[0]
+            break
+
+    identifier = identifier.strip()
+    if '@' in identifier:
+        return [('email', identifier)]
+
+    digits = ''.join(filter(str.isdigit, identifier))
+    if len(digits) >= 9 and len(digits) >= len(identifier.replace('-', '').replace(' ', '').replace('+', '')):
+        return [('phone', identifier)]
+
+    return []
+
+
+def parse_csv_lines(lines: List[str], header: List[str]) -> Iterator[Tuple[str, str]]:
+    """CSV 청크에서 헤더 기준으로 식별자 추출"""
+    columns = [(i, CSV_COLUMN_FIELDS[column.strip().lower()])
+               for i, column in enumerate(header)
+               if column.strip().lower() in CSV_COLUMN_FIELDS]
+
+    for row in csv.reader(lines):
+        for i, field in columns:
+            if i < len(row) and row[i].strip():
+                yield field, row[i]
+
+
+def _process_chunk(chunk_id: int, lines: List[str], dump_format: str,
+                   header: Optional[List[str]], run_dir: str) -> Dict[str, int]:
+    """워커 프로세스: 청크 정규화/해시 후 필드별 정렬 런 파일 저장
+    (이메일은 도메인별 집계용 쌍 런 파일, 이름은 유사 이름 검색용 대표형 줄 단위 런 파일도 저장)"""
+    digests = {field: set() for field in INDEX_FIELDS}
+    domain_pairs = set()
+    name_patterns = set()
+
+    if dump_format == 'csv':
+        pairs = parse_csv_lines(lines, header or [])
+    else:
+        pairs = (pair for line in lines for pair in parse_combo_line(line))
+
+    for field, value in pairs:
+        digest = digest_identifier(field, value)
+        if digest:
+            digests[field].add(digest)
+            if field == 'email':
+                domain = email_domain(value)
+                if domain:
+                    domain_pairs.add(domain_digest(domain) + digest)
+            elif field == 'name':
+                pattern = normalize_identifier(field, value)
+                if '\n' not in pattern:
+                    name_patterns.add(pattern)
+
+    counts = {}
+    for field, values in digests.items():
+        if values:
+            path = os.path.join(run_dir, f"{field}-{chunk_id:08d}.digests")
+            counts[field] = DigestIndex.write(path, values)
+    if domain_pairs:
+        write_run(os.path.join(run_dir, f"domains-{chunk_id:08d}.pairs"), sorted(domain_pairs), DOMAIN_MEMBER_SIZE)
+    if name_patterns:
+        write_run(os.path.join(run_dir, f"names-{chunk_id:08d}.lines"), sorted(name_patterns))
+    return counts
+
+
+class BreachDumpIngestor:
+    """대용량 유출 덤프 스트리밍 병렬 수집기"""
+
+    def __init__(self, index_dir: str = settings.STATIC_INDEX_DIR,
+                 workers: Optional[int] = None,
+                 chunk_lines: int = settings.INGEST_CHUNK_LINES,
+                 merge_fan_in: int = settings.INGEST_MERGE_FAN_IN):
+        self.index_dir = index_dir
+        self.workers = workers or settings.INGEST_WORKERS or os.cpu_count() or 1
+        self.chunk_lines = chunk_lines
+        self.merge_fan_in = merge_fan_in
+        self.run_dir = os.path.join(index_dir, 'runs', f"ingest-{os.getpid()}")
+
+    def _submit_chunks(self, executor, path: str, dump_format: str, next_chunk_id: int) -> int:
+        """파일을 청크 단위로 워커에 제출 (진행 중인 청크 수를 제한하여 메모리 상한 유지)"""
+        lines = iter_dump_lines(path)
+        header = None
+        if dump_format == 'csv':
+            first_line = next(lines, None)
+            if first_line is None:
+                return next_chunk_id
+            header = next(csv.reader([first_line]))
+
+        pending = set()
+        max_pending = self.workers * 2
+
+        for chunk in iter_chunks(lines, self.chunk_lines):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+            pending.add(executor.submit(
+                _process_chunk, next_chunk_id, chunk, dump_format, header, self.run_dir
+            ))
+            next_chunk_id += 1
+
+        for future in pending:
+            future.result()
+
+        return next_chunk_id
+
+    def ingest(self, paths: List[str], dump_format: Optional[str] = None,
+               name: Optional[str] = None, first_seen: Optional[str] = None) -> Dict:
+        """덤프 파일들을 수집하여 새 인덱스 세그먼트(유출 사고 하나)로 추가"""
+        start_time = time.time()
+        os.makedirs(self.run_dir, exist_ok=True)
+
+        chunk_id = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for path in paths:
+                print(f"📥 덤프 수집 중: {path}")
+                chunk_id = self._submit_chunks(executor, path, dump_format or detect_dump_format(path), chunk_id)
+
+            # 청크 런(정렬/중복 제거된 파일)이 fan-in보다 많으면 워커들이 묶음별로 병렬 병합 (외부 병합 정렬)
+            field_runs = {
+                field: reduce_runs(glob.glob(os.path.join(self.run_dir, f"{field}-*.digests")), self.run_dir,
+                                   self.merge_fan_in, DIGEST_SIZE, executor, prefix=field)
+                for field in INDEX_FIELDS
+            }
+            pair_runs = reduce_runs(glob.glob(os.path.join(self.run_dir, "domains-*.pairs")), self.run_dir,
+                                    self.merge_fan_in, DOMAIN_MEMBER_SIZE, executor, prefix='domains')
+            name_runs = reduce_runs(glob.glob(os.path.join(self.run_dir, "names-*.lines")), self.run_dir,
+                                    self.merge_fan_in, executor=executor, prefix='names')
+
+        # 남은 런들을 순차 읽기로 k-way 병합(중복 제거)하여 하나의 새 세그먼트로 추가 (기존 세그먼트는 그대로 유지)
+        field_digests = {field: merge_unique(runs, DIGEST_SIZE) for field, runs in field_runs.items()}
+        domain_pairs = ((pair[:DIGEST_SIZE], pair[DIGEST_SIZE:]) for pair in merge_unique(pair_runs, DOMAIN_MEMBER_SIZE))
+        name_patterns = merge_unique(name_runs)
+
+        # 병합(컴팩션)은 상주 중인 API/워커 프로세스에 맡김 (스크립트 종료 시 중단 방지)
+        store = SegmentStore(self.index_dir, background_compaction=False)
+        segment = store.add_segment(field_digests, name=name, first_seen=first_seen, domain_pairs=domain_pairs,
+                                    name_patterns=name_patterns)
+
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+        counts = segment.get_statistics()['counts']
+        elapsed = time.time() - start_time
+        print(f"✅ 덤프 수집 완료: {chunk_id}개 청크, {elapsed:.2f}초 (세그먼트 #{segment.segment_id})")
+        print(f"   필드별 인덱스 크기: {counts}")
+
+        return {'chunks': chunk_id, 'segment_id': segment.segment_id, 'counts': counts, 'elapsed': elapsed}
@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.canonicalize import digest_identifier
+from app.core.digest_index import DigestIndex
+from app.core.segment_store import INDEX_FIELDS, SegmentStore
+
+# 감시 항목: (다이제스트, 사용자 번호, 원래 값)
+WatchEntry = Tuple[bytes, int, str]
+
+
+def build_watchlist(identifiers: Iterable[Tuple[int, str, Optional[str]]]) -> Dict[str, List[WatchEntry]]:
+    """(사용자 번호, 탐지 타입, 값) 목록을 필드별 다이제스트 순 감시 목록으로 변환
+    같은 사용자의 같은 대표형은 하나만 남김 (users와 과거 탐지 요청에 같은 값이 여러 번 있어도 결과는 한 번)"""
+    seen = set()
+    watchlist: Dict[str, List[WatchEntry]] = {field: [] for field in INDEX_FIELDS}
+    for user_id, field, value in identifiers:
+        if field not in watchlist or not value:
+            continue
+        digest = digest_identifier(field, value)
+        if digest is None or (field, digest, user_id) in seen:
+            continue
+        seen.add((field, digest, user_id))
+        watchlist[field].append((digest, user_id, value))
+
+    for entries in watchlist.values():
+        entries.sort()
+    return watchlist
+
+
+def merge_join(watch: List[WatchEntry], digests: DigestIndex) -> Iterator[Tuple[int, WatchEntry]]:
+    """정렬된 감시 목록과 정렬된 유출 다이제스트의 정렬 병합 조인 (일치한 위치, 감시 항목)
+    유출 쪽은 앞으로만 진행하며, 감시 목록이 훨씬 작으면 지수 탐색으로 건너뛰어 읽는 범위를 줄임"""
+    position, count = 0, len(digests)
+    for entry in watch:
+        digest = entry[0]
+        if position >= count:
+            break
+        if digests.digest_at(position) < digest:
+            # 지수 탐색으로 digest를 넘는 지점을 찾은 뒤 그 구간만 이진 탐색
+            step, low = 1, position
+            while position + step < count and digests.digest_at(position + step) < digest:
+                low = position + step
+                step *= 2
+            position = digests.bisect_left(digest, low, min(position + step, count))
+        if position < count and digests.digest_at(position) == digest:
+            yield position, entry
+
+
+def join_breach(store: SegmentStore, breach_id: int,
+                watchlist: Dict[str, List[WatchEntry]]) -> List[Tuple[str, int, str]]:
+    """유출 사고 하나에 포함된 감시 식별자 (탐지 타입, 사용자 번호, 원래 값)
+    해당 사고를 담은 세그먼트만 한 번씩 훑으며, 병합된 세그먼트는 출처 목록으로 그 사고의 항목인지 확인"""
+    matches = []
+    with store.pinned() as segments:
+        for segment in segments:
+            if breach_id not in segment.breach_ids:
+                continue
+            for field in INDEX_FIELDS:
+                watch = watchlist.get(field)
+                if not watch:
+                    continue
+                for position, (_, user_id, value) in merge_join(watch, segment.stores[field].digests):
+                    if breach_id in segment.breach_ids_at(field, position):
+                        matches.append((field, user_id, value))
+    return matches
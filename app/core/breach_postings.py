@@ -0,0 +1,141 @@
+import io
+import os
+import mmap
+import shutil
+import struct
+from array import array
+import numpy as np
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.digest_index import DIGEST_SIZE
+
+POSTINGS_MAGIC = b'PST1'
+POSTINGS_HEADER = struct.Struct('<4sQ')  # 매직, 항목 수 (이후 (항목 수 + 1)개의 uint64 오프셋, 가변 길이 데이터)
+
+
+def encode_postings(breach_ids: Iterable[int]) -> bytes:
+    """정렬된 유출 사고 번호 목록을 델타 + varint로 인코딩"""
+    out = bytearray()
+    previous = 0
+    for breach_id in sorted(set(breach_ids)):
+        delta = breach_id - previous
+        previous = breach_id
+        while delta >= 0x80:
+            out.append((delta & 0x7f) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data) -> Tuple[int, ...]:
+    """델타 + varint 인코딩된 유출 사고 번호 목록 복원"""
+    breach_ids = []
+    value, shift, previous = 0, 0, 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        breach_ids.append(previous)
+        value, shift = 0, 0
+    return tuple(breach_ids)
+
+
+def merge_entries(sorted_entries: Iterable[Tuple[bytes, Sequence[int]]]) -> Iterator[Tuple[bytes, Tuple[int, ...]]]:
+    """(다이제스트, 유출 사고 번호들) 정렬 스트림에서 같은 다이제스트를 하나로 합침"""
+    current, breach_ids = None, set()
+    for digest, ids in sorted_entries:
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"잘못된 다이제스트 길이: {len(digest)}")
+        if digest != current:
+            if current is not None:
+                yield current, tuple(sorted(breach_ids))
+            current, breach_ids = digest, set()
+        breach_ids.update(ids)
+    if current is not None:
+        yield current, tuple(sorted(breach_ids))
+
+
+class BreachPostings:
+    """다이제스트 위치별 유출 사고 번호 목록 (오프셋 배열 + 델타 varint 데이터, mmap)"""
+
+    def __init__(self, buffer=b'', path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        self._file = None
+        self._count = 0
+        self._offsets = np.zeros(1, dtype=np.uint64)
+        self._data_start = 0
+
+        if len(buffer):
+            magic, self._count = POSTINGS_HEADER.unpack_from(buffer, 0)
+            if magic != POSTINGS_MAGIC:
+                raise ValueError(f"손상된 유출 출처 파일: {path}")
+            self._offsets = np.frombuffer(buffer, dtype='<u8', count=self._count + 1, offset=POSTINGS_HEADER.size)
+            self._data_start = POSTINGS_HEADER.size + (self._count + 1) * 8
+
+    @classmethod
+    def open(cls, path: str) -> 'BreachPostings':
+        """출처 파일을 읽기 전용 mmap으로 열기"""
+        f = open(path, 'rb')
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        postings = cls(buffer, path=path)
+        postings._file = f
+        return postings
+
+    def ids_at(self, position: int) -> Tuple[int, ...]:
+        """position 번째 다이제스트의 유출 사고 번호들"""
+        start = self._data_start + int(self._offsets[position])
+        end = self._data_start + int(self._offsets[position + 1])
+        return decode_postings(self._buffer[start:end])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        """mmap 및 파일 핸들 해제"""
+        self._offsets = np.zeros(1, dtype=np.uint64)
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._buffer = b''
+        self._count = 0
+
+
+def write_entries(digest_path: Optional[str], postings_path: Optional[str],
+                  sorted_entries: Iterable[Tuple[bytes, Sequence[int]]]) -> Tuple[bytes, bytes, List[int]]:
+    """(다이제스트, 유출 사고 번호들) 정렬 스트림을 다이제스트/출처 파일로 저장 (같은 다이제스트는 합침)
+    경로가 None이면 메모리 버퍼로 반환 (반환값: 다이제스트 버퍼, 출처 버퍼, 포함된 유출 사고 번호)"""
+    on_disk = digest_path is not None and postings_path is not None
+    digest_out = open(f"{digest_path}.tmp", 'wb') if on_disk else io.BytesIO()
+    data_out = open(f"{postings_path}.data.tmp", 'w+b') if on_disk else io.BytesIO()
+    offsets = array('Q', [0])
+    breach_ids = set()
+
+    try:
+        for digest, ids in merge_entries(sorted_entries):
+            digest_out.write(digest)
+            data_out.write(encode_postings(ids))
+            offsets.append(data_out.tell())
+            breach_ids.update(ids)
+
+        header = POSTINGS_HEADER.pack(POSTINGS_MAGIC, len(offsets) - 1) + np.frombuffer(offsets, dtype=np.uint64).astype('<u8').tobytes()
+        if not on_disk:
+            return digest_out.getvalue(), header + data_out.getvalue(), sorted(breach_ids)
+
+        # 헤더 + 오프셋 + 데이터 순으로 조립 후 원자적으로 교체
+        with open(f"{postings_path}.tmp", 'wb') as f:
+            f.write(header)
+            data_out.seek(0)
+            shutil.copyfileobj(data_out, f)
+    finally:
+        digest_out.close()
+        data_out.close()
+
+    os.replace(f"{digest_path}.tmp", digest_path)
+    os.replace(f"{postings_path}.tmp", postings_path)
+    os.remove(f"{postings_path}.data.tmp")
+    return b'', b'', sorted(breach_ids)
@@ -0,0 +1,99 @@
+import hashlib
+from typing import Optional
+
+# 정규화 규칙이 바뀌면 증가 (이전 규칙으로 만든 세그먼트는 재생성 필요)
+NORMALIZATION_VERSION = 2
+
+KOREA_COUNTRY_CODE = '82'
+
+# 로컬 파트의 점(.)을 무시하는 제공자
+DOT_INSENSITIVE_DOMAINS = {'gmail.com'}
+
+# '+태그' 하위 주소를 지원하는 제공자 (태그를 떼어도 같은 메일함)
+PLUS_ADDRESSING_DOMAINS = {
+    'gmail.com', 'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
+    'icloud.com', 'me.com', 'mac.com', 'protonmail.com', 'proton.me',
+    'fastmail.com', 'yahoo.com'
+}
+
+# 같은 메일함을 가리키는 도메인 별칭
+DOMAIN_ALIASES = {
+    'googlemail.com': 'gmail.com',
+}
+
+
+def canonical_email(email: str) -> str:
+    """제공자별 규칙을 반영한 이메일 대표형 (예: J.Doe+news@GoogleMail.com → jdoe@gmail.com)"""
+    email = email.strip().lower()
+    local, separator, domain = email.rpartition('@')
+    if not separator or not local or not domain:
+        return email
+
+    domain = DOMAIN_ALIASES.get(domain, domain)
+    if domain in PLUS_ADDRESSING_DOMAINS:
+        local = local.split('+', 1)[0]
+    if domain in DOT_INSENSITIVE_DOMAINS:
+        local = local.replace('.', '')
+
+    return f"{local}@{domain}" if local else email
+
+
+def canonical_phone(phone: str) -> str:
+    """전화번호 대표형 - 한국 번호는 E.164(+82...), 그 외 국제 번호는 +숫자, 나머지는 숫자만"""
+    phone = phone.strip()
+    digits = ''.join(filter(str.isdigit, phone))
+    if not digits:
+        return ''
+
+    international = phone.startswith('+')
+    if not international and digits.startswith('00'):
+        # 국제 전화 접두사 (00 / 001 / 002 등 통신사 식별번호 포함은 00만 처리)
+        digits, international = digits[2:], True
+
+    if international:
+        if digits.startswith(KOREA_COUNTRY_CODE):
+            national = digits[len(KOREA_COUNTRY_CODE):]
+            # +82 010... 처럼 국가번호 뒤에 국내 접두 0을 붙인 경우
+            return f"+{KOREA_COUNTRY_CODE}{national[1:] if national.startswith('0') else national}"
+        return f"+{digits}"
+
+    # 국가번호가 +없이 붙은 한국 휴대전화 (8210...)
+    if digits.startswith(KOREA_COUNTRY_CODE + '1') and len(digits) in (11, 12):
+        return f"+{digits}"
+
+    # 국내 형식 (010-1234-5678, 02-123-4567 등)
+    if digits.startswith('0') and 9 <= len(digits) <= 11:
+        return f"+{KOREA_COUNTRY_CODE}{digits[1:]}"
+
+    return digits
+
+
+def canonical_name(name: str) -> str:
+    """이름 대표형 (소문자, 연속 공백 하나로)"""
+    return ' '.join(name.split()).lower()
+
+
+def canonicalize(field: str, value: Optional[str]) -> str:
+    """탐지 타입별 대표형 (인덱스 생성과 조회 모두 이 함수만 사용)"""
+    if not value:
+        return ''
+    if field == 'email':
+        return canonical_email(value)
+    if field == 'phone':
+        return canonical_phone(value)
+    if field == 'name':
+        return canonical_name(value)
+    return value.lower().strip()
+
+
+def normalize_identifier(field: str, value: str) -> str:
+    """탐지 타입별 식별자 대표형 (인덱스 생성과 조회에서 공통 사용 - 변형은 인덱스 시점에 하나로 모임)"""
+    return canonicalize(field, value)
+
+
+def digest_identifier(field: str, value: str) -> Optional[bytes]:
+    """정규화된 식별자의 SHA256 원시 다이제스트 (정규화 결과가 비면 None)"""
+    normalized = normalize_identifier(field, value)
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode()).digest()
@@ -0,0 +1,207 @@
+import asyncio
+import time
+import aiohttp
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+from app.config import settings
+from app.core.http_cache import HttpCache, fetch_text
+
+
+class HostScheduler:
+    """호스트별 예의(politeness) 스케줄러
+    같은 호스트는 동시 요청 수(per_host)와 요청 시작 간격(delay)을 지키고, 서로 다른 호스트는 전체 한도(total)까지 병렬로 요청"""
+
+    def __init__(self, delay: float = settings.CRAWL_DELAY,
+                 per_host: int = settings.MAX_CONCURRENT_REQUESTS,
+                 total: int = settings.CRAWL_MAX_CONNECTIONS):
+        self.delay = delay
+        self.per_host = max(1, per_host)
+        self.total = max(1, total)
+        self._total_semaphore = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self.requests: Dict[str, int] = {}
+        self.wait_time = 0.0  # 간격 유지를 위해 기다린 시간 합계 (초)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """url 요청 슬롯 (호스트 한도 → 시작 간격 대기 → 전체 한도 순으로 획득)"""
+        # 세마포어는 실행 중인 이벤트 루프에서 만들어야 함
+        if self._total_semaphore is None:
+            self._total_semaphore = asyncio.Semaphore(self.total)
+        host = urlparse(url).netloc.lower()
+        host_semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        async with host_semaphore:
+            # 다음 시작 가능 시각을 먼저 예약해 같은 호스트 요청들이 delay 간격으로 줄을 서게 함
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay
+            if start > now:
+                self.wait_time += start - now
+                await asyncio.sleep(start - now)
+
+            # 간격을 기다리는 동안에는 전체 한도를 차지하지 않음 (다른 호스트 요청이 먼저 진행)
+            async with self._total_semaphore:
+                self.requests[host] = self.requests.get(host, 0) + 1
+                yield
+
+    def get_statistics(self) -> Dict:
+        return {
+            'hosts': len(self.requests),
+            'requests': sum(self.requests.values()),
+            'max_requests_per_host': max(self.requests.values(), default=0),
+            'politeness_wait': round(self.wait_time, 2)
+        }
+
+
+class CrawlPipeline:
+    """가져오기 → 파싱 → 매칭 3단계 비동기 크롤링 파이프라인
+    가져오기는 URL마다 작업을 만들어 스케줄러가 호스트별로 조절하고, 단계 사이는 크기 제한 큐로 역압을 걸어
+    전체 소요 시간이 호스트별 소요 시간의 합이 아니라 가장 느린 호스트에 좌우되도록 함
+
+    작업(job)은 {'url', 'search_method', 'follow_links'} 사전
+    parse(job, content) → (매칭할 텍스트, 따라갈 링크 목록) 또는 건너뛸 때 None (스레드에서 실행)
+    match(job, text) → 결과 목록"""
+
+    def __init__(self, session: aiohttp.ClientSession,
+                 parse: Callable[[Dict, str], Optional[Tuple[str, List[str]]]],
+                 match: Callable[[Dict, str], List[Dict]],
+                 scheduler: Optional[HostScheduler] = None,
+                 should_skip: Optional[Callable[[str], bool]] = None,
+                 max_links: int = settings.MAX_CRAWL_PAGES,
+                 queue_size: int = settings.CRAWL_QUEUE_SIZE,
+                 parse_workers: int = settings.CRAWL_PARSE_WORKERS,
+                 cache: Optional[HttpCache] = None):
+        self.session = session
+        self.parse = parse
+        self.match = match
+        self.scheduler = scheduler or HostScheduler()
+        self.should_skip = should_skip
+        self.max_links = max_links
+        self.queue_size = max(1, queue_size)
+        self.parse_workers = max(1, parse_workers)
+        self.cache = cache
+        self.stats = {'fetched': 0, 'failed': 0, 'skipped': 0, 'bytes': 0, 'elapsed': 0.0}
+
+    async def run(self, seeds: Iterable[Dict]) -> List[Dict]:
+        """시작 작업들을 모두 처리하고 (따라간 링크 포함) 매칭 결과 반환"""
+        start_time = time.time()
+        self._pages: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._texts: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._results: List[Dict] = []
+        self._seen: Set[str] = set()
+        self._fetches: Set[asyncio.Task] = set()
+        self._pending = 0
+        self._done = asyncio.Event()
+
+        for job in seeds:
+            self._enqueue(job)
+        if self._pending == 0:
+            self._done.set()
+            return []
+
+        workers = [asyncio.create_task(self._parse_worker()) for _ in range(self.parse_workers)]
+        workers.append(asyncio.create_task(self._match_worker()))
+        try:
+            await self._done.wait()
+        finally:
+            for task in workers + list(self._fetches):
+                task.cancel()
+            await asyncio.gather(*workers, *self._fetches, return_exceptions=True)
+
+        self.stats['elapsed'] = time.time() - start_time
+        return self._results
+
+    @property
+    def running(self) -> bool:
+        """실행 중이며 아직 모든 작업이 끝나지 않았는지 (끝난 뒤에는 작업을 추가할 수 없음)"""
+        return hasattr(self, '_done') and not self._done.is_set()
+
+    def add(self, job: Dict) -> bool:
+        """실행 중인 파이프라인에 작업 추가 (이미 끝났으면 False)"""
+        if not self.running:
+            return False
+        self._enqueue(job)
+        return True
+
+    def _enqueue(self, job: Dict):
+        """작업 추가 (이미 본 URL/제외 URL은 무시) - URL마다 가져오기 작업 생성"""
+        url = job['url']
+        if url in self._seen or (self.should_skip and self.should_skip(url)):
+            return
+        self._seen.add(url)
+        self._pending += 1
+        task = asyncio.create_task(self._fetch(job))
+        self._fetches.add(task)
+        task.add_done_callback(self._fetches.discard)
+
+    def _finish(self):
+        """작업 하나가 파이프라인을 빠져나감 (모두 끝나면 종료 신호)"""
+        self._pending -= 1
+        if self._pending == 0:
+            self._done.set()
+
+    async def _fetch(self, job: Dict):
+        """가져오기 단계: 호스트 슬롯을 얻어 요청 후 파싱 큐로 전달 (큐가 차면 대기)
+        유효한 캐시 응답은 호스트에 요청하지 않으므로 슬롯/간격 대기 없이 바로 전달 (cacheable=False 작업은 캐시 미사용)"""
+        cache = self.cache if job.get('cacheable', True) else None
+        content = cache.fresh_text(job['url']) if cache else None
+        try:
+            if content is None:
+                async with self.scheduler.slot(job['url']):
+                    _, content = await fetch_text(self.session, job['url'], cache)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            print(f"페이지 크롤링 타임아웃: {job['url']}")
+        except aiohttp.ClientError as e:
+            print(f"페이지 크롤링 연결 오류 {job['url']}: {e}")
+        except Exception as e:
+            print(f"페이지 크롤링 오류 {job['url']}: {e}")
+
+        if content is None:
+            self.stats['failed'] += 1
+            self._finish()
+            return
+        self.stats['fetched'] += 1
+        self.stats['bytes'] += len(content)
+        await self._pages.put((job, content))
+
+    async def _parse_worker(self):
+        """파싱 단계: HTML 파싱/링크 추출은 스레드에서 수행 (이벤트 루프의 다른 요청을 막지 않음)"""
+        while True:
+            job, content = await self._pages.get()
+            try:
+                parsed = await asyncio.to_thread(self.parse, job, content)
+            except Exception as e:
+                print(f"페이지 파싱 오류 {job['url']}: {e}")
+                parsed = None
+
+            if parsed is None:
+                self.stats['skipped'] += 1
+                self._finish()
+                continue
+
+            text, links = parsed
+            if job.get('follow_links'):
+                for link in links[:self.max_links]:
+                    self._enqueue({'url': link, 'search_method': 'page_crawl', 'follow_links': False})
+            await self._texts.put((job, text))
+
+    async def _match_worker(self):
+        """매칭 단계: 대상 패턴 검색 결과 수집"""
+        while True:
+            job, text = await self._texts.get()
+            try:
+                self._results.extend(self.match(job, text))
+            except Exception as e:
+                print(f"패턴 검색 오류 {job['url']}: {e}")
+            self._finish()
+
+    def get_statistics(self) -> Dict:
+        stats = {**self.stats, 'elapsed': round(self.stats['elapsed'], 2), **self.scheduler.get_statistics()}
+        if self.cache:
+            stats['cache'] = self.cache.get_statistics()
+        return stats
@@ -0,0 +1,122 @@
+import os
+import mmap
+from typing import Iterable, Iterator, Optional
+
+DIGEST_SIZE = 32  # SHA256 원시 다이제스트 크기 (바이트)
+
+
+def _unique_sorted(sorted_digests: Iterable[bytes]) -> Iterator[bytes]:
+    """정렬된 다이제스트 스트림에서 인접 중복 제거 및 길이 검증"""
+    previous = None
+    for digest in sorted_digests:
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"잘못된 다이제스트 길이: {len(digest)}")
+        if digest != previous:
+            yield digest
+            previous = digest
+
+
+class DigestIndex:
+    """정렬된 32바이트 SHA256 다이제스트 인덱스 (mmap + 이진 탐색)"""
+
+    def __init__(self, buffer=b'', path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        self._file = None
+        self._count = len(buffer) // DIGEST_SIZE
+
+    @classmethod
+    def open(cls, path: str) -> 'DigestIndex':
+        """인덱스 파일을 읽기 전용 mmap으로 열기 (상주 메모리 없이 즉시 사용 가능)"""
+        f = open(path, 'rb')
+        size = os.fstat(f.fileno()).st_size
+        if size % DIGEST_SIZE != 0:
+            f.close()
+            raise ValueError(f"손상된 다이제스트 인덱스 파일: {path}")
+
+        # 빈 파일은 mmap 할 수 없음
+        if size == 0:
+            f.close()
+            return cls(b'', path=path)
+
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(buffer, 'madvise') and hasattr(mmap, 'MADV_RANDOM'):
+            # 이진 탐색은 임의 접근이므로 미리 읽기(readahead) 비활성화
+            buffer.madvise(mmap.MADV_RANDOM)
+
+        index = cls(buffer, path=path)
+        index._file = f
+        return index
+
+    @classmethod
+    def from_sorted(cls, sorted_digests: Iterable[bytes]) -> 'DigestIndex':
+        """정렬된 다이제스트 스트림으로 메모리 내 인덱스 생성 (인접 중복 제거)"""
+        return cls(b''.join(_unique_sorted(sorted_digests)))
+
+    @staticmethod
+    def write(path: str, digests: Iterable[bytes]) -> int:
+        """다이제스트를 정렬/중복 제거하여 인덱스 파일로 저장"""
+        return DigestIndex.write_sorted(path, sorted(set(digests)))
+
+    @staticmethod
+    def write_sorted(path: str, sorted_digests: Iterable[bytes]) -> int:
+        """이미 정렬된 다이제스트 스트림을 인덱스 파일로 저장 (인접 중복 제거)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        count = 0
+
+        with open(tmp_path, 'wb') as f:
+            for digest in _unique_sorted(sorted_digests):
+                f.write(digest)
+                count += 1
+
+        # 기존 파일을 mmap 중인 프로세스가 있어도 안전하도록 원자적으로 교체
+        os.replace(tmp_path, path)
+        return count
+
+    @property
+    def buffer(self):
+        """원시 레코드 버퍼 (mmap 또는 bytes)"""
+        return self._buffer
+
+    def digest_at(self, position: int) -> bytes:
+        """position 번째 다이제스트 반환"""
+        offset = position * DIGEST_SIZE
+        return bytes(self._buffer[offset:offset + DIGEST_SIZE])
+
+    def bisect_left(self, digest: bytes, low: int = 0, high: Optional[int] = None) -> int:
+        """digest 이상인 첫 위치 (이진 탐색, [low, high) 범위로 제한 가능)"""
+        if high is None:
+            high = self._count
+        buffer = self._buffer
+
+        while low < high:
+            mid = (low + high) // 2
+            offset = mid * DIGEST_SIZE
+            if bytes(buffer[offset:offset + DIGEST_SIZE]) < digest:
+                low = mid + 1
+            else:
+                high = mid
+
+        return low
+
+    def __contains__(self, digest: bytes) -> bool:
+        position = self.bisect_left(digest)
+        return position < self._count and self.digest_at(position) == digest
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[bytes]:
+        for position in range(self._count):
+            yield self.digest_at(position)
+
+    def close(self):
+        """mmap 및 파일 핸들 해제"""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._buffer = b''
+        self._count = 0
@@ -0,0 +1,270 @@
+import io
+import os
+import mmap
+import heapq
+import struct
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.canonicalize import DOMAIN_ALIASES, canonical_email
+from app.core.digest_index import DIGEST_SIZE
+
+DOMAINS_NAME = 'email.domains'
+DOMAIN_MEMBERS_NAME = 'email.domain_members'
+# 집계 레코드: 도메인 다이제스트, 유출 사고 번호, 계정 수 ((도메인, 유출 사고) 순 정렬)
+DOMAIN_AGGREGATE = struct.Struct('<32sII')
+# 구성원 레코드: 도메인 다이제스트 + 이메일 다이제스트 (정렬, 도메인별 이메일 다이제스트 범위 조회)
+DOMAIN_MEMBER_SIZE = DIGEST_SIZE * 2
+MAX_COUNT = 0xFFFFFFFF
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def canonical_domain(domain: str) -> str:
+    """도메인 대표형 (소문자, 앞의 '@' 제거, 같은 메일함을 가리키는 별칭 통일)"""
+    domain = domain.strip().lower().lstrip('@')
+    return DOMAIN_ALIASES.get(domain, domain)
+
+
+def email_domain(email: str) -> Optional[str]:
+    """이메일 대표형의 도메인 (이메일 형식이 아니면 None)"""
+    local, separator, domain = canonical_email(email).rpartition('@')
+    return domain if separator and local and domain else None
+
+
+def domain_digest(domain: str) -> bytes:
+    """도메인 대표형의 SHA256 원시 다이제스트"""
+    return hashlib.sha256(canonical_domain(domain).encode()).digest()
+
+
+def _map(path: str):
+    """파일을 읽기 전용 mmap으로 열기 (빈 파일은 mmap 할 수 없어 빈 버퍼)"""
+    f = open(path, 'rb')
+    if os.fstat(f.fileno()).st_size == 0:
+        f.close()
+        return None, b''
+    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(buffer, 'madvise') and hasattr(mmap, 'MADV_RANDOM'):
+        buffer.madvise(mmap.MADV_RANDOM)
+    return f, buffer
+
+
+def _open_output(path: Optional[str]):
+    return open(f"{path}.tmp", 'wb', buffering=WRITE_BUFFER_SIZE) if path else io.BytesIO()
+
+
+def _finish_output(out, path: Optional[str]) -> bytes:
+    """출력 마무리 (경로가 있으면 원자적으로 교체, 없으면 메모리 버퍼 반환)"""
+    if path is None:
+        data = out.getvalue()
+        out.close()
+        return data
+    out.close()
+    os.replace(f"{path}.tmp", path)
+    return b''
+
+
+def write_aggregates(path: Optional[str], sorted_aggregates: Iterable[Tuple[bytes, int, int]]) -> Tuple[bytes, int]:
+    """(도메인 다이제스트, 유출 사고 번호, 계정 수) 정렬 스트림을 집계 파일로 저장 (같은 키는 합산)
+    경로가 None이면 메모리 버퍼로 반환 (반환값: 버퍼, 도메인 수)"""
+    out = _open_output(path)
+    pack = DOMAIN_AGGREGATE.pack
+    current, total, domains, previous_domain = None, 0, 0, None
+    try:
+        for digest, breach_id, count in sorted_aggregates:
+            if len(digest) != DIGEST_SIZE:
+                raise ValueError(f"잘못된 도메인 다이제스트 길이: {len(digest)}")
+            key = (digest, breach_id)
+            if key == current:
+                total += count
+                continue
+            if current is not None:
+                if key < current:
+                    raise ValueError("도메인 집계가 정렬되어 있지 않습니다")
+                out.write(pack(current[0], current[1], min(total, MAX_COUNT)))
+            if digest != previous_domain:
+                domains += 1
+                previous_domain = digest
+            current, total = key, count
+        if current is not None:
+            out.write(pack(current[0], current[1], min(total, MAX_COUNT)))
+    except BaseException:
+        out.close()
+        if path:
+            os.remove(f"{path}.tmp")
+        raise
+    return _finish_output(out, path), domains
+
+
+def write_members(path: Optional[str], sorted_members: Iterable[Tuple[bytes, bytes]]) -> Tuple[bytes, int]:
+    """(도메인 다이제스트, 이메일 다이제스트) 정렬 스트림을 구성원 파일로 저장 (인접 중복 제거)"""
+    out = _open_output(path)
+    previous, count = None, 0
+    try:
+        for member in sorted_members:
+            if member == previous:
+                continue
+            out.write(member[0] + member[1])
+            previous = member
+            count += 1
+    except BaseException:
+        out.close()
+        if path:
+            os.remove(f"{path}.tmp")
+        raise
+    return _finish_output(out, path), count
+
+
+def write_domain_pairs(aggregates_path: Optional[str], members_path: Optional[str],
+                       sorted_pairs: Iterable[Tuple[bytes, bytes]], breach_id: int,
+                       with_members: bool = False) -> Tuple[bytes, bytes]:
+    """유출 사고 하나의 (도메인 다이제스트, 이메일 다이제스트) 정렬 스트림을 한 번만 읽어
+    도메인별 고유 계정 수 집계 파일과 (with_members면) 구성원 파일을 함께 저장"""
+    members_out = _open_output(members_path) if with_members else None
+
+    def aggregates() -> Iterator[Tuple[bytes, int, int]]:
+        current, count, previous = None, 0, None
+        for pair in sorted_pairs:
+            if pair == previous:
+                continue
+            if previous is not None and pair < previous:
+                raise ValueError("도메인 구성원이 정렬되어 있지 않습니다")
+            previous = pair
+            if members_out is not None:
+                members_out.write(pair[0] + pair[1])
+            if pair[0] != current:
+                if current is not None:
+                    yield current, breach_id, count
+                current, count = pair[0], 0
+            count += 1
+        if current is not None:
+            yield current, breach_id, count
+
+    try:
+        aggregates_buffer, _ = write_aggregates(aggregates_path, aggregates())
+    except BaseException:
+        if members_out is not None:
+            members_out.close()
+            if members_path:
+                os.remove(f"{members_path}.tmp")
+        raise
+    members_buffer = _finish_output(members_out, members_path) if members_out is not None else b''
+    return aggregates_buffer, members_buffer
+
+
+class DomainIndex:
+    """도메인별 유출 노출 집계 (도메인 다이제스트 → 유출 사고별 계정 수, 선택적으로 구성원 이메일 다이제스트)
+    정렬된 고정 폭 레코드를 mmap하여 이진 탐색하므로 조직 전체 노출 조회가 구성원 수와 무관하게 즉시 끝남"""
+
+    def __init__(self, aggregates=b'', members=b'', path: Optional[str] = None):
+        self.path = path
+        self._aggregates = aggregates
+        self._members = members
+        self._files: List = []
+        self._aggregate_count = len(aggregates) // DOMAIN_AGGREGATE.size
+        self._member_count = len(members) // DOMAIN_MEMBER_SIZE
+
+    @classmethod
+    def open(cls, directory: str) -> 'DomainIndex':
+        """세그먼트 디렉터리의 집계/구성원 파일을 mmap으로 열기 (없으면 빈 인덱스)"""
+        aggregates_path = os.path.join(directory, DOMAINS_NAME)
+        members_path = os.path.join(directory, DOMAIN_MEMBERS_NAME)
+        files, buffers = [], []
+        for path in (aggregates_path, members_path):
+            f, buffer = _map(path) if os.path.exists(path) else (None, b'')
+            if f is not None:
+                files.append(f)
+            buffers.append(buffer)
+
+        index = cls(*buffers, path=directory)
+        index._files = files
+        return index
+
+    @property
+    def has_members(self) -> bool:
+        return self._member_count > 0
+
+    def _bisect(self, buffer, record_size: int, count: int, domain: bytes) -> int:
+        """domain 이상인 첫 레코드 위치 (레코드 앞 32바이트 기준 이진 탐색)"""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * record_size
+            if bytes(buffer[offset:offset + DIGEST_SIZE]) < domain:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _aggregate_at(self, position: int) -> Tuple[bytes, int, int]:
+        return DOMAIN_AGGREGATE.unpack_from(self._aggregates, position * DOMAIN_AGGREGATE.size)
+
+    def breach_counts(self, domain: bytes) -> Dict[int, int]:
+        """도메인 다이제스트의 유출 사고 번호별 계정 수"""
+        counts = {}
+        position = self._bisect(self._aggregates, DOMAIN_AGGREGATE.size, self._aggregate_count, domain)
+        while position < self._aggregate_count:
+            digest, breach_id, count = self._aggregate_at(position)
+            if digest != domain:
+                break
+            counts[breach_id] = count
+            position += 1
+        return counts
+
+    def members(self, domain: bytes) -> List[bytes]:
+        """도메인에 속한 유출 이메일 다이제스트 목록 (구성원 파일이 없으면 빈 목록)"""
+        digests = []
+        position = self._bisect(self._members, DOMAIN_MEMBER_SIZE, self._member_count, domain)
+        while position < self._member_count:
+            offset = position * DOMAIN_MEMBER_SIZE
+            record = bytes(self._members[offset:offset + DOMAIN_MEMBER_SIZE])
+            if record[:DIGEST_SIZE] != domain:
+                break
+            digests.append(record[DIGEST_SIZE:])
+            position += 1
+        return digests
+
+    def iter_aggregates(self) -> Iterator[Tuple[bytes, int, int]]:
+        """(도메인 다이제스트, 유출 사고 번호, 계정 수)를 정렬 순서대로 반환 (병합용)"""
+        for position in range(self._aggregate_count):
+            digest, breach_id, count = self._aggregate_at(position)
+            yield bytes(digest), breach_id, count
+
+    def iter_members(self) -> Iterator[Tuple[bytes, bytes]]:
+        """(도메인 다이제스트, 이메일 다이제스트)를 정렬 순서대로 반환 (병합용)"""
+        for position in range(self._member_count):
+            offset = position * DOMAIN_MEMBER_SIZE
+            record = bytes(self._members[offset:offset + DOMAIN_MEMBER_SIZE])
+            yield record[:DIGEST_SIZE], record[DIGEST_SIZE:]
+
+    def __len__(self) -> int:
+        """집계 레코드 수 (도메인 x 유출 사고)"""
+        return self._aggregate_count
+
+    def get_statistics(self) -> Dict:
+        return {
+            'aggregates': self._aggregate_count,
+            'members': self._member_count
+        }
+
+    def close(self):
+        """mmap 및 파일 핸들 해제"""
+        for buffer in (self._aggregates, self._members):
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+        for f in self._files:
+            f.close()
+        self._files = []
+        self._aggregates, self._members = b'', b''
+        self._aggregate_count = self._member_count = 0
+
+
+def merge_domain_indexes(aggregates_path: Optional[str], members_path: Optional[str],
+                         indexes: Sequence[DomainIndex]) -> Tuple[bytes, bytes]:
+    """여러 세그먼트의 도메인 집계/구성원을 k-way 병합하여 저장
+    (구성원은 집계가 있는 원본이 모두 구성원을 저장한 경우에만 - 일부만 합치면 고유 계정 수가 틀려짐)"""
+    aggregates_buffer, _ = write_aggregates(aggregates_path, heapq.merge(*[index.iter_aggregates() for index in indexes]))
+    members_buffer = b''
+    sources = [index for index in indexes if len(index)]
+    if sources and all(index.has_members for index in sources):
+        members_buffer, _ = write_members(members_path, heapq.merge(*[index.iter_members() for index in indexes]))
+    return aggregates_buffer, members_buffer
@@ -0,0 +1,156 @@
+import os
+import heapq
+import shutil
+import tempfile
+from typing import Iterable, Iterator, List, Optional
+
+from app.config import settings
+
+READ_BUFFER_SIZE = 1 << 20
+
+
+def iter_run(path: str, record_size: Optional[int] = None) -> Iterator:
+    """정렬된 런 파일을 순차로 읽기 (record_size 지정 시 고정 폭 바이트 레코드, 없으면 UTF-8 줄)"""
+    if record_size:
+        with open(path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            while True:
+                record = f.read(record_size)
+                if len(record) < record_size:
+                    break
+                yield record
+    else:
+        with open(path, 'r', encoding='utf-8', newline='\n', buffering=READ_BUFFER_SIZE) as f:
+            for line in f:
+                yield line[:-1]
+
+
+def unique_sorted(sorted_records: Iterable) -> Iterator:
+    """정렬된 스트림에서 인접 중복 제거 (정렬 순서가 어긋나면 오류)"""
+    previous = None
+    for record in sorted_records:
+        if previous is not None:
+            if record == previous:
+                continue
+            if record < previous:
+                raise ValueError("런 파일이 정렬되어 있지 않습니다")
+        yield record
+        previous = record
+
+
+def write_run(path: str, sorted_records: Iterable, record_size: Optional[int] = None) -> int:
+    """정렬된 레코드 스트림을 런 파일로 저장 (인접 중복 제거, 반환값: 레코드 수)"""
+    count = 0
+    tmp_path = f"{path}.tmp"
+    if record_size:
+        with open(tmp_path, 'wb', buffering=READ_BUFFER_SIZE) as f:
+            for record in unique_sorted(sorted_records):
+                if len(record) != record_size:
+                    raise ValueError(f"잘못된 레코드 길이: {len(record)}")
+                f.write(record)
+                count += 1
+    else:
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n', buffering=READ_BUFFER_SIZE) as f:
+            for record in unique_sorted(sorted_records):
+                if '\n' in record:
+                    raise ValueError("줄 단위 런에는 줄바꿈이 포함된 값을 저장할 수 없습니다")
+                f.write(record)
+                f.write('\n')
+                count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def merge_unique(run_paths: List[str], record_size: Optional[int] = None) -> Iterator:
+    """런 파일들을 k-way 병합하여 정렬/중복 제거된 스트림으로 반환 (파일당 읽기 버퍼 하나만 사용)"""
+    return unique_sorted(heapq.merge(*[iter_run(path, record_size) for path in run_paths]))
+
+
+def _merge_group(job) -> str:
+    """런 파일 묶음 하나를 병합하고 입력 런 삭제 (프로세스 풀에서 실행)"""
+    run_paths, output_path, record_size = job
+    write_run(output_path, merge_unique(run_paths, record_size), record_size)
+    for path in run_paths:
+        os.remove(path)
+    return output_path
+
+
+def reduce_runs(run_paths: List[str], work_dir: str, fan_in: int = settings.INGEST_MERGE_FAN_IN,
+                record_size: Optional[int] = None, executor=None, prefix: str = 'merge') -> List[str]:
+    """런 파일이 fan_in 개 이하가 될 때까지 fan_in 개씩 묶어 단계별로 병합
+    동시에 여는 파일 수와 병합 힙 크기를 제한하며, executor를 주면 같은 단계의 묶음을 병렬로 병합"""
+    fan_in = max(2, fan_in)
+    runs = sorted(run_paths)
+    level = 0
+    while len(runs) > fan_in:
+        groups = [runs[i:i + fan_in] for i in range(0, len(runs), fan_in)]
+        jobs = [(group, os.path.join(work_dir, f"{prefix}-L{level}-{i:08d}.run"), record_size)
+                for i, group in enumerate(groups) if len(group) > 1]
+        merged = list(executor.map(_merge_group, jobs)) if executor else [_merge_group(job) for job in jobs]
+        runs = sorted(merged + [group[0] for group in groups if len(group) == 1])
+        level += 1
+    return runs
+
+
+class ExternalSorter:
+    """메모리 상한이 있는 외부 병합 정렬 + 중복 제거
+    버퍼가 buffer_records개에 이르면 정렬된 런 파일로 내보내고, 마지막에 런들을 k-way 병합하여 정렬된 고유 스트림을 반환
+    (런이 하나도 없으면 디스크를 쓰지 않고 메모리에서 정렬)"""
+
+    def __init__(self, record_size: Optional[int] = None,
+                 buffer_records: int = settings.INGEST_SORT_BUFFER_RECORDS,
+                 fan_in: int = settings.INGEST_MERGE_FAN_IN,
+                 work_dir: Optional[str] = None, executor=None):
+        self.record_size = record_size
+        self.buffer_records = max(1, buffer_records)
+        self.fan_in = fan_in
+        self.executor = executor
+        self._parent_dir = work_dir
+        self._work_dir = None
+        self._buffer = set()
+        self._runs: List[str] = []
+
+    def _spill(self):
+        """버퍼를 정렬해 런 파일로 저장"""
+        if not self._buffer:
+            return
+        if self._work_dir is None:
+            if self._parent_dir:
+                os.makedirs(self._parent_dir, exist_ok=True)
+            self._work_dir = tempfile.mkdtemp(prefix='sort-', dir=self._parent_dir)
+        path = os.path.join(self._work_dir, f"run-{len(self._runs):08d}.run")
+        write_run(path, sorted(self._buffer), self.record_size)
+        self._runs.append(path)
+        self._buffer = set()
+
+    def add(self, record):
+        self._buffer.add(record)
+        if len(self._buffer) >= self.buffer_records:
+            self._spill()
+
+    def add_many(self, records: Iterable):
+        for record in records:
+            self.add(record)
+
+    def __iter__(self) -> Iterator:
+        """정렬/중복 제거된 전체 레코드 (한 번만 순회)"""
+        if not self._runs:
+            records, self._buffer = sorted(self._buffer), set()
+            yield from records
+            return
+        self._spill()
+        self._runs = reduce_runs(self._runs, self._work_dir, self.fan_in, self.record_size, self.executor)
+        yield from merge_unique(self._runs, self.record_size)
+
+    def close(self):
+        """임시 런 파일 삭제"""
+        self._buffer = set()
+        self._runs = []
+        if self._work_dir:
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+            self._work_dir = None
+
+    def __enter__(self) -> 'ExternalSorter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
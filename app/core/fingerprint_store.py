@@ -0,0 +1,104 @@
+import os
+import mmap
+import numpy as np
+from typing import Iterator, List, Optional
+from app.core.digest_index import DigestIndex, DIGEST_SIZE
+
+FINGERPRINT_SIZE = 8  # 다이제스트 앞 8바이트 (uint64 지문)
+
+
+def fingerprints_of(digests: List[bytes]) -> np.ndarray:
+    """다이제스트 목록을 uint64 지문 배열로 변환 (빅엔디언 → 다이제스트 정렬 순서 유지)"""
+    if not digests:
+        return np.empty(0, dtype=np.uint64)
+    prefixes = b''.join(digest[:FINGERPRINT_SIZE] for digest in digests)
+    return np.frombuffer(prefixes, dtype='>u8').astype(np.uint64)
+
+
+def fingerprints_from_index(index: DigestIndex) -> np.ndarray:
+    """정렬된 다이제스트 인덱스에서 지문 배열 생성 (인덱스와 동일한 위치 순서)"""
+    if len(index) == 0:
+        return np.empty(0, dtype=np.uint64)
+    records = np.frombuffer(index.buffer, dtype=np.uint8, count=len(index) * DIGEST_SIZE)
+    prefixes = np.ascontiguousarray(records.reshape(-1, DIGEST_SIZE)[:, :FINGERPRINT_SIZE])
+    return prefixes.view('>u8').ravel().astype(np.uint64)
+
+
+def write_fingerprints(path: str, fingerprints: np.ndarray):
+    """지문 배열을 리틀엔디언 uint64 파일로 저장 (프로세스 간 공유 mmap용)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(fingerprints.astype('<u8').tobytes())
+    os.replace(tmp_path, path)
+
+
+def open_fingerprints(path: str) -> np.ndarray:
+    """지문 파일을 읽기 전용 mmap 배열로 열기 (같은 파일을 여는 모든 프로세스가 페이지 캐시를 공유)"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.empty(0, dtype=np.uint64)
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(buffer, dtype='<u8')
+
+
+class FingerprintStore:
+    """정렬된 uint64 지문 배열 기반 조회 저장소 (적중 시 전체 다이제스트로 검증)"""
+
+    def __init__(self, digests: Optional[DigestIndex] = None, fingerprints: Optional[np.ndarray] = None):
+        self.digests = digests if digests is not None else DigestIndex()
+        # 스냅샷처럼 미리 계산된 지문 배열이 있으면 그대로 사용 (로드 시 O(N) 변환 생략)
+        self.fingerprints = fingerprints if fingerprints is not None else fingerprints_from_index(self.digests)
+
+    def _verify(self, position: int, fingerprint: int, digest: bytes) -> int:
+        """같은 지문을 가진 구간에서 전체 다이제스트 비교 (일치 위치, 없으면 -1)"""
+        while position < len(self.fingerprints) and self.fingerprints[position] == fingerprint:
+            if self.digests.digest_at(position) == digest:
+                return position
+            position += 1
+        return -1
+
+    def positions_many(self, digests: List[bytes]) -> np.ndarray:
+        """다이제스트 배치 조회 (np.searchsorted 1회) - 항목별 인덱스 위치, 미발견은 -1"""
+        found = np.full(len(digests), -1, dtype=np.int64)
+        if not digests or len(self.fingerprints) == 0:
+            return found
+
+        queries = fingerprints_of(digests)
+        positions = np.searchsorted(self.fingerprints, queries)
+        clipped = np.minimum(positions, len(self.fingerprints) - 1)
+        candidates = np.nonzero(self.fingerprints[clipped] == queries)[0]
+
+        # 지문이 일치한 항목만 전체 다이제스트로 검증 (지문 충돌 대비)
+        for i in candidates:
+            found[i] = self._verify(int(positions[i]), queries[i], digests[i])
+
+        return found
+
+    def contains_many(self, digests: List[bytes]) -> np.ndarray:
+        """다이제스트 배치 조회 (발견 여부)"""
+        return self.positions_many(digests) >= 0
+
+    def prefix_range(self, prefix: int, bits: int) -> List[bytes]:
+        """다이제스트 선행 bits 비트가 prefix인 항목 전체 (지문 배열에서 구간 경계만 탐색)"""
+        if len(self.fingerprints) == 0:
+            return []
+        shift = FINGERPRINT_SIZE * 8 - bits
+        end = (prefix + 1) << shift
+        low = int(np.searchsorted(self.fingerprints, np.uint64(prefix << shift)))
+        high = len(self.fingerprints) if end >= 1 << 64 else int(np.searchsorted(self.fingerprints, np.uint64(end)))
+        buffer = self.digests.buffer[low * DIGEST_SIZE:high * DIGEST_SIZE]
+        return [bytes(buffer[i:i + DIGEST_SIZE]) for i in range(0, len(buffer), DIGEST_SIZE)]
+
+    def __contains__(self, digest: bytes) -> bool:
+        return bool(self.contains_many([digest])[0])
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.digests)
+
+    def close(self):
+        """지문 배열 및 다이제스트 인덱스 해제"""
+        self.fingerprints = np.empty(0, dtype=np.uint64)
+        self.digests.close()
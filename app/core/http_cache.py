@@ -0,0 +1,235 @@
+import os
+import re
+import json
+import time
+import hashlib
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from app.config import settings
+
+MAX_AGE_PATTERN = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+class CacheEntry:
+    """캐시된 응답 하나 (본문 + 재검증용 ETag/Last-Modified + 원 응답의 Cache-Control)"""
+
+    def __init__(self, url: str, body: bytes, encoding: str, etag: Optional[str],
+                 last_modified: Optional[str], stored_at: float, expires_at: float,
+                 cache_control: str = ''):
+        self.url = url
+        self.body = body
+        self.encoding = encoding
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.cache_control = cache_control
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding, errors='replace')
+
+    def validators(self) -> Dict[str, str]:
+        """조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def metadata(self) -> Dict:
+        """디스크에 기록할 메타데이터 (URL 원문 제외 - 파일 이름과 키는 URL 해시)"""
+        return {
+            'encoding': self.encoding,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'stored_at': self.stored_at,
+            'expires_at': self.expires_at,
+            'cache_control': self.cache_control,
+            'size': len(self.body)
+        }
+
+
+class HttpCache:
+    """디스크 HTTP 응답 캐시 (URL의 SHA256 키, TTL + ETag/Last-Modified 조건부 재검증)
+    유효 기간 안이면 요청 없이 본문을 돌려주고, 지나면 조건부 요청으로 304를 받아 저장된 본문을 재사용
+    URL마다 메타데이터(.json)와 본문(.body) 파일을 원자적으로 교체하므로 여러 프로세스가 같은 디렉터리를 공유해도 안전
+    URL 원문은 디스크에 남기지 않음 - 탐색 대상이 들어간 검색 URL은 호출하는 쪽에서 캐시를 쓰지 않아야 함"""
+
+    def __init__(self, directory: str = settings.HTTP_CACHE_DIR, ttl: float = settings.HTTP_CACHE_TTL,
+                 max_age: float = settings.HTTP_CACHE_MAX_AGE):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'revalidated': 0, 'misses': 0,
+                      'stored': 0, 'bytes_fetched': 0, 'bytes_saved': 0}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _path(self, url: str) -> str:
+        key = self._key(url)
+        return os.path.join(self.directory, key[:2], key)
+
+    def _count(self, **increments):
+        with self._lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """저장된 응답 (없거나 읽을 수 없으면 None, 유효 기간과 무관)"""
+        path = self._path(url)
+        try:
+            with open(f"{path}.json", 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            with open(f"{path}.body", 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if metadata.get('key') != self._key(url) or len(body) != metadata.get('size'):
+            # 본문/메타데이터 교체 사이에 읽은 경우
+            return None
+        return CacheEntry(url, body, metadata['encoding'], metadata.get('etag'), metadata.get('last_modified'),
+                          metadata['stored_at'], metadata['expires_at'], metadata.get('cache_control', ''))
+
+    def fresh_text(self, url: str) -> Optional[str]:
+        """유효 기간 안의 캐시 본문 (있으면 적중으로 집계, 요청 없이 사용)"""
+        entry = self.get(url)
+        if entry is None or not entry.fresh:
+            return None
+        self._count(requests=1, hits=1, bytes_saved=len(entry.body))
+        return entry.text
+
+    def _write(self, entry: CacheEntry, write_body: bool = True):
+        """본문 → 메타데이터 순으로 원자적 교체"""
+        path = self._path(entry.url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if write_body:
+            with open(f"{path}.body{suffix}", 'wb') as f:
+                f.write(entry.body)
+            os.replace(f"{path}.body{suffix}", f"{path}.body")
+        with open(f"{path}.json{suffix}", 'w', encoding='utf-8') as f:
+            json.dump(dict(entry.metadata(), key=self._key(entry.url)), f)
+        os.replace(f"{path}.json{suffix}", f"{path}.json")
+
+    def _expires_at(self, cache_control: str, now: float) -> Optional[float]:
+        """Cache-Control로 유효 기간 결정 (no-store면 None → 저장 안 함, no-cache면 매번 재검증)"""
+        cache_control = cache_control.lower()
+        if 'no-store' in cache_control:
+            return None
+        if 'no-cache' in cache_control:
+            return now
+        match = MAX_AGE_PATTERN.search(cache_control)
+        return now + (min(int(match.group(1)), self.ttl) if match else self.ttl)
+
+    async def fetch_text(self, session: aiohttp.ClientSession, url: str) -> Tuple[int, Optional[str]]:
+        """(상태 코드, 본문) - 유효한 캐시는 바로 반환하고, 만료된 캐시는 조건부 요청으로 재검증"""
+        text = self.fresh_text(url)
+        if text is not None:
+            return 200, text
+
+        entry = self.get(url)
+        headers = entry.validators() if entry else {}
+        async with session.get(url, headers=headers) as response:
+            now = time.time()
+            if response.status == 304 and entry is not None:
+                # 변경 없음 - 저장된 본문 재사용, 유효 기간만 갱신
+                # (304에는 보통 Cache-Control이 없으므로 그때는 저장된 응답의 지시를 그대로 적용)
+                entry.cache_control = response.headers.get('Cache-Control', entry.cache_control)
+                expires_at = self._expires_at(entry.cache_control, now)
+                entry.expires_at = expires_at if expires_at is not None else now
+                entry.etag = response.headers.get('ETag', entry.etag)
+                entry.last_modified = response.headers.get('Last-Modified', entry.last_modified)
+                await asyncio.to_thread(self._write, entry, False)
+                self._count(requests=1, revalidated=1, bytes_saved=len(entry.body))
+                return 200, entry.text
+
+            if response.status != 200:
+                self._count(requests=1, misses=1)
+                return response.status, None
+
+            body = await response.read()
+            try:
+                encoding = response.get_encoding()
+            except RuntimeError:
+                encoding = 'utf-8'
+            self._count(requests=1, misses=1, bytes_fetched=len(body))
+
+            cache_control = response.headers.get('Cache-Control', '')
+            expires_at = self._expires_at(cache_control, now)
+            if expires_at is not None:
+                entry = CacheEntry(url, body, encoding, response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'), now, expires_at, cache_control)
+                await asyncio.to_thread(self._write, entry)
+                self._count(stored=1)
+            return 200, body.decode(encoding, errors='replace')
+
+    def prune(self) -> int:
+        """max_age보다 오래 전에 저장된 항목 삭제 (재검증용으로 남겨둔 만료 항목 정리, 반환값: 삭제 수)"""
+        removed = 0
+        cutoff = time.time() - self.max_age
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        stored_at = json.load(f)['stored_at']
+                    if stored_at >= cutoff:
+                        continue
+                    os.remove(path)
+                    os.remove(path[:-len('.json')] + '.body')
+                    removed += 1
+                except (OSError, ValueError, KeyError):
+                    continue
+        return removed
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+        served = stats['hits'] + stats['revalidated']
+        stats['hit_rate'] = round(served / stats['requests'], 3) if stats['requests'] else 0.0
+        return stats
+
+
+_shared_cache: Optional[HttpCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_http_cache() -> Optional[HttpCache]:
+    """크롤러들이 함께 쓰는 프로세스 공용 캐시 (비활성화 시 None, 처음 생성 시 오래된 항목 정리)"""
+    global _shared_cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = HttpCache()
+            removed = _shared_cache.prune()
+            if removed:
+                print(f"🧹 HTTP 캐시 정리: 오래된 응답 {removed}개 삭제")
+        return _shared_cache
+
+
+async def fetch_text(session: aiohttp.ClientSession, url: str,
+                     cache: Optional[HttpCache] = None) -> Tuple[int, Optional[str]]:
+    """(상태 코드, 본문) - 캐시가 있으면 캐시를 거쳐, 없으면 바로 요청 (200이 아니면 본문 None)"""
+    if cache is not None:
+        return await cache.fetch_text(session, url)
+    async with session.get(url) as response:
+        if response.status != 200:
+            return response.status, None
+        return 200, await response.text()
@@ -0,0 +1,210 @@
+import os
+import mmap
+import json
+import time
+import heapq
+import shutil
+import struct
+import tempfile
+import numpy as np
+from typing import Dict, List, Tuple
+
+from app.config import settings
+from app.core.digest_index import DigestIndex
+from app.core.fingerprint_store import FingerprintStore
+from app.core.bloom_filter import BloomFilter
+from app.core.breach_postings import BreachPostings
+from app.core.canonicalize import NORMALIZATION_VERSION
+from app.core.domain_index import DOMAIN_MEMBERS_NAME, DOMAINS_NAME, DomainIndex
+from app.core.segment_store import INDEX_FIELDS, IndexSegment, SegmentStore
+
+# 스냅샷 파일 형식: 헤더 | 목차(섹션 이름, 오프셋, 길이) | 64바이트 정렬된 섹션들
+SNAPSHOT_MAGIC = b'LKSNAP01'
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<8sIIQ')  # 매직, 형식 버전, 섹션 수, 인덱스 버전
+SNAPSHOT_TOC_ENTRY = struct.Struct('<32sQQ')  # 섹션 이름, 오프셋, 길이
+SECTION_ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+
+def read_snapshot_header(path: str) -> Tuple[int, int]:
+    """스냅샷 헤더만 읽어 (형식 버전, 인덱스 버전) 반환"""
+    with open(path, 'rb') as f:
+        magic, format_version, _, version = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"인덱스 스냅샷 파일이 아닙니다: {path}")
+    return format_version, version
+
+
+def write_snapshot(store: SegmentStore, path: str) -> Dict:
+    """저장소의 모든 세그먼트를 하나로 병합해 단일 바이너리 스냅샷 파일로 저장"""
+    start_time = time.time()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    version = time.time_ns() // 1_000_000  # 밀리초 단위 (재생성할 때마다 증가)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(path) or '.') as work_dir:
+        # 기존 병합 경로를 그대로 사용해 출처 목록 포함 세그먼트를 임시 디렉터리에 생성
+        segments = store.segments
+        segment_path = os.path.join(work_dir, 'segment')
+        patterns, name_patterns = set(), set()
+        for segment in segments:
+            patterns.update(segment.password_patterns)
+            name_patterns.update(segment.name_patterns)
+        segment_id = max([segment.segment_id for segment in segments], default=0) + 1
+        normalization = min((segment.normalization_version for segment in segments), default=NORMALIZATION_VERSION)
+        merged = IndexSegment.build(
+            {'id': segment_id, 'level': 0, 'name': 'snapshot', 'created_at': time.time(),
+             'normalization': normalization},
+            {field: heapq.merge(*[segment.iter_entries(field) for segment in segments]) for field in INDEX_FIELDS},
+            patterns, path=segment_path,
+            use_bloom_filter=settings.STATIC_BLOOM_ENABLED, bloom_fp_rate=settings.STATIC_BLOOM_FP_RATE,
+            bloom_bits_per_entry=settings.STATIC_BLOOM_BITS_PER_ENTRY or None,
+            with_postings=True, name_patterns=name_patterns,
+            merge_domains=[segment.domains for segment in segments]
+        )
+
+        try:
+            meta = {
+                'format_version': SNAPSHOT_FORMAT_VERSION,
+                'version': version,
+                'created_at': time.time(),
+                'segment': merged.meta,
+                'breaches': {str(breach_id): breach for breach_id, breach in store.breaches.items()}
+            }
+
+            # 섹션 목록: (이름, 바이트 또는 파일 경로)
+            sections: List[Tuple[str, object]] = [('meta', json.dumps(meta, ensure_ascii=False).encode())]
+            for field in INDEX_FIELDS:
+                sections.append((f"{field}.digests", os.path.join(segment_path, f"{field}.digests")))
+                sections.append((f"{field}.fingerprints",
+                                 merged.stores[field].fingerprints.astype('<u8').tobytes()))
+                sections.append((f"{field}.postings", os.path.join(segment_path, f"{field}.postings")))
+                if merged.bloom_filters.get(field) is not None:
+                    sections.append((f"{field}.bloom", merged.bloom_filters[field].to_bytes()))
+            sections.append(('password.patterns', '\n'.join(sorted(patterns)).encode('utf-8')))
+            sections.append(('name.patterns', '\n'.join(sorted(name_patterns)).encode('utf-8')))
+            for name in (DOMAINS_NAME, DOMAIN_MEMBERS_NAME):
+                if os.path.exists(os.path.join(segment_path, name)):
+                    sections.append((name, os.path.join(segment_path, name)))
+        finally:
+            merged.close()
+
+        # 목차 계산
+        toc, offset = [], _aligned(SNAPSHOT_HEADER.size + SNAPSHOT_TOC_ENTRY.size * len(sections))
+        for name, content in sections:
+            length = os.path.getsize(content) if isinstance(content, str) else len(content)
+            toc.append((name, offset, length))
+            offset = _aligned(offset + length)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(sections), version))
+            for name, section_offset, length in toc:
+                f.write(SNAPSHOT_TOC_ENTRY.pack(name.encode(), section_offset, length))
+            for (name, content), (_, section_offset, _) in zip(sections, toc):
+                f.write(b'\0' * (section_offset - f.tell()))
+                if isinstance(content, str):
+                    with open(content, 'rb') as src:
+                        shutil.copyfileobj(src, f)
+                else:
+                    f.write(content)
+
+        # 기존 스냅샷을 mmap 중인 프로세스가 있어도 안전하도록 원자적으로 교체
+        os.replace(tmp_path, path)
+
+    return {
+        'path': path,
+        'version': version,
+        'size_bytes': os.path.getsize(path),
+        'counts': meta['segment']['counts'],
+        'elapsed': time.time() - start_time
+    }
+
+
+class SnapshotSegment(IndexSegment):
+    """스냅샷 파일 하나를 mmap하여 복사 없이 사용하는 세그먼트"""
+
+    def __init__(self, *args, mapping=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._mapping = mapping
+
+    @classmethod
+    def open_snapshot(cls, path: str) -> Tuple['SnapshotSegment', Dict]:
+        """스냅샷 파일을 mmap으로 열어 섹션을 그대로 참조 (로드 시간이 데이터 크기와 무관)"""
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, format_version, section_count, _ = SNAPSHOT_HEADER.unpack_from(mapping, 0)
+        if magic != SNAPSHOT_MAGIC:
+            mapping.close()
+            raise ValueError(f"인덱스 스냅샷 파일이 아닙니다: {path}")
+        if format_version != SNAPSHOT_FORMAT_VERSION:
+            mapping.close()
+            raise ValueError(f"지원하지 않는 스냅샷 형식 버전: {format_version}")
+
+        view = memoryview(mapping)
+        sections = {}
+        for i in range(section_count):
+            name, offset, length = SNAPSHOT_TOC_ENTRY.unpack_from(mapping, SNAPSHOT_HEADER.size + i * SNAPSHOT_TOC_ENTRY.size)
+            sections[name.rstrip(b'\0').decode()] = view[offset:offset + length]
+
+        meta = json.loads(bytes(sections['meta']))
+        stores, bloom_filters, postings = {}, {}, {}
+        for field in INDEX_FIELDS:
+            digests = DigestIndex(sections[f"{field}.digests"], path=path)
+            fingerprints = np.frombuffer(sections[f"{field}.fingerprints"], dtype='<u8')
+            stores[field] = FingerprintStore(digests, fingerprints=fingerprints)
+            bloom = sections.get(f"{field}.bloom")
+            bloom_filters[field] = BloomFilter.from_buffer(bloom) if bloom is not None else None
+            postings[field] = BreachPostings(sections[f"{field}.postings"], path=path)
+
+        patterns = bytes(sections['password.patterns']).decode('utf-8')
+        password_patterns = set(line for line in patterns.split('\n') if line)
+        names = bytes(sections.get('name.patterns', b'')).decode('utf-8')
+        name_patterns = set(line for line in names.split('\n') if line)
+
+        domains = DomainIndex(sections.get(DOMAINS_NAME, b''), sections.get(DOMAIN_MEMBERS_NAME, b''), path=path)
+
+        segment = cls(meta['segment'], stores, bloom_filters, password_patterns,
+                      path=None, postings=postings, name_patterns=name_patterns, domains=domains,
+                      mapping=(mapping, view, sections))
+        return segment, meta
+
+    def close(self):
+        super().close()
+        if self._mapping is not None:
+            mapping, view, sections = self._mapping
+            self._mapping = None
+            sections.clear()
+            try:
+                view.release()
+                mapping.close()
+            except BufferError:
+                pass  # 아직 참조 중인 배열이 있으면 GC에 맡김
+
+
+class SnapshotStore(SegmentStore):
+    """스냅샷 파일 기반 읽기 전용 저장소 (추가한 세그먼트는 메모리에만 유지)"""
+
+    def __init__(self, snapshot_path: str):
+        super().__init__(None, background_compaction=False)
+        self.snapshot_path = snapshot_path
+
+        segment, meta = SnapshotSegment.open_snapshot(snapshot_path)
+        self._breaches = {int(breach_id): breach for breach_id, breach in meta['breaches'].items()}
+        self._next_id = max([segment.segment_id, *self._breaches]) + 1
+        self.version = meta['version']
+        self.snapshot_version = meta['version']
+        self._warn_stale_normalization([segment])
+        self._set_segments([segment])
+
+    def disk_version(self) -> int:
+        """디스크 스냅샷의 인덱스 버전 (헤더만 읽음, 스냅샷이 그대로면 메모리 버전)"""
+        try:
+            version = read_snapshot_header(self.snapshot_path)[1]
+        except FileNotFoundError:
+            return self.version
+        return self.version if version == self.snapshot_version else version
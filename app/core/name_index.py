@@ -0,0 +1,185 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.bk_tree import levenshtein_distance
+from app.core.ngram_index import NGramIndex
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# 한글 음절 = 초성(19) x 중성(21) x 종성(28)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+             'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 국어의 로마자 표기법 (음절 단위, 음운 변화는 반영하지 않음)
+ROMAN_CHOSEONG = ['g', 'kk', 'n', 'd', 'tt', 'r', 'm', 'b', 'pp', 's', 'ss', '', 'j', 'jj', 'ch', 'k', 't', 'p', 'h']
+ROMAN_JUNGSEONG = ['a', 'ae', 'ya', 'yae', 'eo', 'e', 'yeo', 'ye', 'o', 'wa', 'wae', 'oe', 'yo', 'u',
+                   'wo', 'we', 'wi', 'yu', 'eu', 'ui', 'i']
+ROMAN_JONGSEONG = ['', 'k', 'k', 'k', 'n', 'n', 'n', 't', 'l', 'k', 'm', 'l', 'l', 'l',
+                   'p', 'l', 'm', 'p', 'p', 't', 't', 'ng', 't', 't', 'k', 't', 'p', 't']
+
+# 관용 성씨 표기 → 로마자 표기법 (Kim → gim, Lee → i 등)
+SURNAME_ROMANIZATIONS = {
+    'kim': 'gim', 'gim': 'gim',
+    'lee': 'i', 'yi': 'i', 'rhee': 'i', 'rhie': 'i', 'ri': 'i',
+    'park': 'bak', 'pak': 'bak', 'bak': 'bak', 'bahk': 'bak',
+    'choi': 'choe', 'choe': 'choe', 'choy': 'choe',
+    'jung': 'jeong', 'chung': 'jeong', 'jeong': 'jeong', 'cheong': 'jeong',
+    'kang': 'gang', 'gang': 'gang',
+    'cho': 'jo', 'jo': 'jo',
+    'yoon': 'yun', 'yun': 'yun',
+    'jang': 'jang', 'chang': 'jang',
+    'lim': 'im', 'im': 'im', 'rim': 'im',
+    'shin': 'sin', 'sin': 'sin',
+    'seo': 'seo', 'suh': 'seo',
+    'kwon': 'gwon', 'gwon': 'gwon',
+    'hwang': 'hwang',
+    'ahn': 'an', 'an': 'an',
+    'song': 'song',
+    'ryu': 'ryu', 'yoo': 'ryu', 'yu': 'ryu', 'ryoo': 'ryu',
+    'jeon': 'jeon', 'jun': 'jeon', 'chun': 'jeon', 'chon': 'jeon',
+    'ko': 'go', 'koh': 'go', 'go': 'go',
+    'moon': 'mun', 'mun': 'mun',
+    'son': 'son', 'sohn': 'son',
+    'bae': 'bae', 'pae': 'bae',
+    'baek': 'baek', 'paik': 'baek', 'paek': 'baek', 'baik': 'baek',
+    'heo': 'heo', 'hur': 'heo', 'huh': 'heo',
+    'noh': 'no', 'roh': 'no', 'no': 'no',
+    'kwak': 'gwak', 'gwak': 'gwak',
+    'sung': 'seong', 'seong': 'seong',
+    'joo': 'ju', 'ju': 'ju', 'chu': 'ju',
+    'koo': 'gu', 'ku': 'gu', 'gu': 'gu',
+    'oh': 'o', 'o': 'o',
+}
+
+# 로마자 표기 흔들림을 한 형태로 모으는 치환 (순서대로 적용, 양쪽 키에 동일하게 적용)
+PHONETIC_REPLACEMENTS = [
+    ('kk', 'k'), ('tt', 't'), ('pp', 'p'), ('ss', 's'), ('jj', 'j'),
+    ('ch', 'j'), ('sh', 's'), ('oo', 'u'), ('ee', 'i'),
+    ('g', 'k'), ('b', 'p'), ('d', 't'), ('r', 'l'),
+]
+
+_NON_LETTERS = re.compile(r'[^a-z가-힣ㄱ-ㅣ]+')
+
+
+def is_hangul(text: str) -> bool:
+    """한글 음절이 하나라도 있는지 여부"""
+    return any(HANGUL_BASE <= ord(char) <= HANGUL_LAST for char in text)
+
+
+def decompose_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해 (공백/기호 제거, 그 외 문자는 소문자로 유지)"""
+    jamo = []
+    for char in _NON_LETTERS.sub('', text.lower()):
+        code = ord(char) - HANGUL_BASE
+        if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+            jamo.append(CHOSEONG[code // 588])
+            jamo.append(JUNGSEONG[code % 588 // 28])
+            jamo.append(JONGSEONG[code % 28])
+        else:
+            jamo.append(char)
+    return ''.join(jamo)
+
+
+def romanize(text: str) -> str:
+    """한글을 로마자 표기법으로 변환하고 관용 성씨 표기를 맞춘 뒤 표기 흔들림을 정규화한 키
+    (예: 김해커 / Kim Haekeo / Haekeo Kim → kimhaekeo)"""
+    tokens = []
+    for token in text.lower().split():
+        roman = []
+        for char in token:
+            code = ord(char) - HANGUL_BASE
+            if 0 <= code <= HANGUL_LAST - HANGUL_BASE:
+                roman.append(ROMAN_CHOSEONG[code // 588] + ROMAN_JUNGSEONG[code % 588 // 28] + ROMAN_JONGSEONG[code % 28])
+            elif 'a' <= char <= 'z':
+                roman.append(char)
+        if roman:
+            tokens.append(''.join(roman))
+
+    if len(tokens) > 1:
+        # 서양식 순서(이름 성)면 성을 앞으로
+        if tokens[-1] in SURNAME_ROMANIZATIONS and tokens[0] not in SURNAME_ROMANIZATIONS:
+            tokens.insert(0, tokens.pop())
+        tokens[0] = SURNAME_ROMANIZATIONS.get(tokens[0], tokens[0])
+
+    key = ''.join(tokens)
+    for source, target in PHONETIC_REPLACEMENTS:
+        key = key.replace(source, target)
+    return key
+
+
+def deletion_variants(key: str, max_deletions: int) -> Set[str]:
+    """key에서 문자를 최대 max_deletions개 지운 문자열 집합 (key 자신 포함)"""
+    variants, frontier = {key}, {key}
+    for _ in range(max_deletions):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        variants.update(frontier)
+    return variants
+
+
+class NameIndex:
+    """이름 근사 조회 인덱스 (자모 분해 삭제 이웃 사전으로 띄어쓰기/오타, 로마자 n-gram LSH로 한글-영문 표기 차이를 흡수)
+    자모 키는 짧고 서로 거리가 비슷해 BK-트리 가지치기가 거의 안 되므로, 삭제 변형을 미리 색인해 조회를 사전 탐색 몇 번으로 처리"""
+
+    def __init__(self, names: Iterable[str] = (), max_jamo_distance: int = 1, ngram_size: int = 3):
+        self.max_jamo_distance = max_jamo_distance
+        self._by_jamo: Dict[str, List[str]] = {}
+        self._by_roman: Dict[str, List[str]] = {}
+        for name in names:
+            if is_hangul(name):
+                self._by_jamo.setdefault(decompose_jamo(name), []).append(name)
+            roman = romanize(name)
+            if roman:
+                self._by_roman.setdefault(roman, []).append(name)
+
+        # 삭제 변형 → 자모 키 (편집 거리 d 이내인 두 키는 각자 d개 이하를 지워 같은 문자열이 됨)
+        self._jamo_deletions: Dict[str, List[str]] = {}
+        for key in self._by_jamo:
+            for variant in deletion_variants(key, max_jamo_distance):
+                self._jamo_deletions.setdefault(variant, []).append(key)
+
+        self._roman_ngrams = NGramIndex(sorted(self._by_roman), n=ngram_size)
+
+    def closest_jamo(self, name: str, max_distance: int) -> Optional[Tuple[int, str]]:
+        """자모 편집 거리 max_distance(인덱스 생성 시 거리 이하로 제한) 이내에서 가장 가까운 자모 키"""
+        jamo = decompose_jamo(name)
+        if jamo in self._by_jamo:
+            return 0, jamo
+        max_distance = min(max_distance, self.max_jamo_distance)
+
+        best = None
+        for variant in deletion_variants(jamo, max_distance):
+            for key in self._jamo_deletions.get(variant, ()):
+                distance = levenshtein_distance(jamo, key)
+                if distance <= max_distance and (best is None or (distance, key) < best):
+                    best = (distance, key)
+        return best
+
+    def search(self, name: str, max_jamo_distance: int, roman_threshold: float) -> Optional[Tuple[float, str, str]]:
+        """가장 유사한 이름 (유사도 0~1, 이름, 일치 방식 'jamo' 또는 'romanization')
+        짧은 이름(자모 5개 미만)은 오탐을 막기 위해 자모 편집 거리 0만 허용"""
+        best = None
+
+        if is_hangul(name):
+            jamo = decompose_jamo(name)
+            match = self.closest_jamo(name, max_jamo_distance if len(jamo) >= 5 else 0)
+            if match is not None:
+                distance, key = match
+                best = (1.0 - distance / max(len(jamo), len(key)), self._by_jamo[key][0], 'jamo')
+                if distance == 0:
+                    return best
+
+        roman = romanize(name)
+        if roman:
+            if roman in self._by_roman:
+                return 1.0, self._by_roman[roman][0], 'romanization'
+            match = self._roman_ngrams.best(roman, roman_threshold)
+            if match is not None and (best is None or match[0] > best[0]):
+                best = (match[0], self._by_roman[match[1]][0], 'romanization')
+
+        return best
+
+    def __len__(self) -> int:
+        return sum(len(names) for names in self._by_roman.values())
@@ -0,0 +1,131 @@
+import zlib
+import numpy as np
+from typing import Iterable, List, Optional, Set, Tuple
+
+BAND_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def ngrams_of(word: str, n: int = 3) -> Set[str]:
+    """대소문자 무시 n-gram 집합 (앞뒤 경계 문자 포함)"""
+    padded = f"^{word.lower()}$"
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def jaccard_similarity(first: Set[str], second: Set[str]) -> float:
+    """두 n-gram 집합의 Jaccard 유사도"""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class NGramIndex:
+    """n-gram MinHash LSH 인덱스 (밴드 버킷으로 후보만 추린 뒤 n-gram Jaccard로 점수 계산)"""
+
+    def __init__(self, words: Iterable[str] = (), n: int = 3,
+                 num_bands: int = 32, rows_per_band: int = 2, seed: int = 1):
+        self.n = n
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+
+        # MinHash 해시 함수: h(x) = (a * (x ^ b) mod 2^64) >> 32 (a는 홀수, 곱셈-시프트 해싱)
+        rng = np.random.RandomState(seed)
+        num_perm = num_bands * rows_per_band
+        self._a = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+        self.words: List[str] = []
+        # 밴드 해시(밴드 안 서명 값들을 합친 64비트 정수) 배치들과, 조회 시 만드는 밴드별 정렬 인덱스
+        self._hash_batches: List[np.ndarray] = []
+        self._band_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.add_many(words)
+        self._index()
+
+    def _signatures(self, gram_sets: List[Set[str]]) -> np.ndarray:
+        """여러 n-gram 집합의 MinHash 서명을 한 번에 계산 (단어 수 x 해시 함수 수)"""
+        lengths = np.fromiter((len(grams) for grams in gram_sets), dtype=np.int64, count=len(gram_sets))
+        hashes = np.fromiter((zlib.crc32(gram.encode()) for grams in gram_sets for gram in grams),
+                             dtype=np.uint64, count=int(lengths.sum()))
+        mixed = (self._a[:, None] * (hashes[None, :] ^ self._b[:, None])) >> np.uint64(32)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.minimum.reduceat(mixed, starts, axis=1).T
+
+    def _band_hashes(self, words: List[str]) -> np.ndarray:
+        """단어별 밴드 해시 (단어 수 x 밴드 수) - 상위 비트에 밴드 번호를 넣어 모든 밴드를 한 배열에서 정렬/탐색
+        (해시 충돌은 후보만 늘리고 Jaccard 검증에서 걸러짐)"""
+        signatures = self._signatures([ngrams_of(word, self.n) for word in words])
+        bands = signatures.reshape(len(words), self.num_bands, self.rows_per_band)
+        keys = np.zeros(bands.shape[:2], dtype=np.uint64)
+        for row in range(self.rows_per_band):
+            keys = keys * BAND_HASH_MULTIPLIER + bands[:, :, row]
+        band_bits = max(1, (self.num_bands - 1).bit_length())
+        band_ids = np.arange(self.num_bands, dtype=np.uint64) << np.uint64(64 - band_bits)
+        return band_ids | (keys >> np.uint64(band_bits))
+
+    def add(self, word: str):
+        """단어를 밴드 버킷에 등록"""
+        self.add_many([word])
+
+    def add_many(self, words: Iterable[str], batch_size: int = 4096):
+        """여러 단어를 배치 단위로 서명 계산해 등록 (단어별 Python 루프 없이 numpy로 처리)"""
+        batch = []
+        for word in words:
+            batch.append(word)
+            if len(batch) >= batch_size:
+                self._add_batch(batch)
+                batch = []
+        if batch:
+            self._add_batch(batch)
+
+    def _add_batch(self, words: List[str]):
+        self._hash_batches.append(self._band_hashes(words))
+        self.words.extend(words)
+        self._band_index = None
+
+    def _index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """정렬된 (밴드 해시, 단어 번호) 배열 (추가 후 첫 조회 때 생성)"""
+        band_index = self._band_index
+        if band_index is None:
+            if self._hash_batches:
+                hashes = np.vstack(self._hash_batches)
+            else:
+                hashes = np.zeros((0, self.num_bands), dtype=np.uint64)
+            flat = hashes.ravel()
+            order = np.argsort(flat, kind='stable')
+            band_index = (flat[order], order // self.num_bands)
+            self._band_index = band_index
+        return band_index
+
+    def candidates(self, query: str) -> Set[int]:
+        """query와 같은 밴드 버킷을 하나 이상 공유하는 단어 번호 (유사도가 높을수록 포함될 확률이 큼)"""
+        sorted_hashes, word_ids = self._index()
+        keys = self._band_hashes([query])[0]
+        lows = np.searchsorted(sorted_hashes, keys, side='left')
+        highs = np.searchsorted(sorted_hashes, keys, side='right')
+        found = set()
+        for low, high in zip(lows.tolist(), highs.tolist()):
+            if high > low:
+                found.update(word_ids[low:high].tolist())
+        return found
+
+    def search(self, query: str, threshold: float) -> List[Tuple[float, str]]:
+        """n-gram Jaccard 유사도가 threshold 이상인 단어 목록 (유사도 내림차순)"""
+        query_grams = ngrams_of(query, self.n)
+        matches = []
+        for word_id in self.candidates(query):
+            word = self.words[word_id]
+            score = jaccard_similarity(query_grams, ngrams_of(word, self.n))
+            if score >= threshold:
+                matches.append((score, word))
+
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return matches
+
+    def best(self, query: str, threshold: float) -> Optional[Tuple[float, str]]:
+        """유사도가 가장 높은 단어"""
+        matches = self.search(query, threshold)
+        return matches[0] if matches else None
+
+    def __len__(self) -> int:
+        return len(self.words)
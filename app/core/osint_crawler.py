@@ -1,12 +1,15 @@
-import asyncio
 import aiohttp
 import time
-import re
-import json
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse, quote_plus
 from app.config import settings
+from app.core.crawl_pipeline import CrawlPipeline, HostScheduler
+from app.core.target_matcher import TargetMatcher, extract_context
+from app.core.http_cache import shared_http_cache
+
+# crawl_all_sources 대상 카테고리 (우선순위 순)
+ALL_SOURCE_CATEGORIES = ('leak_sites', 'paste_sites', 'forum_sites', 'social_media', 'blog_sites')
 
 class OSINTCrawler:
     def __init__(self):
@@ -14,6 +17,7 @@ class OSINTCrawler:
         self.crawl_delay = settings.CRAWL_DELAY
         self.max_pages = settings.MAX_CRAWL_PAGES
         self.search_targets = []
+        self.matcher = TargetMatcher([])
         
         # 크롤링 제외 사이트 목록 (로그인/회원가입 페이지 등)
         self.excluded_paths = [
@@ -22,6 +26,73 @@ class OSINTCrawler:
             '/admin', '/moderator', '/dashboard'
         ]
         
+        # 카테고리별 크롤링 대상 사이트
+        self.site_categories = {
+            'leak_sites': [
+                'https://haveibeenpwned.com',
+                'https://breachdirectory.pw',
+                'https://leakcheck.io',
+                'https://dehashed.com',
+                'https://intelx.io',
+                'https://snusbase.com',
+                'https://leak-lookup.com',
+                'https://weleakinfo.com',
+                'https://leakcheck.net',
+                'https://leakpeek.com'
+            ],
+            'paste_sites': [
+                'https://pastebin.com',
+                'https://paste.ee',
+                'https://rentry.co',
+                'https://paste.rs',
+                'https://paste.gg',
+                'https://paste.fo',
+                'https://paste.ubuntu.com',
+                'https://paste.debian.net',
+                'https://paste.kde.org',
+                'https://paste.opensuse.org'
+            ],
+            'forum_sites': [
+                'https://www.reddit.com',
+                'https://stackoverflow.com',
+                'https://github.com',
+                'https://paste.ee',
+                'https://www.clien.net',
+                'https://www.dcinside.com',
+                'https://www.inven.co.kr',
+                'https://www.ruliweb.com',
+                'https://www.ppomppu.co.kr',
+                'https://www.fmkorea.com',
+                'https://www.82cook.com'
+            ],
+            'social_media': [
+                'https://twitter.com',
+                'https://www.facebook.com',
+                'https://www.instagram.com',
+                'https://www.linkedin.com'
+            ],
+            'blog_sites': [
+                'https://medium.com',
+                'https://dev.to',
+                'https://hashnode.dev',
+                'https://velog.io',
+                'https://tistory.com',
+                'https://blog.naver.com',
+                'https://brunch.co.kr'
+            ],
+            # 실제 다크웹 접근은 TOR 네트워크/별도 API 필요 (시뮬레이션용)
+            'dark_web': [
+                'http://example.onion',
+                'http://test.onion'
+            ]
+        }
+        
+        # 호스트별 요청 간격/동시 요청 수를 지키는 스케줄러 (크롤러 세션 동안 공유)
+        self.scheduler = HostScheduler()
+        # 디스크 응답 캐시 (최근 가져온 페이지는 요청 없이/304 재검증으로 재사용)
+        self.cache = shared_http_cache()
+        self.last_crawl_stats = {}
+        
     async def __aenter__(self):
         self.session = aiohttp.ClientSession(
             headers={
@@ -54,6 +125,9 @@ class OSINTCrawler:
             self.search_targets.append(('phone', phone))
         if name:
             self.search_targets.append(('name', name))
+        
+        # 대상이 바뀔 때만 매처 구성 (페이지마다 정규식/오토마톤을 다시 만들지 않음)
+        self.matcher = TargetMatcher(self.search_targets)
     
     def _should_skip_url(self, url: str) -> bool:
         """URL이 크롤링에서 제외되어야 하는지 확인"""
@@ -72,37 +146,23 @@ class OSINTCrawler:
         
         return False
     
+    def _dork_jobs(self, targets: Optional[List[tuple]] = None) -> List[Dict]:
+        """Google Dork 검색 작업 목록 (targets가 없으면 설정된 탐색 대상)"""
+        jobs = []
+        for target_type, target_value in (self.search_targets if targets is None else targets):
+            for dork in self._generate_google_dorks(target_type, target_value):
+                jobs.append({
+                    'url': f"https://www.google.com/search?q={quote_plus(dork)}",
+                    'search_method': 'google_dork',
+                    'follow_links': False,
+                    # 검색어에 탐색 대상(이메일/전화번호/이름)이 들어 있으므로 URL/결과 페이지를 디스크 캐시에 남기지 않음
+                    'cacheable': False
+                })
+        return jobs
+    
     async def search_google_dorks(self) -> List[Dict]:
-        """Google Dork 검색"""
-        results = []
-        
-        for target_type, target_value in self.search_targets:
-            dorks = self._generate_google_dorks(target_type, target_value)
-            
-            for dork in dorks:
-                try:
-                    search_url = f"https://www.google.com/search?q={quote_plus(dork)}"
-                    async with self.session.get(search_url) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            found_patterns = self._search_patterns_in_text(content)
-                            
-                            for pattern_type, value, context in found_patterns:
-                                results.append({
-                                    'source_url': search_url,
-                                    'pattern_type': pattern_type,
-                                    'value': value,
-                                    'context': context,
-                                    'timestamp': time.time(),
-                                    'search_method': 'google_dork'
-                                })
-                    
-                    await asyncio.sleep(self.crawl_delay)
-                    
-                except Exception as e:
-                    print(f"Google Dork 검색 실패: {e}")
-        
-        return results
+        """Google Dork 검색 (같은 호스트이므로 요청 간격을 지키며 순서대로 진행)"""
+        return await self._run_pipeline(self._dork_jobs())
     
     def _generate_google_dorks(self, target_type: str, target_value: str) -> List[str]:
         """Google Dork 쿼리 생성"""
@@ -134,296 +194,95 @@ class OSINTCrawler:
         
         return dorks
     
+    def _site_jobs(self, sites: List[str]) -> List[Dict]:
+        """사이트 메인 페이지 작업 목록 (같은 도메인 링크를 최대 max_pages개까지 따라감)"""
+        return [{'url': site, 'search_method': 'direct_crawl', 'follow_links': True} for site in sites]
+    
+    def _source_jobs(self) -> List[Dict]:
+        """전체 크롤링 대상 사이트 작업 목록 (시뮬레이션용 다크웹 제외)"""
+        jobs = []
+        for category in ALL_SOURCE_CATEGORIES:
+            jobs.extend(self._site_jobs(self.site_categories[category]))
+        return jobs
+    
+    async def _run_pipeline(self, jobs: List[Dict]) -> List[Dict]:
+        """가져오기 → 파싱 → 매칭 파이프라인으로 작업 처리 (호스트 간 병렬, 호스트 내 간격/동시 요청 수 유지)"""
+        pipeline = CrawlPipeline(
+            self.session, self._parse_page, self._match_page,
+            scheduler=self.scheduler, should_skip=self._should_skip_url,
+            max_links=self.max_pages, cache=self.cache
+        )
+        results = await pipeline.run(jobs)
+        self.last_crawl_stats = pipeline.get_statistics()
+        return results
+    
+    async def _crawl_category(self, category: str, label: str) -> List[Dict]:
+        """카테고리 사이트들을 병렬 크롤링"""
+        print(f"🔍 {label} 크롤링 중: {len(self.site_categories[category])}개 사이트")
+        results = await self._run_pipeline(self._site_jobs(self.site_categories[category]))
+        print(f"✅ {label} 크롤링 완료: {len(results)}개 결과 ({self.last_crawl_stats.get('elapsed', 0)}초)")
+        return results
+    
     async def crawl_forum_sites(self) -> List[Dict]:
         """포럼 사이트 크롤링"""
-        forum_sites = [
-            'https://www.reddit.com',
-            'https://stackoverflow.com',
-            'https://github.com',
-            'https://paste.ee',
-            'https://www.clien.net',
-            'https://www.dcinside.com',
-            'https://www.inven.co.kr',
-            'https://www.ruliweb.com',
-            'https://www.ppomppu.co.kr',
-            'https://www.fmkorea.com',
-            'https://www.82cook.com'
-        ]
-        
-        results = []
-        
-        for site in forum_sites:
-            try:
-                print(f"📝 포럼 사이트 크롤링 중: {site}")
-                site_results = await self._crawl_site(site)
-                results.extend(site_results)
-                print(f"✅ {site} 크롤링 완료: {len(site_results)}개 결과")
-                await asyncio.sleep(self.crawl_delay)
-            except Exception as e:
-                print(f"❌ 사이트 크롤링 실패 {site}: {e}")
-                continue
-        
-        return results
-
+        return await self._crawl_category('forum_sites', '포럼 사이트')
+    
     async def crawl_data_leak_sites(self) -> List[Dict]:
         """데이터 유출 사이트 크롤링"""
-        leak_sites = [
-            'https://haveibeenpwned.com',
-            'https://breachdirectory.pw',
-            'https://leakcheck.io',
-            'https://dehashed.com',
-            'https://intelx.io',
-            'https://snusbase.com',
-            'https://leak-lookup.com',
-            'https://weleakinfo.com',
-            'https://leakcheck.net',
-            'https://leakpeek.com'
-        ]
-        
-        results = []
-        
-        for site in leak_sites:
-            try:
-                print(f"🔍 데이터 유출 사이트 크롤링 중: {site}")
-                site_results = await self._crawl_site(site)
-                results.extend(site_results)
-                print(f"✅ {site} 크롤링 완료: {len(site_results)}개 결과")
-                await asyncio.sleep(self.crawl_delay)
-            except Exception as e:
-                print(f"❌ 데이터 유출 사이트 크롤링 실패 {site}: {e}")
-                continue
-        
-        return results
-
+        return await self._crawl_category('leak_sites', '데이터 유출 사이트')
+    
     async def crawl_paste_sites(self) -> List[Dict]:
         """페이스트 사이트 크롤링"""
-        paste_sites = [
-            'https://pastebin.com',
-            'https://paste.ee',
-            'https://rentry.co',
-            'https://paste.rs',
-            'https://paste.gg',
-            'https://paste.fo',
-            'https://paste.ubuntu.com',
-            'https://paste.debian.net',
-            'https://paste.kde.org',
-            'https://paste.opensuse.org'
-        ]
-        
-        results = []
-        
-        for site in paste_sites:
-            try:
-                print(f"📋 페이스트 사이트 크롤링 중: {site}")
-                site_results = await self._crawl_site(site)
-                results.extend(site_results)
-                print(f"✅ {site} 크롤링 완료: {len(site_results)}개 결과")
-                await asyncio.sleep(self.crawl_delay)
-            except Exception as e:
-                print(f"❌ 페이스트 사이트 크롤링 실패 {site}: {e}")
-                continue
-        
-        return results
+        return await self._crawl_category('paste_sites', '페이스트 사이트')
     
     async def crawl_social_media(self) -> List[Dict]:
         """소셜 미디어 크롤링"""
-        social_sites = [
-            'https://twitter.com',
-            'https://www.facebook.com',
-            'https://www.instagram.com',
-            'https://www.linkedin.com'
-        ]
-        
-        results = []
-        
-        for site in social_sites:
-            try:
-                print(f"📱 소셜 미디어 크롤링 중: {site}")
-                site_results = await self._crawl_site(site)
-                results.extend(site_results)
-                print(f"✅ {site} 크롤링 완료: {len(site_results)}개 결과")
-                await asyncio.sleep(self.crawl_delay)
-            except Exception as e:
-                print(f"❌ 소셜 미디어 크롤링 실패 {site}: {e}")
-                continue
-        
-        return results
+        return await self._crawl_category('social_media', '소셜 미디어')
+    
+    async def crawl_blog_sites(self) -> List[Dict]:
+        """블로그/뉴스 사이트 크롤링"""
+        return await self._crawl_category('blog_sites', '블로그 사이트')
     
     async def crawl_dark_web_sources(self) -> List[Dict]:
         """다크웹 소스 크롤링 (시뮬레이션)"""
-        # 실제 다크웹 접근은 별도 API 필요
-        dark_web_sites = [
-            'http://example.onion',  # 시뮬레이션용
-            'http://test.onion'      # 시뮬레이션용
-        ]
-        
-        results = []
-        
-        for site in dark_web_sites:
-            try:
-                # 실제로는 TOR 네트워크를 통한 접근 필요
-                site_results = await self._crawl_site(site)
-                results.extend(site_results)
-                await asyncio.sleep(self.crawl_delay)
-            except Exception as e:
-                print(f"다크웹 크롤링 실패 {site}: {e}")
-        
-        return results
+        return await self._crawl_category('dark_web', '다크웹 소스')
     
     async def _crawl_site(self, base_url: str) -> List[Dict]:
-        """특정 사이트 크롤링"""
-        results = []
-        
-        try:
-            # 메인 페이지 크롤링
-            async with self.session.get(base_url) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    
-                    # HTML이 아닌 경우 스킵
-                    if not content.strip().startswith('<'):
-                        return results
-                    
-                    soup = BeautifulSoup(content, 'html.parser')
-                    
-                    # 텍스트에서 개인정보 패턴 검색
-                    found_patterns = self._search_patterns_in_text(content)
-                    
-                    for pattern_type, value, context in found_patterns:
-                        results.append({
-                            'source_url': base_url,
-                            'pattern_type': pattern_type,
-                            'value': value,
-                            'context': context,
-                            'timestamp': time.time(),
-                            'search_method': 'direct_crawl'
-                        })
-                    
-                    # 링크 추출 및 추가 페이지 크롤링
-                    links = self._extract_links(soup, base_url)
-                    
-                    # 제외할 링크 필터링
-                    filtered_links = [link for link in links if not self._should_skip_url(link)]
-                    
-                    for link in filtered_links[:self.max_pages]:
-                        try:
-                            link_results = await self._crawl_page(link)
-                            results.extend(link_results)
-                            await asyncio.sleep(self.crawl_delay)
-                        except Exception as e:
-                            print(f"링크 크롤링 실패 {link}: {e}")
-                            continue
-                            
-        except asyncio.TimeoutError:
-            print(f"사이트 크롤링 타임아웃: {base_url}")
-        except aiohttp.ClientError as e:
-            print(f"사이트 크롤링 연결 오류 {base_url}: {e}")
-        except Exception as e:
-            print(f"사이트 크롤링 오류 {base_url}: {e}")
-        
-        return results
+        """특정 사이트 크롤링 (메인 페이지 + 같은 도메인 링크)"""
+        return await self._run_pipeline(self._site_jobs([base_url]))
     
     async def _crawl_page(self, url: str) -> List[Dict]:
         """단일 페이지 크롤링"""
-        results = []
-        
-        # URL 제외 확인
-        if self._should_skip_url(url):
-            return results
-        
-        try:
-            async with self.session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    
-                    # HTML이 아닌 경우 스킵
-                    if not content.strip().startswith('<'):
-                        return results
-                    
-                    found_patterns = self._search_patterns_in_text(content)
-                    
-                    for pattern_type, value, context in found_patterns:
-                        results.append({
-                            'source_url': url,
-                            'pattern_type': pattern_type,
-                            'value': value,
-                            'context': context,
-                            'timestamp': time.time(),
-                            'search_method': 'page_crawl'
-                        })
-                        
-        except asyncio.TimeoutError:
-            print(f"페이지 크롤링 타임아웃: {url}")
-        except aiohttp.ClientError as e:
-            print(f"페이지 크롤링 연결 오류 {url}: {e}")
-        except Exception as e:
-            print(f"페이지 크롤링 오류 {url}: {e}")
-        
-        return results
+        return await self._run_pipeline([{'url': url, 'search_method': 'page_crawl', 'follow_links': False}])
     
-    def _search_patterns_in_text(self, text: str) -> List[tuple]:
-        """텍스트에서 개인정보 패턴 검색"""
-        found_patterns = []
-        
-        for target_type, target_value in self.search_targets:
-            if target_type == 'email':
-                # 이메일 패턴 검색
-                email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-                emails = re.findall(email_pattern, text)
-                
-                for email in emails:
-                    if email.lower() == target_value.lower():
-                        context = self._extract_context(text, email, 100)
-                        found_patterns.append(('email', email, context))
-            
-            elif target_type == 'phone':
-                # 전화번호 패턴 검색 (한국 전화번호 포함)
-                phone_patterns = [
-                    r'\b\d{3}-\d{3,4}-\d{4}\b',  # 010-1234-5678
-                    r'\b\d{10,11}\b',  # 01012345678
-                    r'\b\+82-?\d{1,2}-?\d{3,4}-?\d{4}\b',  # +82-10-1234-5678
-                    r'\b01[016789]-\d{3,4}-\d{4}\b',  # 한국 휴대폰
-                    r'\b0[2-9]{1,2}-\d{3,4}-\d{4}\b',  # 한국 일반전화
-                ]
-                
-                for pattern in phone_patterns:
-                    phones = re.findall(pattern, text)
-                    for phone in phones:
-                        normalized_phone = re.sub(r'[^\d]', '', phone)
-                        normalized_target = re.sub(r'[^\d]', '', target_value)
-                        
-                        if normalized_phone == normalized_target:
-                            context = self._extract_context(text, phone, 100)
-                            found_patterns.append(('phone', phone, context))
-            
-            elif target_type == 'name':
-                # 이름 패턴 검색 (한국 이름 포함)
-                name_patterns = [
-                    rf'\b{re.escape(target_value)}\b',  # 정확한 매칭
-                    rf'\b{re.escape(target_value)}[씨님]\b',  # 한국 호칭
-                    rf'\b{re.escape(target_value)}[가-힣]*\b',  # 한국 이름 확장
-                ]
-                
-                for pattern in name_patterns:
-                    names = re.findall(pattern, text, re.IGNORECASE)
-                    for name in names:
-                        context = self._extract_context(text, name, 100)
-                        found_patterns.append(('name', name, context))
+    def _parse_page(self, job: Dict, content: str) -> Optional[tuple]:
+        """파싱 단계: HTML이 아니면 건너뛰고, 링크를 따라갈 페이지면 같은 도메인 링크 추출
+        (검색 결과 페이지는 형식과 무관하게 본문 전체를 매칭)"""
+        if job['search_method'] != 'google_dork' and not content.strip().startswith('<'):
+            return None
         
-        return found_patterns
+        links = []
+        if job.get('follow_links'):
+            soup = BeautifulSoup(content, 'html.parser')
+            links = [link for link in self._extract_links(soup, job['url']) if not self._should_skip_url(link)]
+        return content, links
+    
+    def _match_page(self, job: Dict, text: str) -> List[Dict]:
+        """매칭 단계: 텍스트에서 개인정보 패턴 검색 결과를 크롤링 결과 형식으로 변환"""
+        return [self._hit_result(job, text, hit) for hit in self.matcher.find(text)]
     
-    def _extract_context(self, text: str, found_value: str, context_length: int) -> str:
-        """발견된 값 주변 컨텍스트 추출"""
-        try:
-            index = text.find(found_value)
-            if index != -1:
-                start = max(0, index - context_length)
-                end = min(len(text), index + len(found_value) + context_length)
-                context = text[start:end].replace('\n', ' ').strip()
-                return context
-        except:
-            pass
-        return found_value
+    def _hit_result(self, job: Dict, text: str, hit: tuple) -> Dict:
+        """매처 발견 항목 하나를 크롤링 결과 형식으로 변환"""
+        pattern_type, value, start, end, _ = hit
+        return {
+            'source_url': job['url'],
+            'pattern_type': pattern_type,
+            'value': value,
+            'context': extract_context(text, start, end, 100),
+            'timestamp': time.time(),
+            'search_method': job['search_method'],
+            'offset': start
+        }
     
     def _extract_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
         """페이지에서 링크 추출"""
@@ -440,7 +299,8 @@ class OSINTCrawler:
         return links[:self.max_pages]
     
     async def crawl_all_sources(self) -> List[Dict]:
-        """모든 소스에서 크롤링 수행"""
+        """모든 소스에서 크롤링 수행 (Google Dork + 모든 카테고리 사이트를 한 파이프라인에서 병렬 처리)
+        소요 시간은 카테고리/사이트 수의 합이 아니라 가장 느린 호스트에 좌우됨"""
         results = []
         
         if not self.search_targets:
@@ -449,65 +309,14 @@ class OSINTCrawler:
         
         print(f"🔍 탐색 대상: {[f'{t[0]}:{t[1]}' for t in self.search_targets]}")
         
-        # Google Dork 검색
-        print("🔍 Google Dork 검색 중...")
-        google_results = await self.search_google_dorks()
-        results.extend(google_results)
-        print(f"✅ Google Dork 검색 완료: {len(google_results)}개 결과")
-        
-        # 데이터 유출 사이트 크롤링 (우선순위 높음)
-        print("🔍 데이터 유출 사이트 크롤링 중...")
-        leak_results = await self.crawl_data_leak_sites()
-        results.extend(leak_results)
-        print(f"✅ 데이터 유출 사이트 크롤링 완료: {len(leak_results)}개 결과")
-        
-        # 페이스트 사이트 크롤링
-        print("📋 페이스트 사이트 크롤링 중...")
-        paste_results = await self.crawl_paste_sites()
-        results.extend(paste_results)
-        print(f"✅ 페이스트 사이트 크롤링 완료: {len(paste_results)}개 결과")
+        jobs = self._dork_jobs() + self._source_jobs()
         
-        # 포럼 사이트 크롤링
-        print("📝 포럼 사이트 크롤링 중...")
-        forum_results = await self.crawl_forum_sites()
-        results.extend(forum_results)
-        print(f"✅ 포럼 사이트 크롤링 완료: {len(forum_results)}개 결과")
+        results = await self._run_pipeline(jobs)
         
-        # 소셜 미디어 크롤링
-        print("📱 소셜 미디어 크롤링 중...")
-        social_results = await self.crawl_social_media()
-        results.extend(social_results)
-        print(f"✅ 소셜 미디어 크롤링 완료: {len(social_results)}개 결과")
-        
-        # 블로그 사이트 크롤링
-        print("📖 블로그 사이트 크롤링 중...")
-        blog_results = await self.crawl_blog_sites()
-        results.extend(blog_results)
-        print(f"✅ 블로그 사이트 크롤링 완료: {len(blog_results)}개 결과")
-        
-        print(f"🎯 총 크롤링 결과: {len(results)}개")
+        stats = self.last_crawl_stats
+        print(f"🎯 총 크롤링 결과: {len(results)}개 ({stats['elapsed']}초, 호스트 {stats['hosts']}개, "
+              f"요청 {stats['requests']}건, 실패 {stats['failed']}건)")
+        if self.cache:
+            cache_stats = self.cache.get_statistics()
+            print(f"💾 HTTP 캐시: 적중률 {cache_stats['hit_rate'] * 100:.1f}%, 절약 {cache_stats['bytes_saved']:,}바이트")
         return results
-    
-    async def crawl_blog_sites(self) -> List[Dict]:
-        """블로그/뉴스 사이트 크롤링"""
-        blog_sites = [
-            'https://medium.com',
-            'https://dev.to',
-            'https://hashnode.dev',
-            'https://velog.io',
-            'https://tistory.com',
-            'https://blog.naver.com',
-            'https://brunch.co.kr'
-        ]
-        
-        results = []
-        
-        for site in blog_sites:
-            try:
-                site_results = await self._crawl_site(site)
-                results.extend(site_results)
-                await asyncio.sleep(self.crawl_delay)
-            except Exception as e:
-                print(f"블로그 사이트 크롤링 실패 {site}: {e}")
-        
-        return results 
\ No newline at end of file
@@ -0,0 +1,221 @@
+import os
+import mmap
+import struct
+import hashlib
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.core.external_sort import ExternalSorter
+
+# 파일 형식: 헤더 | 팬아웃 테이블 (해시 상위 비트별 시작 레코드 번호, uint64) | 정렬된 고정 폭 레코드 (해시 + uint32 횟수)
+PASSWORD_HASH_MAGIC = b'PWHASH01'
+PASSWORD_HASH_HEADER = struct.Struct('<8sBBHQ')  # 매직, 알고리즘 번호, 해시 크기, 팬아웃 비트 수, 레코드 수
+PASSWORD_HASH_ALGORITHMS = {1: 'sha1', 2: 'sha256'}
+PASSWORD_HASH_FANOUT_BITS = 16
+COUNT_FORMAT = struct.Struct('<I')
+CHUNK_COUNT_FORMAT = struct.Struct('<II')  # 평문 집계 런 레코드의 (청크 내 횟수, 청크 번호)
+MAX_COUNT = 0xFFFFFFFF
+RECORDS_ALIGNMENT = 64
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _algorithm_id(algorithm: str) -> int:
+    for algorithm_id, name in PASSWORD_HASH_ALGORITHMS.items():
+        if name == algorithm:
+            return algorithm_id
+    raise ValueError(f"지원하지 않는 해시 알고리즘: {algorithm}")
+
+
+def hash_password(password: str, algorithm: str = 'sha1') -> bytes:
+    """비밀번호 원시 해시 (UTF-8, 정규화 없음 - 정확히 같은 비밀번호만 일치)"""
+    return getattr(hashlib, algorithm)(password.encode('utf-8')).digest()
+
+
+def count_passwords(passwords: Iterable[str], algorithm: str = 'sha1',
+                    buffer_records: int = settings.INGEST_SORT_BUFFER_RECORDS,
+                    work_dir: Optional[str] = None) -> Iterator[Tuple[bytes, int]]:
+    """평문 비밀번호 스트림을 (해시, 출현 횟수) 해시 순 스트림으로 변환 (외부 정렬로 메모리 상한 유지)
+    buffer_records줄씩 평문으로 집계해 고유 비밀번호만 해시하고 (해시, 청크 내 횟수, 청크 번호) 레코드로 외부 정렬
+    같은 해시가 여러 청크에 있으면 인접한 레코드로 나오므로 write_password_hashes가 횟수를 합산"""
+    hash_function = getattr(hashlib, algorithm)
+    hash_size = hash_function().digest_size
+    passwords = iter(passwords)
+    with ExternalSorter(hash_size + CHUNK_COUNT_FORMAT.size, buffer_records=buffer_records,
+                        work_dir=work_dir) as sorter:
+        chunk_id = 0
+        while True:
+            counts = Counter(islice(passwords, buffer_records))
+            if not counts:
+                break
+            counts.pop('', None)
+            sorter.add_many(hash_function(password.encode('utf-8')).digest() + CHUNK_COUNT_FORMAT.pack(count, chunk_id)
+                            for password, count in counts.items())
+            chunk_id += 1
+        for record in sorter:
+            yield record[:hash_size], CHUNK_COUNT_FORMAT.unpack_from(record, hash_size)[0]
+
+
+def parse_hash_lines(lines: Iterable[str]) -> Iterator[Tuple[bytes, int]]:
+    """Pwned Passwords 형식 줄('16진수해시:횟수', 횟수 생략 시 1) 파싱"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        hex_hash, _, count = line.partition(':')
+        yield bytes.fromhex(hex_hash), int(count) if count else 1
+
+
+def write_password_hashes(path: str, sorted_entries: Iterable[Tuple[bytes, int]],
+                          algorithm: str = 'sha1', fanout_bits: int = PASSWORD_HASH_FANOUT_BITS) -> int:
+    """해시 오름차순 (해시, 횟수) 스트림을 고정 폭 레코드 파일로 저장 (같은 해시는 횟수 합산)
+    레코드를 한 번만 순차 기록하므로 수십억 건도 메모리 사용량이 일정함"""
+    algorithm_id = _algorithm_id(algorithm)
+    hash_size = getattr(hashlib, algorithm)().digest_size
+    fanout = [0] * ((1 << fanout_bits) + 1)
+    shift = 64 - fanout_bits  # 해시 앞 8바이트 기준
+    records_offset = _records_offset(fanout_bits)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.seek(records_offset)
+        pack_count = COUNT_FORMAT.pack
+
+        def flush(digest: bytes, total: int):
+            f.write(digest + pack_count(min(total, MAX_COUNT)))
+            fanout[(int.from_bytes(digest[:8], 'big') >> shift) + 1] += 1
+
+        current, total = None, 0
+        for digest, occurrences in sorted_entries:
+            if len(digest) != hash_size:
+                raise ValueError(f"잘못된 {algorithm} 해시 길이: {len(digest)}")
+            if digest == current:
+                total += occurrences
+                continue
+            if current is not None:
+                if digest < current:
+                    raise ValueError("입력 해시가 정렬되어 있지 않습니다 (정렬 후 다시 실행)")
+                flush(current, total)
+                count += 1
+            current, total = digest, occurrences
+        if current is not None:
+            flush(current, total)
+            count += 1
+
+        # 버킷별 개수 → 누적 시작 위치
+        for i in range(1, len(fanout)):
+            fanout[i] += fanout[i - 1]
+
+        f.seek(0)
+        f.write(PASSWORD_HASH_HEADER.pack(PASSWORD_HASH_MAGIC, algorithm_id, hash_size, fanout_bits, count))
+        f.write(struct.pack(f'<{len(fanout)}Q', *fanout))
+
+    # 기존 파일을 mmap 중인 프로세스가 있어도 안전하도록 원자적으로 교체
+    os.replace(tmp_path, path)
+    return count
+
+
+def _records_offset(fanout_bits: int) -> int:
+    end = PASSWORD_HASH_HEADER.size + ((1 << fanout_bits) + 1) * 8
+    return (end + RECORDS_ALIGNMENT - 1) // RECORDS_ALIGNMENT * RECORDS_ALIGNMENT
+
+
+class PasswordHashFile:
+    """정렬된 고정 폭 비밀번호 해시 파일 (mmap, 팬아웃 테이블로 버킷을 정한 뒤 버킷 안에서 이진 탐색)
+    평문 없이 해시와 출현 횟수만 저장"""
+
+    def __init__(self, buffer, path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        self._file = None
+
+        magic, algorithm_id, self.hash_size, self.fanout_bits, self._count = PASSWORD_HASH_HEADER.unpack_from(buffer, 0)
+        if magic != PASSWORD_HASH_MAGIC or algorithm_id not in PASSWORD_HASH_ALGORITHMS:
+            raise ValueError(f"비밀번호 해시 파일이 아닙니다: {path}")
+        self.algorithm = PASSWORD_HASH_ALGORITHMS[algorithm_id]
+        self.record_size = self.hash_size + COUNT_FORMAT.size
+        self._fanout = memoryview(buffer)[PASSWORD_HASH_HEADER.size:
+                                          PASSWORD_HASH_HEADER.size + ((1 << self.fanout_bits) + 1) * 8].cast('Q')
+        self._records_offset = _records_offset(self.fanout_bits)
+        self._shift = 64 - self.fanout_bits
+
+    @classmethod
+    def open(cls, path: str) -> 'PasswordHashFile':
+        """해시 파일을 읽기 전용 mmap으로 열기"""
+        f = open(path, 'rb')
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(buffer, 'madvise') and hasattr(mmap, 'MADV_RANDOM'):
+            buffer.madvise(mmap.MADV_RANDOM)
+        hashes = cls(buffer, path=path)
+        hashes._file = f
+        return hashes
+
+    def _hash_at(self, position: int) -> bytes:
+        offset = self._records_offset + position * self.record_size
+        return self._buffer[offset:offset + self.hash_size]
+
+    def _count_at(self, position: int) -> int:
+        offset = self._records_offset + position * self.record_size + self.hash_size
+        return COUNT_FORMAT.unpack_from(self._buffer, offset)[0]
+
+    def _bucket(self, digest: bytes) -> Tuple[int, int]:
+        bucket = int.from_bytes(digest[:8], 'big') >> self._shift
+        return self._fanout[bucket], self._fanout[bucket + 1]
+
+    def _lower_bound(self, digest: bytes, low: int, high: int) -> int:
+        while low < high:
+            middle = (low + high) // 2
+            if self._hash_at(middle) < digest:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def count_hash(self, digest: bytes) -> int:
+        """해시의 출현 횟수 (없으면 0)"""
+        if len(digest) != self.hash_size:
+            raise ValueError(f"잘못된 {self.algorithm} 해시 길이: {len(digest)}")
+        low, high = self._bucket(digest)
+        position = self._lower_bound(digest, low, high)
+        if position < high and self._hash_at(position) == digest:
+            return self._count_at(position)
+        return 0
+
+    def count(self, password: str) -> int:
+        """비밀번호가 유출 코퍼스에 나온 횟수 (없으면 0)"""
+        return self.count_hash(hash_password(password, self.algorithm))
+
+    def prefix_range(self, prefix: int, bits: int) -> List[Tuple[bytes, int]]:
+        """해시 선행 bits 비트가 prefix인 (해시, 횟수) 목록 (Pwned Passwords 범위 조회)"""
+        total_bits = self.hash_size * 8
+        low_digest = (prefix << (total_bits - bits)).to_bytes(self.hash_size, 'big')
+        start = self._lower_bound(low_digest, *self._bucket(low_digest))
+        if prefix + 1 < (1 << bits):
+            high_digest = ((prefix + 1) << (total_bits - bits)).to_bytes(self.hash_size, 'big')
+            end = self._lower_bound(high_digest, *self._bucket(high_digest))
+        else:
+            end = self._count
+        return [(self._hash_at(position), self._count_at(position)) for position in range(start, end)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_statistics(self) -> Dict:
+        return {
+            'path': self.path,
+            'algorithm': self.algorithm,
+            'count': self._count,
+            'size_bytes': len(self._buffer)
+        }
+
+    def close(self):
+        """mmap 및 파일 핸들 해제"""
+        self._fanout.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file:
+            self._file.close()
+            self._file = None
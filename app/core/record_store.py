@@ -0,0 +1,362 @@
+import os
+import mmap
+import json
+import time
+import shutil
+import threading
+import numpy as np
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.canonicalize import digest_identifier
+from app.core.digest_index import DIGEST_SIZE, DigestIndex
+from app.core.external_sort import ExternalSorter
+from app.core.fingerprint_store import FingerprintStore, fingerprints_from_index, open_fingerprints, write_fingerprints
+
+# 유출 레코드 컬럼 (batch.py / generate_breach_data.py 레코드 형식)
+RECORD_COLUMNS = ('email', 'name', 'phone', 'birthday', 'gender', 'ip', 'address', 'password_pattern')
+# 다이제스트 인덱스를 만드는 식별자 컬럼 (정적 인덱스와 같은 대표형 해시)
+INDEXED_COLUMNS = ('email', 'phone', 'name')
+RECORD_MANIFEST_NAME = 'records.json'
+BATCH_META_NAME = 'batch.json'
+# 행 번호 저장 폭 (uint32로 담을 수 없는 행 수면 uint64)
+ROW_DTYPE = '<u4'
+WIDE_ROW_DTYPE = '<u8'
+MAX_NARROW_ROW = 0xFFFFFFFF
+# 외부 정렬 레코드: 다이제스트 + 빅엔디언 행 번호 (바이트 순 정렬 = (다이제스트, 행 번호) 순)
+POSTING_ROW_SIZE = 8
+ARRAY_WRITE_BATCH = 1 << 16
+
+
+def _open_array(path: str, dtype: str) -> np.ndarray:
+    """리틀엔디언 배열 파일을 읽기 전용 mmap 배열로 열기"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.empty(0, dtype=dtype)
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(buffer, dtype=dtype)
+
+
+class _ArrayWriter:
+    """정수 배열 파일 순차 기록 (ARRAY_WRITE_BATCH개씩 내보내 행 수와 무관하게 메모리 일정)"""
+
+    def __init__(self, path: str, dtype: str):
+        self.dtype = dtype
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._buffer: List[int] = []
+
+    def append(self, value: int):
+        self._buffer.append(value)
+        self.count += 1
+        if len(self._buffer) >= ARRAY_WRITE_BATCH:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(np.asarray(self._buffer, dtype=self.dtype).tobytes())
+            self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._file.close()
+
+
+def _open_bytes(path: str):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class RecordBatch:
+    """불변 컬럼형 레코드 배치 (Arrow 형식처럼 컬럼별 오프셋 배열 + UTF-8 데이터, 식별자 컬럼별 다이제스트 → 행 번호 인덱스)
+
+    디스크 구성 (batch-XXXXXXXX/):
+      {column}.offsets      행별 시작 위치 (uint64, 행 수 + 1)
+      {column}.data         UTF-8 값 연속 저장 (빈 값 = 누락)
+      {column}.digests      대표형 SHA256 다이제스트 (정렬, 중복 없음) + {column}.fingerprints
+      {column}.row_offsets  다이제스트 위치별 행 번호 구간 (uint64, 다이제스트 수 + 1)
+      {column}.rows         행 번호 (다이제스트 순, uint32 - 행이 2**32개 이상이면 uint64, meta['row_dtype'])"""
+
+    def __init__(self, path: str, meta: Dict):
+        self.path = path
+        self.meta = meta
+        self.columns: Tuple[str, ...] = tuple(meta['columns'])
+        self._offsets = {column: _open_array(os.path.join(path, f"{column}.offsets"), '<u8') for column in self.columns}
+        self._data = {column: _open_bytes(os.path.join(path, f"{column}.data")) for column in self.columns}
+
+        self._indexes: Dict[str, Tuple[FingerprintStore, np.ndarray, np.ndarray]] = {}
+        row_dtype = meta.get('row_dtype', ROW_DTYPE)
+        for column in meta.get('indexed', ()):
+            digests = DigestIndex.open(os.path.join(path, f"{column}.digests"))
+            store = FingerprintStore(digests, fingerprints=open_fingerprints(os.path.join(path, f"{column}.fingerprints")))
+            self._indexes[column] = (
+                store,
+                _open_array(os.path.join(path, f"{column}.row_offsets"), '<u8'),
+                _open_array(os.path.join(path, f"{column}.rows"), row_dtype)
+            )
+
+    @property
+    def batch_id(self) -> int:
+        return self.meta['id']
+
+    @property
+    def row_count(self) -> int:
+        return self.meta['rows']
+
+    @classmethod
+    def open(cls, path: str) -> 'RecordBatch':
+        with open(os.path.join(path, BATCH_META_NAME), 'r', encoding='utf-8') as f:
+            return cls(path, json.load(f))
+
+    @classmethod
+    def build(cls, path: str, meta: Dict, records: Iterable[Dict],
+              columns: Tuple[str, ...] = RECORD_COLUMNS) -> 'RecordBatch':
+        """레코드 스트림을 컬럼별 파일로 기록 (값/오프셋은 순차 기록, 식별자 컬럼의 (다이제스트, 행 번호)는 외부 정렬)
+        메모리 사용량은 행 수가 아니라 외부 정렬 버퍼(INGEST_SORT_BUFFER_RECORDS)에 비례"""
+        os.makedirs(path, exist_ok=True)
+        indexed = [column for column in columns if column in INDEXED_COLUMNS]
+        postings = {column: ExternalSorter(DIGEST_SIZE + POSTING_ROW_SIZE, work_dir=path) for column in indexed}
+        data_files, offset_files = {}, {}
+        positions = dict.fromkeys(columns, 0)
+
+        rows = 0
+        try:
+            for column in columns:
+                data_files[column] = open(os.path.join(path, f"{column}.data"), 'wb')
+                offset_files[column] = _ArrayWriter(os.path.join(path, f"{column}.offsets"), '<u8')
+                offset_files[column].append(0)
+
+            for record in records:
+                for column in columns:
+                    value = record.get(column)
+                    value = '' if value is None else str(value).strip()
+                    if value:
+                        encoded = value.encode('utf-8')
+                        data_files[column].write(encoded)
+                        positions[column] += len(encoded)
+                    offset_files[column].append(positions[column])
+                    if column in postings and value:
+                        digest = digest_identifier(column, value)
+                        if digest is not None:
+                            postings[column].add(digest + rows.to_bytes(POSTING_ROW_SIZE, 'big'))
+                rows += 1
+
+            # 식별자 컬럼: 정렬된 (다이제스트, 행 번호)에서 같은 다이제스트의 행 번호를 한 구간으로 묶음 (CSR)
+            row_dtype = ROW_DTYPE if rows <= MAX_NARROW_ROW else WIDE_ROW_DTYPE
+            for column in indexed:
+                cls._write_postings(path, column, postings[column], row_dtype)
+        finally:
+            for f in data_files.values():
+                f.close()
+            for writer in offset_files.values():
+                writer.close()
+            for sorter in postings.values():
+                sorter.close()
+
+        meta = dict(meta, columns=list(columns), indexed=indexed, rows=rows, row_dtype=row_dtype)
+        # 메타 파일은 마지막에 기록 (메타가 있으면 배치가 완성된 것)
+        with open(os.path.join(path, BATCH_META_NAME), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return cls(path, meta)
+
+    @staticmethod
+    def _write_postings(path: str, column: str, sorted_postings: Iterable[bytes], row_dtype: str):
+        """(다이제스트 + 행 번호) 정렬 스트림을 다이제스트 인덱스, 행 번호 구간, 행 번호 파일로 한 번에 순차 기록"""
+        row_offsets = _ArrayWriter(os.path.join(path, f"{column}.row_offsets"), '<u8')
+        row_ids = _ArrayWriter(os.path.join(path, f"{column}.rows"), row_dtype)
+
+        def unique_digests() -> Iterator[bytes]:
+            previous = None
+            for posting in sorted_postings:
+                digest = posting[:DIGEST_SIZE]
+                if digest != previous:
+                    row_offsets.append(row_ids.count)
+                    previous = digest
+                    yield digest
+                row_ids.append(int.from_bytes(posting[DIGEST_SIZE:], 'big'))
+            row_offsets.append(row_ids.count)
+
+        digest_path = os.path.join(path, f"{column}.digests")
+        try:
+            DigestIndex.write_sorted(digest_path, unique_digests())
+        finally:
+            row_offsets.close()
+            row_ids.close()
+
+        digests = DigestIndex.open(digest_path)
+        try:
+            write_fingerprints(os.path.join(path, f"{column}.fingerprints"), fingerprints_from_index(digests))
+        finally:
+            digests.close()
+
+    def has_index(self, column: str) -> bool:
+        return column in self._indexes
+
+    def rows_for(self, column: str, digest: bytes) -> np.ndarray:
+        """식별자 다이제스트가 나온 행 번호 (정렬됨, 없으면 빈 배열)"""
+        index = self._indexes.get(column)
+        if index is None:
+            raise ValueError(f"인덱스가 없는 컬럼: {column}")
+        store, row_offsets, row_ids = index
+        position = int(store.positions_many([digest])[0])
+        if position < 0:
+            return row_ids[:0]
+        return row_ids[int(row_offsets[position]):int(row_offsets[position + 1])]
+
+    def value(self, column: str, row: int) -> str:
+        offsets = self._offsets[column]
+        return self._data[column][int(offsets[row]):int(offsets[row + 1])].decode('utf-8')
+
+    def exposed_columns(self, row: int) -> List[str]:
+        """행에서 값이 있는 컬럼 (오프셋 구간 길이만 확인, 값은 읽지 않음)"""
+        return [column for column in self.columns if self._offsets[column][row + 1] > self._offsets[column][row]]
+
+    def get_statistics(self) -> Dict:
+        return {
+            'id': self.batch_id,
+            'name': self.meta.get('name'),
+            'first_seen': self.meta.get('first_seen'),
+            'rows': self.row_count,
+            'columns': list(self.columns),
+            'indexed': list(self._indexes)
+        }
+
+    def close(self):
+        """mmap 해제 (배열 참조가 남아 있으면 GC에 맡김)"""
+        for store, _, _ in self._indexes.values():
+            store.close()
+        self._indexes = {}
+        for data in self._data.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self._data = {}
+        self._offsets = {}
+
+
+class RecordStore:
+    """유출 사고별 컬럼형 레코드 배치 저장소 - 여러 식별자가 같은 레코드에 함께 유출되었는지 조회
+    조회 비용은 조건별 일치 행 수에 비례 (가장 적은 행 목록부터 교집합)"""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._lock = threading.Lock()
+        self._batches: Tuple[RecordBatch, ...] = ()
+        os.makedirs(root_dir, exist_ok=True)
+        self.refresh()
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root_dir, RECORD_MANIFEST_NAME)
+
+    def _read_manifest(self) -> Dict:
+        if not os.path.exists(self._manifest_path()):
+            return {'next_id': 1, 'batches': []}
+        with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict):
+        tmp_path = f"{self._manifest_path()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _batch_path(self, batch_id: int) -> str:
+        return os.path.join(self.root_dir, f"batch-{batch_id:08d}")
+
+    def refresh(self):
+        """매니페스트 기준으로 배치 목록 동기화"""
+        with self._lock:
+            current = {batch.batch_id: batch for batch in self._batches}
+            manifest = self._read_manifest()
+            self._batches = tuple(current.get(batch_id) or RecordBatch.open(self._batch_path(batch_id))
+                                  for batch_id in manifest['batches'])
+
+    @property
+    def batches(self) -> Tuple[RecordBatch, ...]:
+        return self._batches
+
+    @property
+    def version(self) -> Tuple[int, ...]:
+        """열려 있는 배치 번호 목록"""
+        return tuple(batch.batch_id for batch in self._batches)
+
+    def disk_version(self) -> Tuple[int, ...]:
+        """디스크 매니페스트의 배치 번호 목록 (다른 프로세스의 추가 감지용)"""
+        return tuple(self._read_manifest()['batches'])
+
+    def add_batch(self, records: Iterable[Dict], name: Optional[str] = None,
+                  first_seen: Optional[str] = None, columns: Tuple[str, ...] = RECORD_COLUMNS) -> RecordBatch:
+        """유출 사고 하나의 레코드를 새 배치로 추가 (first_seen: 처음 알려진 날짜 YYYY-MM-DD, 기본 오늘)"""
+        with self._lock:
+            manifest = self._read_manifest()
+            batch_id = manifest['next_id']
+            manifest['next_id'] = batch_id + 1
+            self._write_manifest(manifest)
+
+        path = self._batch_path(batch_id)
+        meta = {
+            'id': batch_id,
+            'name': name or f"유출 사고 #{batch_id}",
+            'first_seen': first_seen or date.today().isoformat(),
+            'created_at': time.time()
+        }
+        try:
+            batch = RecordBatch.build(path, meta, records, columns=columns)
+        except Exception:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        with self._lock:
+            manifest = self._read_manifest()
+            manifest['batches'].append(batch_id)
+            self._write_manifest(manifest)
+            self._batches = self._batches + (batch,)
+        return batch
+
+    def find_records(self, criteria: Dict[str, str], limit: int = 100) -> List[Dict]:
+        """모든 조건(컬럼 → 값)이 한 레코드에 함께 있는 유출 레코드 (값 대신 노출된 컬럼 목록만 반환)"""
+        digests = {}
+        for column, value in criteria.items():
+            if column not in INDEXED_COLUMNS:
+                raise ValueError(f"조회할 수 없는 컬럼: {column}")
+            digest = digest_identifier(column, value) if value else None
+            if digest is None:
+                return []
+            digests[column] = digest
+
+        matches = []
+        for batch in self._batches:
+            if not all(batch.has_index(column) for column in digests):
+                continue
+
+            # 행 목록이 짧은 조건부터 교집합 (일치 행이 없으면 즉시 중단)
+            row_lists = sorted((batch.rows_for(column, digest) for column, digest in digests.items()), key=len)
+            rows = row_lists[0] if row_lists else np.empty(0, dtype=np.uint32)
+            for other in row_lists[1:]:
+                if len(rows) == 0:
+                    break
+                rows = np.intersect1d(rows, other, assume_unique=False)
+
+            for row in rows[:max(0, limit - len(matches))].tolist():
+                matches.append({
+                    'breach': batch.meta.get('name'),
+                    'first_seen': batch.meta.get('first_seen'),
+                    'row': row,
+                    'exposed_fields': batch.exposed_columns(row)
+                })
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def get_statistics(self) -> Dict:
+        return {
+            'batches': [batch.get_statistics() for batch in self._batches],
+            'rows': sum(batch.row_count for batch in self._batches)
+        }
+
+    def close(self):
+        with self._lock:
+            batches, self._batches = self._batches, ()
+        for batch in batches:
+            batch.close()
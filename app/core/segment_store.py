@@ -0,0 +1,778 @@
+import os
+import json
+import time
+import fcntl
+import heapq
+import shutil
+import threading
+import numpy as np
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.core.digest_index import DigestIndex
+from app.core.fingerprint_store import FingerprintStore, fingerprints_from_index, open_fingerprints, write_fingerprints
+from app.core.bloom_filter import BloomFilter
+from app.core.bk_tree import BKTree
+from app.core.ngram_index import NGramIndex
+from app.core.name_index import NameIndex
+from app.core.breach_postings import BreachPostings, write_entries
+from app.core.canonicalize import NORMALIZATION_VERSION
+from app.core.domain_index import DOMAIN_MEMBERS_NAME, DOMAINS_NAME, DomainIndex, merge_domain_indexes, write_domain_pairs
+
+INDEX_FIELDS = ('email', 'phone', 'name')
+MANIFEST_NAME = 'manifest.json'
+SEGMENT_META_NAME = 'segment.json'
+PASSWORD_PATTERNS_NAME = 'password.patterns'
+NAME_PATTERNS_NAME = 'name.patterns'
+
+
+def _read_patterns(path: str) -> Set[str]:
+    """줄 단위 패턴 파일 읽기 (없으면 빈 집합)"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return set(line.rstrip('\n') for line in f if line.rstrip('\n'))
+
+
+def _write_patterns(path: str, patterns: Set[str]):
+    with open(path, 'w', encoding='utf-8') as f:
+        for pattern in sorted(patterns):
+            f.write(f"{pattern}\n")
+
+
+class IndexSegment:
+    """불변 인덱스 세그먼트 (필드별 지문 저장소 + Bloom 필터 + 비밀번호 패턴 BK-트리/n-gram 인덱스 + 이름 근사 인덱스
+    + 이메일 도메인별 노출 집계)"""
+
+    def __init__(self, meta: Dict, stores: Dict[str, FingerprintStore],
+                 bloom_filters: Dict[str, Optional[BloomFilter]],
+                 password_patterns: Set[str], path: Optional[str] = None,
+                 postings: Optional[Dict[str, Optional[BreachPostings]]] = None,
+                 name_patterns: Optional[Set[str]] = None,
+                 domains: Optional[DomainIndex] = None):
+        self.meta = meta
+        self.stores = stores
+        self.bloom_filters = bloom_filters
+        # 필드별 다이제스트 위치 → 유출 사고 번호 목록 (없으면 모든 항목이 meta['breaches']에 속함)
+        self.postings = postings or {}
+        self.password_patterns = password_patterns
+        # 근사 이름 조회용 대표형 이름 (정확 조회는 다이제스트로 수행)
+        self.name_patterns = name_patterns or set()
+        # 도메인 다이제스트 → 유출 사고별 계정 수 (조직 단위 노출 조회)
+        self.domains = domains or DomainIndex()
+        self.path = path
+        # 비밀번호/이름 근사 인덱스는 첫 근사 조회 때 한 번만 생성 (세그먼트 로드를 빠르게 유지)
+        # 디스크에 저장하지 않으므로 워커 프로세스마다 따로 만들고 메모리도 공유되지 않음
+        self._password_tree: Optional[BKTree] = None
+        self._password_ngrams: Optional[NGramIndex] = None
+        self._name_index: Optional[NameIndex] = None
+        self._password_index_lock = threading.Lock()
+
+    @property
+    def segment_id(self) -> int:
+        return self.meta['id']
+
+    @property
+    def level(self) -> int:
+        return self.meta.get('level', 0)
+
+    @property
+    def normalization_version(self) -> int:
+        """세그먼트를 만들 때 사용한 식별자 정규화 규칙 버전 (기록 이전 세그먼트는 1)"""
+        return self.meta.get('normalization', 1)
+
+    @property
+    def password_tree(self) -> BKTree:
+        """편집 거리 유사 비밀번호 조회용 BK-트리"""
+        if self._password_tree is None:
+            with self._password_index_lock:
+                if self._password_tree is None:
+                    self._password_tree = BKTree(sorted(self.password_patterns))
+        return self._password_tree
+
+    @property
+    def password_ngrams(self) -> NGramIndex:
+        """부분 문자열 공유 비밀번호 후보 조회용 n-gram MinHash LSH"""
+        if self._password_ngrams is None:
+            with self._password_index_lock:
+                if self._password_ngrams is None:
+                    self._password_ngrams = NGramIndex(sorted(self.password_patterns))
+        return self._password_ngrams
+
+    @property
+    def name_index(self) -> NameIndex:
+        """띄어쓰기/오타/로마자 표기 차이를 흡수하는 이름 근사 인덱스"""
+        if self._name_index is None:
+            with self._password_index_lock:
+                if self._name_index is None:
+                    self._name_index = NameIndex(sorted(self.name_patterns),
+                                                 max_jamo_distance=settings.NAME_MAX_JAMO_DISTANCE)
+        return self._name_index
+
+    @property
+    def breach_ids(self) -> Tuple[int, ...]:
+        """세그먼트에 포함된 유출 사고 번호"""
+        return tuple(self.meta.get('breaches', ()))
+
+    @classmethod
+    def open(cls, path: str) -> 'IndexSegment':
+        """디스크 세그먼트 디렉터리 열기 (다이제스트는 mmap)"""
+        with open(os.path.join(path, SEGMENT_META_NAME), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        # 다이제스트/지문/Bloom 필터/출처 모두 읽기 전용 mmap (같은 세그먼트를 여는 워커 프로세스들이 메모리를 공유)
+        stores, bloom_filters, postings = {}, {}, {}
+        for field in INDEX_FIELDS:
+            digest_path = os.path.join(path, f"{field}.digests")
+            fingerprint_path = os.path.join(path, f"{field}.fingerprints")
+            bloom_path = os.path.join(path, f"{field}.bloom")
+            postings_path = os.path.join(path, f"{field}.postings")
+            if os.path.exists(digest_path):
+                fingerprints = open_fingerprints(fingerprint_path) if os.path.exists(fingerprint_path) else None
+                stores[field] = FingerprintStore(DigestIndex.open(digest_path), fingerprints=fingerprints)
+            else:
+                stores[field] = FingerprintStore()
+            bloom_filters[field] = BloomFilter.open(bloom_path) if os.path.exists(bloom_path) else None
+            postings[field] = BreachPostings.open(postings_path) if os.path.exists(postings_path) else None
+
+        # 패턴은 mmap이 아니라 프로세스마다 평문 집합으로 읽음 (근사 인덱스 생성용)
+        password_patterns = _read_patterns(os.path.join(path, PASSWORD_PATTERNS_NAME))
+        name_patterns = _read_patterns(os.path.join(path, NAME_PATTERNS_NAME))
+
+        return cls(meta, stores, bloom_filters, password_patterns, path=path, postings=postings,
+                   name_patterns=name_patterns, domains=DomainIndex.open(path))
+
+    @classmethod
+    def build(cls, meta: Dict, field_digests: Dict[str, Iterable],
+              password_patterns: Iterable[str] = (), path: Optional[str] = None,
+              use_bloom_filter: bool = True, bloom_fp_rate: float = 0.01,
+              bloom_bits_per_entry: Optional[float] = None,
+              with_postings: bool = False,
+              name_patterns: Iterable[str] = (),
+              domain_pairs: Optional[Iterable[Tuple[bytes, bytes]]] = None,
+              domain_members: bool = False,
+              merge_domains: Iterable[DomainIndex] = ()) -> 'IndexSegment':
+        """필드별 정렬된 다이제스트 스트림으로 새 세그먼트 생성 (path 지정 시 디스크에 저장)
+        with_postings이면 스트림 항목이 (다이제스트, 유출 사고 번호들)이며 출처 목록 파일도 생성 (병합용)
+        domain_pairs는 새 데이터의 (도메인 다이제스트, 이메일 다이제스트) 정렬 스트림 (유출 사고 번호 = 세그먼트 번호,
+        domain_members면 구성원도 저장), 병합 시에는 merge_domains의 집계를 합침"""
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+        stores, bloom_filters, postings, counts = {}, {}, {}, {}
+        breach_ids = set(meta.get('breaches', ()))
+        for field in INDEX_FIELDS:
+            sorted_digests = field_digests.get(field, ())
+            digest_path = os.path.join(path, f"{field}.digests") if path else None
+            if with_postings:
+                postings_path = os.path.join(path, f"{field}.postings") if path else None
+                digest_buffer, postings_buffer, field_breach_ids = write_entries(digest_path, postings_path, sorted_digests)
+                breach_ids.update(field_breach_ids)
+                if path:
+                    postings[field] = BreachPostings.open(postings_path)
+                else:
+                    stores[field] = FingerprintStore(DigestIndex(digest_buffer))
+                    postings[field] = BreachPostings(postings_buffer)
+            elif path:
+                DigestIndex.write_sorted(digest_path, sorted_digests)
+            else:
+                stores[field] = FingerprintStore(DigestIndex.from_sorted(sorted_digests))
+
+            if path:
+                # 지문 배열도 파일로 저장해 두고 mmap으로 열어 프로세스 간 공유
+                digests = DigestIndex.open(digest_path)
+                fingerprint_path = os.path.join(path, f"{field}.fingerprints")
+                write_fingerprints(fingerprint_path, fingerprints_from_index(digests))
+                stores[field] = FingerprintStore(digests, fingerprints=open_fingerprints(fingerprint_path))
+            counts[field] = len(stores[field])
+
+            bloom = None
+            if use_bloom_filter and counts[field]:
+                bloom = BloomFilter.from_records_buffer(
+                    stores[field].digests.buffer, counts[field],
+                    fp_rate=bloom_fp_rate, bits_per_entry=bloom_bits_per_entry
+                )
+                if path:
+                    bloom.save(os.path.join(path, f"{field}.bloom"))
+            bloom_filters[field] = bloom
+
+        aggregates_path = os.path.join(path, DOMAINS_NAME) if path else None
+        members_path = os.path.join(path, DOMAIN_MEMBERS_NAME) if path else None
+        if domain_pairs is not None:
+            domain_buffers = write_domain_pairs(aggregates_path, members_path, domain_pairs, meta['id'],
+                                                with_members=domain_members)
+        else:
+            domain_buffers = merge_domain_indexes(aggregates_path, members_path, list(merge_domains))
+        domains = DomainIndex.open(path) if path else DomainIndex(*domain_buffers)
+
+        password_patterns = set(password_patterns)
+        name_patterns = set(name_patterns)
+        meta = dict(meta, counts=counts, domains=len(domains), password_patterns=len(password_patterns),
+                    name_patterns=len(name_patterns), breaches=sorted(breach_ids))
+
+        if path:
+            _write_patterns(os.path.join(path, PASSWORD_PATTERNS_NAME), password_patterns)
+            _write_patterns(os.path.join(path, NAME_PATTERNS_NAME), name_patterns)
+            # 메타 파일은 마지막에 기록 (메타가 있으면 세그먼트가 완성된 것)
+            with open(os.path.join(path, SEGMENT_META_NAME), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        return cls(meta, stores, bloom_filters, password_patterns, path=path, postings=postings,
+                   name_patterns=name_patterns, domains=domains)
+
+    def positions_many(self, field: str, digests: List[bytes]) -> np.ndarray:
+        """Bloom 필터로 미발견을 먼저 거른 뒤 남은 후보만 정확 인덱스에서 위치 확인 (미발견은 -1)"""
+        found = np.full(len(digests), -1, dtype=np.int64)
+        store = self.stores[field]
+        if len(store) == 0 or not digests:
+            return found
+
+        bloom = self.bloom_filters.get(field)
+        if bloom is None:
+            candidates = np.arange(len(digests))
+        else:
+            candidates = np.nonzero(bloom.might_contain_many(digests))[0]
+
+        if len(candidates):
+            found[candidates] = store.positions_many([digests[i] for i in candidates])
+        return found
+
+    def contains_many(self, field: str, digests: List[bytes]) -> np.ndarray:
+        """배치 조회 (발견 여부)"""
+        return self.positions_many(field, digests) >= 0
+
+    def breach_ids_at(self, field: str, position: int) -> Tuple[int, ...]:
+        """position 번째 다이제스트의 유출 사고 번호들"""
+        postings = self.postings.get(field)
+        if postings is None:
+            return self.breach_ids
+        return postings.ids_at(position)
+
+    def iter_entries(self, field: str, low: bytes = b'', high: Optional[bytes] = None) -> Iterator[Tuple[bytes, Tuple[int, ...]]]:
+        """(다이제스트, 유출 사고 번호들)을 다이제스트 순서로 반환 (병합/샤드 분할용, 범위 지정 가능)"""
+        digests = self.stores[field].digests
+        start = digests.bisect_left(low)
+        end = digests.bisect_left(high) if high is not None else len(digests)
+        for position in range(start, end):
+            yield digests.digest_at(position), self.breach_ids_at(field, position)
+
+    def close(self):
+        """필드별 저장소(mmap) 해제"""
+        for store in self.stores.values():
+            store.close()
+        for postings in self.postings.values():
+            if postings is not None:
+                postings.close()
+        self.domains.close()
+
+    def get_statistics(self) -> Dict:
+        """세그먼트 통계 정보"""
+        return {
+            'id': self.segment_id,
+            'level': self.level,
+            'name': self.meta.get('name'),
+            'created_at': self.meta.get('created_at'),
+            'normalization': self.normalization_version,
+            'counts': {field: len(store) for field, store in self.stores.items()},
+            'password_patterns': len(self.password_patterns),
+            'name_patterns': len(self.name_patterns),
+            'domains': self.domains.get_statistics(),
+            'breaches': list(self.breach_ids),
+            'bloom_filters': {
+                field: bloom.get_statistics() if bloom else None
+                for field, bloom in self.bloom_filters.items()
+            }
+        }
+
+
+class SegmentStore:
+    """LSM 방식 정적 인덱스 저장소 (불변 세그먼트 + 백그라운드 병합)"""
+
+    def __init__(self, root_dir: Optional[str] = None,
+                 compaction_fanout: int = settings.STATIC_COMPACTION_FANOUT,
+                 compaction_interval: float = settings.STATIC_COMPACTION_INTERVAL,
+                 background_compaction: bool = settings.STATIC_COMPACTION_ENABLED):
+        self.root_dir = root_dir
+        self.compaction_fanout = max(2, compaction_fanout)
+        self.compaction_interval = compaction_interval
+        self.background_compaction = background_compaction
+
+        self._lock = threading.RLock()
+        self._segments: Tuple[IndexSegment, ...] = ()  # 조회는 튜플 스냅샷을 사용 (copy-on-write)
+        # 목록에서 빠진 세그먼트는 그 스냅샷을 쓰는 조회가 모두 끝난 뒤 해제 (id(세그먼트) → 조회 수 / 세그먼트)
+        self._readers_lock = threading.Lock()
+        self._readers: Dict[int, int] = {}
+        self._retired: Dict[int, IndexSegment] = {}
+        self._password_patterns: Set[str] = set()
+        self._breaches: Dict[int, Dict] = {}  # 유출 사고 카탈로그 (번호는 해당 사고를 처음 추가한 세그먼트 번호)
+        self._next_id = 1
+        self._compaction_event = threading.Event()
+        self._compactor = None
+        self._closed = False
+        self.version = 0  # 세그먼트 목록이 바뀔 때마다 증가 (매니페스트에 기록)
+
+        if self.root_dir:
+            os.makedirs(self._segments_dir(), exist_ok=True)
+            self.refresh()
+
+    # ---- 디스크 레이아웃 ----
+
+    def _segments_dir(self) -> str:
+        return os.path.join(self.root_dir, 'segments')
+
+    def _segment_path(self, segment_id: int) -> str:
+        return os.path.join(self._segments_dir(), f"seg-{segment_id:08d}")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root_dir, MANIFEST_NAME)
+
+    @contextmanager
+    def build_lock(self):
+        """초기 인덱스 생성 잠금 (여러 워커 프로세스가 동시에 시작해도 한 프로세스만 생성)"""
+        with self._file_lock('build.lock'):
+            yield
+
+    @contextmanager
+    def _file_lock(self, name: str = 'manifest.lock', blocking: bool = True):
+        """여러 프로세스(API, 워커, 수집 스크립트) 간 매니페스트 갱신 잠금"""
+        if not self.root_dir:
+            yield True
+            return
+
+        with open(os.path.join(self.root_dir, name), 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_manifest(self) -> Dict:
+        if not os.path.exists(self._manifest_path()):
+            return {'next_id': 1, 'segments': []}
+        with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict):
+        tmp_path = f"{self._manifest_path()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _set_segments(self, segments: List[IndexSegment]):
+        """세그먼트 목록 교체 (조회 중인 스레드는 이전 스냅샷을 계속 사용)"""
+        self._segments = tuple(sorted(segments, key=lambda segment: segment.segment_id))
+        patterns = set()
+        for segment in self._segments:
+            patterns.update(segment.password_patterns)
+        self._password_patterns = patterns
+
+    @contextmanager
+    def pinned(self) -> Iterator[Tuple[IndexSegment, ...]]:
+        """현재 세그먼트 스냅샷을 빌려 사용 (사용 중에는 병합/다른 프로세스 교체로 빠져도 해제되지 않음)"""
+        with self._readers_lock:
+            segments = self._segments
+            for segment in segments:
+                self._readers[id(segment)] = self._readers.get(id(segment), 0) + 1
+        try:
+            yield segments
+        finally:
+            released = []
+            with self._readers_lock:
+                for segment in segments:
+                    key = id(segment)
+                    self._readers[key] -= 1
+                    if self._readers[key] == 0:
+                        del self._readers[key]
+                        if key in self._retired:
+                            released.append(self._retired.pop(key))
+            for segment in released:
+                segment.close()
+
+    def _retire(self, segments: Iterable[IndexSegment]):
+        """목록에서 빠진 세그먼트 해제 (조회 중이면 마지막 조회가 끝날 때 해제)"""
+        released = []
+        with self._readers_lock:
+            for segment in segments:
+                if self._readers.get(id(segment)):
+                    self._retired[id(segment)] = segment
+                else:
+                    released.append(segment)
+        for segment in released:
+            segment.close()
+
+    @property
+    def persistent(self) -> bool:
+        """추가한 세그먼트가 디스크에 기록되어 다른 프로세스에서도 보이는지 (메모리/스냅샷 저장소는 False)"""
+        return bool(self.root_dir)
+
+    def disk_version(self) -> int:
+        """디스크 매니페스트의 현재 버전 (다른 프로세스의 변경 감지용)"""
+        if not self.root_dir:
+            return self.version
+        return self._read_manifest().get('version', 0)
+
+    def refresh(self):
+        """디스크 매니페스트 기준으로 세그먼트 목록 동기화 (다른 프로세스의 추가/병합 반영)"""
+        if not self.root_dir:
+            return
+
+        with self._lock:
+            for attempt in range(3):
+                manifest = self._read_manifest()
+                current = {segment.segment_id: segment for segment in self._segments}
+                try:
+                    segments = [current.get(segment_id) or IndexSegment.open(self._segment_path(segment_id))
+                                for segment_id in manifest['segments']]
+                    break
+                except FileNotFoundError:
+                    # 매니페스트를 읽은 직후 다른 프로세스가 병합으로 세그먼트를 교체한 경우 재시도
+                    if attempt == 2:
+                        raise
+            self._next_id = manifest['next_id']
+            self.version = manifest.get('version', 0)
+            self._breaches = {int(breach_id): breach for breach_id, breach in manifest.get('breaches', {}).items()}
+            self._warn_stale_normalization([segment for segment in segments if segment.segment_id not in current])
+            kept = {segment.segment_id for segment in segments}
+            self._set_segments(segments)
+            # 다른 프로세스의 병합으로 대체된 세그먼트
+            self._retire([segment for segment_id, segment in current.items() if segment_id not in kept])
+
+        self._schedule_compaction()
+
+    def _warn_stale_normalization(self, segments: Iterable[IndexSegment]):
+        """이전 정규화 규칙으로 만든 세그먼트 경고 (대표형이 달라 변형 입력이 조회되지 않을 수 있음)"""
+        stale = [segment.segment_id for segment in segments if segment.normalization_version < NORMALIZATION_VERSION]
+        if stale:
+            print(f"⚠️ 이전 정규화 규칙(v{NORMALIZATION_VERSION} 미만)으로 만든 세그먼트: {stale} - 원본 데이터로 재수집 필요")
+
+    # ---- 조회 ----
+
+    @property
+    def segments(self) -> Tuple[IndexSegment, ...]:
+        return self._segments
+
+    @property
+    def password_patterns(self) -> Set[str]:
+        return self._password_patterns
+
+    @property
+    def breaches(self) -> Dict[int, Dict]:
+        return self._breaches
+
+    def lookup_breaches(self, field: str, digests: List[bytes],
+                        since: Optional[str] = None) -> Tuple[np.ndarray, List[Tuple[int, ...]]]:
+        """다이제스트별 발견 여부와 유출 사고 번호 목록 (since 지정 시 그 날짜 이후 처음 알려진 사고만)
+        since 이후 사고가 없는 세그먼트는 카탈로그만 보고 건너뜀"""
+        allowed = None
+        if since is not None:
+            allowed = {breach_id for breach_id, breach in self._breaches.items() if breach.get('first_seen', '') > since}
+
+        found = np.zeros(len(digests), dtype=bool)
+        breach_ids = [set() for _ in digests]
+        with self.pinned() as segments:
+            for segment in segments:
+                if allowed is not None and not allowed.intersection(segment.breach_ids):
+                    continue
+                positions = segment.positions_many(field, digests)
+                for i in np.nonzero(positions >= 0)[0]:
+                    ids = segment.breach_ids_at(field, int(positions[i]))
+                    if allowed is not None:
+                        ids = [breach_id for breach_id in ids if breach_id in allowed]
+                        if not ids:
+                            continue
+                    found[i] = True
+                    breach_ids[i].update(ids)
+
+        return found, [tuple(sorted(ids)) for ids in breach_ids]
+
+    def import_breaches(self, breaches: Dict[int, Dict]):
+        """다른 저장소의 유출 사고 카탈로그 병합 (샤드 분할 시 출처 정보 유지)"""
+        with self._lock, self._file_lock():
+            if self.root_dir:
+                manifest = self._read_manifest()
+                catalog = manifest.setdefault('breaches', {})
+                for breach_id, breach in breaches.items():
+                    catalog[str(breach_id)] = breach
+                self._write_manifest(manifest)
+            self._breaches = {**self._breaches, **breaches}
+
+    def contains_many(self, field: str, digests: List[bytes]) -> np.ndarray:
+        """모든 세그먼트에 조회를 분산 (최신 세그먼트부터, 이미 찾은 항목은 제외)"""
+        found = np.zeros(len(digests), dtype=bool)
+
+        with self.pinned() as segments:
+            for segment in reversed(segments):
+                remaining = np.nonzero(~found)[0]
+                if len(remaining) == 0:
+                    break
+                hits = segment.contains_many(field, [digests[i] for i in remaining])
+                found[remaining[hits]] = True
+
+        return found
+
+    def prefix_range(self, field: str, prefix: int, bits: int) -> List[bytes]:
+        """모든 세그먼트에서 선행 bits 비트가 prefix인 다이제스트를 모아 정렬/중복 제거"""
+        digests = set()
+        with self.pinned() as segments:
+            for segment in segments:
+                digests.update(segment.stores[field].prefix_range(prefix, bits))
+        return sorted(digests)
+
+    def closest_password(self, password: str, max_distance: int) -> Optional[Tuple[int, str]]:
+        """모든 세그먼트에서 편집 거리 max_distance 이하인 가장 가까운 비밀번호 패턴"""
+        best = None
+        with self.pinned() as segments:
+            for segment in segments:
+                match = segment.password_tree.closest(password, best[0] - 1 if best else max_distance)
+                if match:
+                    best = match
+                    if best[0] == 0:
+                        break
+        return best
+
+    def best_password_ngram_match(self, password: str, threshold: float) -> Optional[Tuple[float, str]]:
+        """모든 세그먼트에서 n-gram 유사도가 threshold 이상인 가장 유사한 비밀번호 패턴"""
+        best = None
+        with self.pinned() as segments:
+            for segment in segments:
+                match = segment.password_ngrams.best(password, threshold)
+                if match and (best is None or match[0] > best[0]):
+                    best = match
+        return best
+
+    def closest_name(self, name: str, max_jamo_distance: int,
+                     roman_threshold: float) -> Optional[Tuple[float, str, str]]:
+        """모든 세그먼트에서 가장 유사한 이름 (유사도, 대표형 이름, 일치 방식)"""
+        best = None
+        with self.pinned() as segments:
+            for segment in segments:
+                match = segment.name_index.search(name, max_jamo_distance, roman_threshold)
+                if match and (best is None or match[0] > best[0]):
+                    best = match
+                    if best[0] == 1.0:
+                        break
+        return best
+
+    def domain_breach_counts(self, domain: bytes) -> Dict[int, int]:
+        """모든 세그먼트에서 도메인 다이제스트의 유출 사고 번호별 계정 수 (유출 사고는 세그먼트 하나에만 속함)"""
+        counts: Dict[int, int] = {}
+        with self.pinned() as segments:
+            for segment in segments:
+                for breach_id, count in segment.domains.breach_counts(domain).items():
+                    counts[breach_id] = counts.get(breach_id, 0) + count
+        return counts
+
+    def domain_members(self, domain: bytes) -> Optional[List[bytes]]:
+        """모든 세그먼트에서 도메인에 속한 유출 이메일 다이제스트 (정렬/중복 제거)
+        도메인 집계가 있는 세그먼트 중 하나라도 구성원을 저장하지 않았으면 None (일부만으로는 고유 계정 수가 틀려짐)"""
+        digests = set()
+        with self.pinned() as segments:
+            for segment in segments:
+                if not segment.domains.breach_counts(domain):
+                    continue
+                if not segment.domains.has_members:
+                    return None
+                digests.update(segment.domains.members(domain))
+        return sorted(digests)
+
+    def count(self, field: str) -> int:
+        """필드별 항목 수 (세그먼트 간 중복 포함)"""
+        with self.pinned() as segments:
+            return sum(len(segment.stores[field]) for segment in segments)
+
+    # ---- 세그먼트 추가 / 병합 ----
+
+    def add_segment(self, field_digests: Dict[str, Iterable],
+                    password_patterns: Iterable[str] = (),
+                    name: Optional[str] = None, level: int = 0,
+                    replaces: Iterable[IndexSegment] = (),
+                    use_bloom_filter: Optional[bool] = None,
+                    bloom_fp_rate: Optional[float] = None,
+                    bloom_bits_per_entry: Optional[float] = None,
+                    first_seen: Optional[str] = None,
+                    with_postings: bool = False,
+                    normalization_version: Optional[int] = None,
+                    name_patterns: Iterable[str] = (),
+                    domain_pairs: Optional[Iterable[Tuple[bytes, bytes]]] = None,
+                    domain_members: Optional[bool] = None,
+                    merge_domains: Iterable[DomainIndex] = ()) -> IndexSegment:
+        """정렬된 다이제스트 스트림으로 새 세그먼트를 만들고 즉시 조회 대상에 추가
+        새 데이터는 유출 사고 하나로 카탈로그에 등록 (first_seen: 처음 알려진 날짜 YYYY-MM-DD, 기본 오늘)
+        with_postings이면 스트림이 (다이제스트, 유출 사고 번호들)이며 카탈로그 등록 없음 (병합/분할용)
+        normalization_version은 다이제스트를 만든 정규화 규칙 버전 (기본: 병합 원본 중 가장 오래된 버전, 새 데이터는 현재 버전)
+        domain_pairs는 새 데이터의 (도메인 다이제스트, 이메일 다이제스트) 정렬 스트림 (도메인별 노출 집계용)"""
+        if use_bloom_filter is None:
+            use_bloom_filter = settings.STATIC_BLOOM_ENABLED
+        if bloom_fp_rate is None:
+            bloom_fp_rate = settings.STATIC_BLOOM_FP_RATE
+        if bloom_bits_per_entry is None:
+            bloom_bits_per_entry = settings.STATIC_BLOOM_BITS_PER_ENTRY or None
+        if domain_members is None:
+            domain_members = settings.STATIC_DOMAIN_MEMBERS
+
+        replaces = list(replaces)
+        replaced_ids = {segment.segment_id for segment in replaces}
+        if normalization_version is None:
+            normalization_version = min((segment.normalization_version for segment in replaces),
+                                        default=NORMALIZATION_VERSION)
+
+        # 세그먼트 번호 예약 (새 데이터면 같은 번호로 유출 사고 등록)
+        with self._lock, self._file_lock():
+            manifest = self._read_manifest() if self.root_dir else {'next_id': self._next_id, 'segments': []}
+            segment_id = max(manifest['next_id'], self._next_id)
+            self._next_id = segment_id + 1
+
+            breach = None
+            if not with_postings:
+                breach = {
+                    'name': name or f"유출 사고 #{segment_id}",
+                    'first_seen': first_seen or date.today().isoformat(),
+                    'added_at': time.time()
+                }
+                self._breaches = {**self._breaches, segment_id: breach}
+                manifest.setdefault('breaches', {})[str(segment_id)] = breach
+
+            if self.root_dir:
+                manifest['next_id'] = self._next_id
+                self._write_manifest(manifest)
+
+        # 세그먼트 파일 생성 (잠금 없이 수행 - 오래 걸릴 수 있음)
+        meta = {'id': segment_id, 'level': level, 'name': name, 'created_at': time.time(),
+                'normalization': normalization_version, 'breaches': [segment_id] if breach else []}
+        segment = IndexSegment.build(
+            meta, field_digests, password_patterns,
+            path=self._segment_path(segment_id) if self.root_dir else None,
+            use_bloom_filter=use_bloom_filter, bloom_fp_rate=bloom_fp_rate,
+            bloom_bits_per_entry=bloom_bits_per_entry,
+            with_postings=with_postings,
+            name_patterns=name_patterns,
+            domain_pairs=domain_pairs,
+            domain_members=domain_members,
+            merge_domains=merge_domains
+        )
+
+        # 매니페스트에 원자적으로 반영 (병합 결과는 원본 세그먼트를 대체)
+        with self._lock, self._file_lock():
+            if self.root_dir:
+                manifest = self._read_manifest()
+                manifest['segments'] = [sid for sid in manifest['segments'] if sid not in replaced_ids] + [segment_id]
+                manifest['version'] = manifest.get('version', 0) + 1
+                self._write_manifest(manifest)
+                self.refresh()
+                segment = next(s for s in self._segments if s.segment_id == segment_id)
+            else:
+                removed = [s for s in self._segments if s.segment_id in replaced_ids]
+                self._set_segments([s for s in self._segments if s.segment_id not in replaced_ids] + [segment])
+                self.version += 1
+                self._retire(removed)
+
+        # 대체된 세그먼트 파일 삭제 (이미 mmap 중인 조회는 inode가 유지되어 안전)
+        for old in replaces:
+            if old.path:
+                shutil.rmtree(old.path, ignore_errors=True)
+
+        self._schedule_compaction()
+        return segment
+
+    def _pick_compaction(self, segments: Optional[Tuple[IndexSegment, ...]] = None) -> List[IndexSegment]:
+        """같은 레벨에 fanout 개 이상 쌓인 가장 낮은 레벨의 오래된 세그먼트 선택"""
+        levels: Dict[int, List[IndexSegment]] = {}
+        for segment in self._segments if segments is None else segments:
+            levels.setdefault(segment.level, []).append(segment)
+
+        for level in sorted(levels):
+            if len(levels[level]) >= self.compaction_fanout:
+                return levels[level][:self.compaction_fanout]
+        return []
+
+    def compact(self) -> bool:
+        """세그먼트 한 묶음을 상위 레벨 세그먼트로 병합 (병합할 것이 없으면 False)"""
+        with self._file_lock('compaction.lock', blocking=False) as acquired:
+            if not acquired:
+                return False  # 다른 프로세스가 병합 중
+
+            self.refresh()
+            # 병합 중에는 원본 세그먼트가 해제되지 않도록 스냅샷을 빌려 둠 (교체 후 마지막 조회가 끝나면 해제)
+            with self.pinned() as segments:
+                group = self._pick_compaction(segments)
+                if not group:
+                    return False
+
+                print(f"🗜️ 세그먼트 병합 중: {[segment.segment_id for segment in group]}")
+                # 다이제스트별 출처(유출 사고 번호)를 합쳐 델타 인코딩 출처 목록으로 저장
+                field_entries = {
+                    field: heapq.merge(*[segment.iter_entries(field) for segment in group])
+                    for field in INDEX_FIELDS
+                }
+                patterns, name_patterns = set(), set()
+                for segment in group:
+                    patterns.update(segment.password_patterns)
+                    name_patterns.update(segment.name_patterns)
+
+                names = [segment.meta.get('name') for segment in group if segment.meta.get('name')]
+                self.add_segment(
+                    field_entries, patterns,
+                    name=', '.join(names) if names else None,
+                    level=max(segment.level for segment in group) + 1,
+                    replaces=group,
+                    with_postings=True,
+                    name_patterns=name_patterns,
+                    merge_domains=[segment.domains for segment in group]
+                )
+            return True
+
+    def _schedule_compaction(self):
+        """병합이 필요하면 백그라운드 병합 스레드 시작/깨우기"""
+        if not self.background_compaction or self._closed or not self._pick_compaction():
+            return
+
+        with self._lock:
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(target=self._compaction_loop, name='segment-compactor', daemon=True)
+                self._compactor.start()
+        self._compaction_event.set()
+
+    def _compaction_loop(self):
+        """백그라운드 병합 루프"""
+        while not self._closed:
+            self._compaction_event.wait(self.compaction_interval)
+            self._compaction_event.clear()
+            if self._closed:
+                break
+            try:
+                while self.compact():
+                    pass
+            except Exception as e:
+                print(f"⚠️ 세그먼트 병합 실패: {e}")
+
+    def close(self):
+        """병합 스레드 중지 및 세그먼트 자원(mmap) 해제 - 진행 중인 조회가 없을 때만 호출"""
+        self._closed = True
+        self._compaction_event.set()
+
+        # 진행 중인 병합이 끝날 때까지 대기 (병합 중 mmap이 닫히지 않도록)
+        compactor = self._compactor
+        if compactor and compactor.is_alive() and compactor is not threading.current_thread():
+            compactor.join()
+
+        with self._lock:
+            segments, self._segments = self._segments, ()
+            self._password_patterns = set()
+        for segment in segments:
+            segment.close()
+
+    def get_statistics(self) -> Dict:
+        """저장소 통계 정보"""
+        return {
+            'version': self.version,
+            'segments': [segment.get_statistics() for segment in self._segments],
+            'counts': {field: self.count(field) for field in INDEX_FIELDS},
+            'password_patterns': len(self._password_patterns),
+            'breaches': len(self._breaches)
+        }
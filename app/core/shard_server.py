@@ -0,0 +1,255 @@
+import os
+import json
+import heapq
+import socket
+import struct
+import threading
+import socketserver
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.digest_index import DIGEST_SIZE
+from app.core.segment_store import INDEX_FIELDS, SegmentStore
+
+# 배치 조회 프로토콜: 요청 헤더(op, 필드, 개수) + 다이제스트들 / 응답 헤더(개수) + 개수만큼의 0/1 바이트
+# 범위 조회는 개수 자리에 접두사 값을 넣고, 응답은 개수 + 다이제스트들
+REQUEST_HEADER = struct.Struct('!BBI')
+RESPONSE_HEADER = struct.Struct('!I')
+OP_LOOKUP = 1
+OP_STATS = 2
+OP_RANGE = 3
+MAX_BATCH = 1 << 20
+RANGE_PREFIX_BITS = 20  # k-익명성 범위 조회 접두사 비트 수 (16진수 5자리)
+
+
+def shard_bits_for(num_shards: int) -> int:
+    """샤드 수(2의 거듭제곱)에 해당하는 선행 비트 수"""
+    if num_shards < 1 or num_shards & (num_shards - 1):
+        raise ValueError(f"샤드 수는 2의 거듭제곱이어야 합니다: {num_shards}")
+    return num_shards.bit_length() - 1
+
+
+def shard_for_digest(digest: bytes, shard_bits: int) -> int:
+    """다이제스트 선행 비트로 샤드 번호 계산"""
+    if shard_bits == 0:
+        return 0
+    return int.from_bytes(digest[:2], 'big') >> (16 - shard_bits)
+
+
+def shard_prefix_bounds(shard: int, shard_bits: int) -> Tuple[bytes, Optional[bytes]]:
+    """샤드가 담당하는 다이제스트 범위 [start, end) (end가 None이면 끝까지)"""
+    step = 1 << (16 - shard_bits)
+    start = (shard * step).to_bytes(2, 'big')
+    end = ((shard + 1) * step).to_bytes(2, 'big') if (shard + 1) * step < (1 << 16) else None
+    return start, end
+
+
+def shard_dir_for(shard_root: str, shard: int) -> str:
+    """샤드 번호별 인덱스 디렉터리"""
+    return os.path.join(shard_root, f"shard-{shard:02d}")
+
+
+def partition_index(source_dir: str, shard_root: str, num_shards: int) -> List[Dict]:
+    """기존 세그먼트 인덱스를 다이제스트 접두사 범위별 샤드 인덱스로 분할 (샤드당 세그먼트 1개 추가)"""
+    shard_bits = shard_bits_for(num_shards)
+    source = SegmentStore(source_dir, background_compaction=False)
+    results = []
+
+    try:
+        for shard in range(num_shards):
+            low, high = shard_prefix_bounds(shard, shard_bits)
+            # 정렬된 세그먼트에서 접두사 범위만 잘라 출처(유출 사고 번호)와 함께 병합
+            field_entries = {
+                field: heapq.merge(*[segment.iter_entries(field, low, high) for segment in source.segments])
+                for field in INDEX_FIELDS
+            }
+            target = SegmentStore(shard_dir_for(shard_root, shard), background_compaction=False)
+            try:
+                target.import_breaches(source.breaches)
+                segment = target.add_segment(
+                    field_entries, name=f"shard {shard}/{num_shards} of {source_dir}", with_postings=True,
+                    normalization_version=min((s.normalization_version for s in source.segments), default=None)
+                )
+                results.append({'shard': shard, 'path': target.root_dir, 'counts': segment.meta['counts']})
+            finally:
+                target.close()
+    finally:
+        source.close()
+
+    return results
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """소켓에서 정확히 size 바이트 수신"""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("샤드 연결이 종료되었습니다")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+class _ShardRequestHandler(socketserver.BaseRequestHandler):
+    """연결당 스레드: 배치 조회 요청을 연속으로 처리"""
+
+    def handle(self):
+        store: SegmentStore = self.server.store
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        while True:
+            try:
+                op, field_code, count = REQUEST_HEADER.unpack(_recv_exact(sock, REQUEST_HEADER.size))
+            except ConnectionError:
+                return
+
+            if op == OP_LOOKUP and field_code < len(INDEX_FIELDS) and count <= MAX_BATCH:
+                payload = _recv_exact(sock, count * DIGEST_SIZE)
+                digests = [payload[i:i + DIGEST_SIZE] for i in range(0, len(payload), DIGEST_SIZE)]
+                found = store.contains_many(INDEX_FIELDS[field_code], digests)
+                sock.sendall(RESPONSE_HEADER.pack(count) + found.astype(np.uint8).tobytes())
+            elif op == OP_RANGE and field_code < len(INDEX_FIELDS):
+                digests = store.prefix_range(INDEX_FIELDS[field_code], count, RANGE_PREFIX_BITS)
+                sock.sendall(RESPONSE_HEADER.pack(len(digests)) + b''.join(digests))
+            elif op == OP_STATS:
+                body = json.dumps(store.get_statistics()['counts']).encode()
+                sock.sendall(RESPONSE_HEADER.pack(len(body)) + body)
+            else:
+                return  # 잘못된 요청은 연결 종료
+
+
+class ShardServer(socketserver.ThreadingTCPServer):
+    """단일 샤드 인덱스를 서빙하는 조회 서버 (프로세스 또는 노드당 1개)"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, index_dir: str, host: str, port: int,
+                 refresh_interval: float = settings.STATIC_INDEX_CHECK_INTERVAL):
+        super().__init__((host, port), _ShardRequestHandler)
+        self.store = SegmentStore(index_dir)
+        self.refresh_interval = refresh_interval
+        self._stopped = threading.Event()
+        threading.Thread(target=self._refresh_loop, name='shard-refresh', daemon=True).start()
+
+    def _refresh_loop(self):
+        """샤드 디렉터리에 새 세그먼트가 추가되면 반영"""
+        while not self._stopped.wait(self.refresh_interval):
+            try:
+                if self.store.disk_version() != self.store.version:
+                    self.store.refresh()
+            except Exception as e:
+                print(f"⚠️ 샤드 인덱스 갱신 실패: {e}")
+
+    def server_close(self):
+        self._stopped.set()
+        super().server_close()
+
+
+def serve_shard(index_dir: str, host: str, port: int):
+    """샤드 서버 실행 (블로킹)"""
+    server = ShardServer(index_dir, host, port)
+    counts = server.store.get_statistics()['counts']
+    print(f"🧩 샤드 서버 시작: {host}:{port} ({index_dir}) {counts}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+class ShardClient:
+    """단일 샤드 서버와의 지속 연결 (연결당 요청 1개씩 직렬 처리)"""
+
+    def __init__(self, address: str, timeout: float = settings.STATIC_SHARD_TIMEOUT):
+        host, port = address.rsplit(':', 1)
+        self.address = (host, int(port))
+        self.timeout = timeout
+        self._sock = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            self._sock = socket.create_connection(self.address, timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return self._sock
+
+    def _request(self, payload: bytes, read_body) -> bytes:
+        """요청 전송 후 응답 수신 (끊긴 연결은 한 번 재연결)"""
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    sock = self._connect()
+                    sock.sendall(payload)
+                    (size,) = RESPONSE_HEADER.unpack(_recv_exact(sock, RESPONSE_HEADER.size))
+                    return read_body(sock, size)
+                except (ConnectionError, OSError):
+                    self.close()
+                    if attempt == 1:
+                        raise
+
+    def contains_many(self, field: str, digests: List[bytes]) -> np.ndarray:
+        payload = REQUEST_HEADER.pack(OP_LOOKUP, INDEX_FIELDS.index(field), len(digests)) + b''.join(digests)
+        body = self._request(payload, _recv_exact)
+        return np.frombuffer(body, dtype=np.uint8).astype(bool)
+
+    def prefix_range(self, field: str, prefix: int) -> List[bytes]:
+        payload = REQUEST_HEADER.pack(OP_RANGE, INDEX_FIELDS.index(field), prefix)
+        body = self._request(payload, lambda sock, count: _recv_exact(sock, count * DIGEST_SIZE))
+        return [body[i:i + DIGEST_SIZE] for i in range(0, len(body), DIGEST_SIZE)]
+
+    def get_counts(self) -> Dict[str, int]:
+        body = self._request(REQUEST_HEADER.pack(OP_STATS, 0, 0), _recv_exact)
+        return json.loads(body)
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+
+class ShardRouter:
+    """다이제스트 선행 비트로 샤드를 골라 배치 조회를 병렬 전송하는 라우터"""
+
+    def __init__(self, addresses: List[str], timeout: float = settings.STATIC_SHARD_TIMEOUT):
+        self.shard_bits = shard_bits_for(len(addresses))
+        self.clients = [ShardClient(address, timeout=timeout) for address in addresses]
+        self._executor = ThreadPoolExecutor(max_workers=len(addresses), thread_name_prefix='shard-router')
+
+    def contains_many(self, field: str, digests: List[bytes]) -> np.ndarray:
+        """샤드별로 묶어 병렬 조회 후 원래 순서로 결과 병합"""
+        found = np.zeros(len(digests), dtype=bool)
+        groups: Dict[int, List[int]] = {}
+        for i, digest in enumerate(digests):
+            groups.setdefault(shard_for_digest(digest, self.shard_bits), []).append(i)
+
+        futures = {
+            shard: self._executor.submit(self.clients[shard].contains_many, field, [digests[i] for i in positions])
+            for shard, positions in groups.items()
+        }
+        for shard, future in futures.items():
+            found[groups[shard]] = future.result()
+
+        return found
+
+    def prefix_range(self, field: str, prefix: int) -> List[bytes]:
+        """범위 조회 접두사는 샤드 비트보다 길어 항상 샤드 하나에만 속함"""
+        shard = prefix >> (RANGE_PREFIX_BITS - self.shard_bits)
+        return self.clients[shard].prefix_range(field, prefix)
+
+    def get_statistics(self) -> Dict:
+        """샤드별 항목 수"""
+        return {
+            f"{client.address[0]}:{client.address[1]}": client.get_counts()
+            for client in self.clients
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        for client in self.clients:
+            client.close()
@@ -1,134 +1,419 @@
-import hashlib
+import os
+import math
 import time
-from typing import List, Dict, Set, Optional
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from app.config import settings
+from app.core.canonicalize import digest_identifier, normalize_identifier
+from app.core.domain_index import canonical_domain, domain_digest, email_domain
+from app.core.breach_join import build_watchlist, join_breach
+from app.core.segment_store import INDEX_FIELDS, SegmentStore
+from app.core.shard_server import RANGE_PREFIX_BITS, ShardRouter
+from app.core.index_snapshot import SnapshotStore
+from app.core.password_hashes import PasswordHashFile
+from app.core.record_store import RECORD_MANIFEST_NAME, RecordStore
+
+RANGE_PREFIX_LENGTH = RANGE_PREFIX_BITS // 4  # 범위 조회 접두사 길이 (16진수 자릿수)
 
 class StaticLeakDetector:
-    def __init__(self):
-        self.email_trie = set()  # 이메일 해시 저장
-        self.phone_trie = set()  # 전화번호 해시 저장
-        self.name_trie = set()   # 이름 해시 저장
-        self.password_patterns = set()  # 비밀번호 패턴 저장
-        
-    def _hash_value(self, value: str) -> str:
-        """값을 SHA256으로 해시화"""
-        return hashlib.sha256(value.lower().strip().encode()).hexdigest()
-    
-    def _normalize_phone(self, phone: str) -> str:
-        """전화번호 정규화 (숫자만 추출)"""
-        return ''.join(filter(str.isdigit, phone))
-    
-    def load_leak_database(self, leak_data: Dict[str, List[str]]):
-        """유출 데이터베이스 로드"""
+    def __init__(self, index_dir: Optional[str] = None, shard_addresses: Optional[List[str]] = None,
+                 snapshot_path: Optional[str] = None, password_hash_path: Optional[str] = None,
+                 record_store_dir: Optional[str] = None):
+        # 불변 세그먼트 기반 다이제스트 인덱스 (index_dir 지정 시 디스크 세그먼트를 mmap으로 사용)
+        # snapshot_path 지정 시 미리 빌드한 바이너리 스냅샷을 mmap하여 즉시 사용 (index_dir보다 우선)
+        self.index_dir = index_dir
+        self.snapshot_path = snapshot_path
+        self.segments = SnapshotStore(snapshot_path) if snapshot_path else SegmentStore(index_dir)
+        # 샤드 주소 지정 시 이메일/전화번호/이름 조회는 해시 접두사 샤드 서버로 라우팅 (비밀번호 패턴은 로컬 인덱스)
+        self.router = ShardRouter(shard_addresses) if shard_addresses else None
+        # 정확한 비밀번호 유출 횟수 조회용 정렬 해시 파일 (평문 없이 해시 + 출현 횟수만 mmap)
+        self.password_hash_path = password_hash_path
+        self.password_hashes = (PasswordHashFile.open(password_hash_path)
+                                if password_hash_path and os.path.exists(password_hash_path) else None)
+        self.password_hash_mtime = self._password_hash_mtime()
+        # 레코드 단위 교차 조회용 컬럼형 유출 레코드 저장소 (여러 식별자가 같은 레코드에 있는지)
+        self.record_store_dir = record_store_dir
+        self.records = RecordStore(record_store_dir) if record_store_dir and os.path.isdir(record_store_dir) else None
+        
+    @property
+    def password_patterns(self) -> Set[str]:
+        """전체 세그먼트의 비밀번호 패턴"""
+        return self.segments.password_patterns
+        
+    def _contains_many(self, field: str, digests: List[bytes]) -> np.ndarray:
+        """모든 세그먼트에서 조회 (세그먼트별 Bloom 필터로 미발견을 먼저 거름, 샤드 모드면 샤드 서버에 병렬 조회)"""
+        if field not in INDEX_FIELDS:
+            raise ValueError(f"지원하지 않는 탐지 타입: {field}")
+        if self.router:
+            return self.router.contains_many(field, digests)
+        return self.segments.contains_many(field, digests)
+    
+    def range_query(self, field: str, prefix: str) -> List[str]:
+        """k-익명성 범위 조회: SHA256 16진수 앞 5자리가 prefix인 유출 다이제스트의 나머지 자리 목록
+        field가 password면 비밀번호 해시 파일에서 '나머지 자리:출현 횟수' 목록 (Pwned Passwords 형식)"""
+        if field not in INDEX_FIELDS and field != 'password':
+            raise ValueError(f"지원하지 않는 탐지 타입: {field}")
+        if len(prefix) != RANGE_PREFIX_LENGTH or any(c not in '0123456789abcdefABCDEF' for c in prefix):
+            raise ValueError(f"접두사는 16진수 {RANGE_PREFIX_LENGTH}자리여야 합니다: {prefix}")
+        
+        prefix_value = int(prefix, 16)
+        if field == 'password':
+            if self.password_hashes is None:
+                return []
+            return [f"{digest.hex()[RANGE_PREFIX_LENGTH:].upper()}:{count}"
+                    for digest, count in self.password_hashes.prefix_range(prefix_value, RANGE_PREFIX_BITS)]
+        if self.router:
+            digests = self.router.prefix_range(field, prefix_value)
+        else:
+            digests = self.segments.prefix_range(field, prefix_value, RANGE_PREFIX_BITS)
+        return [digest.hex()[RANGE_PREFIX_LENGTH:].upper() for digest in digests]
+    
+    def is_loaded(self) -> bool:
+        """로컬 인덱스에 데이터가 있는지 여부"""
+        return any(self.segments.count(field) > 0 for field in INDEX_FIELDS)
+    
+    def _password_hash_mtime(self) -> Optional[float]:
+        """비밀번호 해시 파일 수정 시각 (파일이 없으면 None)"""
+        if not self.password_hash_path:
+            return None
+        try:
+            return os.path.getmtime(self.password_hash_path)
+        except OSError:
+            return None
+    
+    def index_changed(self) -> bool:
+        """다른 프로세스가 디스크 인덱스(세그먼트 매니페스트/스냅샷, 비밀번호 해시 파일, 레코드 저장소 배치)를 갱신했는지"""
+        if self.segments.disk_version() != self.segments.version:
+            return True
+        if self._password_hash_mtime() != self.password_hash_mtime:
+            return True
+        if self.records is not None:
+            return self.records.disk_version() != self.records.version
+        # 레코드 저장소가 시작 후에 처음 만들어진 경우
+        return bool(self.record_store_dir) and os.path.exists(os.path.join(self.record_store_dir, RECORD_MANIFEST_NAME))
+    
+    def load_leak_database(self, leak_data: Dict[str, List[str]],
+                           name: Optional[str] = None,
+                           first_seen: Optional[str] = None,
+                           use_bloom_filter: Optional[bool] = None,
+                           bloom_fp_rate: Optional[float] = None,
+                           bloom_bits_per_entry: Optional[float] = None) -> Dict:
+        """유출 데이터베이스 로드 - 유출 사고 하나(name, first_seen)로 새 세그먼트에 추가되어 즉시 조회 가능
+        (Bloom 필터 오탐률/크기는 빌드 파라미터)"""
         print("정적 유출 DB 로딩 중...")
         start_time = time.time()
         
-        # 이메일 처리
-        if 'emails' in leak_data:
-            for email in leak_data['emails']:
-                self.email_trie.add(self._hash_value(email))
+        # 인덱스 시점에 대표형으로 모아 해시 (조회는 대표형 한 번만 찾으면 됨)
+        field_digests = {field: set() for field in INDEX_FIELDS}
+        for field, key in (('email', 'emails'), ('phone', 'phones'), ('name', 'names')):
+            for value in leak_data.get(key, []):
+                digest = digest_identifier(field, value)
+                if digest is not None:
+                    field_digests[field].add(digest)
+        email_digests, phone_digests, name_digests = (field_digests[field] for field in INDEX_FIELDS)
         
-        # 전화번호 처리
-        if 'phones' in leak_data:
-            for phone in leak_data['phones']:
-                normalized_phone = self._normalize_phone(phone)
-                if normalized_phone:
-                    self.phone_trie.add(self._hash_value(normalized_phone))
+        # 도메인별 노출 집계용 (도메인 다이제스트, 이메일 다이제스트) 쌍
+        domain_pairs = set()
+        for value in leak_data.get('emails', []):
+            domain = email_domain(value) if value else None
+            if domain:
+                domain_pairs.add((domain_digest(domain), digest_identifier('email', value)))
         
-        # 이름 처리
-        if 'names' in leak_data:
-            for name in leak_data['names']:
-                self.name_trie.add(self._hash_value(name))
-        
-        # 비밀번호 패턴 처리
-        if 'passwords' in leak_data:
-            for password in leak_data['passwords']:
-                self.password_patterns.add(password)
+        # 새 불변 세그먼트로 추가 (병합은 백그라운드 컴팩터가 수행)
+        segment = self.segments.add_segment(
+            {
+                'email': sorted(email_digests),
+                'phone': sorted(phone_digests),
+                'name': sorted(name_digests),
+            },
+            password_patterns=leak_data.get('passwords', []),
+            name_patterns=[normalize_identifier('name', value) for value in leak_data.get('names', []) if value],
+            domain_pairs=sorted(domain_pairs),
+            name=name,
+            first_seen=first_seen,
+            use_bloom_filter=use_bloom_filter,
+            bloom_fp_rate=bloom_fp_rate,
+            bloom_bits_per_entry=bloom_bits_per_entry
+        )
         
         load_time = time.time() - start_time
-        print(f"정적 유출 DB 로딩 완료: {load_time:.2f}초")
-        print(f"이메일: {len(self.email_trie)}개, 전화번호: {len(self.phone_trie)}개, 이름: {len(self.name_trie)}개")
+        stats = self.get_statistics()
+        stats['load_time'] = load_time
+        stats['segment'] = segment.get_statistics()
+        print(f"정적 유출 DB 로딩 완료: {load_time:.2f}초 (세그먼트 #{segment.segment_id}, 전체 {len(stats['segments'])}개)")
+        print(f"이메일: {len(email_digests)}개, 전화번호: {len(phone_digests)}개, 이름: {len(name_digests)}개")
+        for field, bloom_stats in stats['segment']['bloom_filters'].items():
+            if bloom_stats:
+                print(f"Bloom 필터 [{field}]: {bloom_stats['size_bytes']:,}바이트, "
+                      f"원소당 {bloom_stats['bits_per_entry']}비트, 예상 오탐률 {bloom_stats['expected_fp_rate']:.4%}")
+        
+        return stats
     
-    def detect_email(self, email: str) -> Dict:
-        """이메일 유출 탐지"""
+    def get_statistics(self) -> Dict:
+        """인덱스 통계 정보 (세그먼트별 개수/Bloom 필터 포함)"""
+        stats = self.segments.get_statistics()
+        if self.router:
+            stats['shards'] = self.router.get_statistics()
+        if self.password_hashes is not None:
+            stats['password_hashes'] = self.password_hashes.get_statistics()
+        if self.records is not None:
+            stats['records'] = self.records.get_statistics()
+        return stats
+    
+    def close(self):
+        """인덱스 자원 해제"""
+        if self.router:
+            self.router.close()
+        if self.password_hashes is not None:
+            self.password_hashes.close()
+        if self.records is not None:
+            self.records.close()
+        self.segments.close()
+    
+    def _digest_many(self, field: str, values: List[str], since: Optional[str] = None) -> np.ndarray:
+        """정규화/해시 후 한 번의 배치 조회 (정규화 결과가 빈 값은 미발견)
+        since(YYYY-MM-DD) 지정 시 그 날짜 이후 처음 알려진 유출 사고에 포함된 값만 발견 (이전 사고만 담은 세그먼트는 건너뜀)"""
+        if since is not None and self.router:
+            raise ValueError("샤드 모드에서는 유출 사고 날짜 조건(since)을 지원하지 않습니다")
+        digests = [digest_identifier(field, value) for value in values]
+        valid = [i for i, digest in enumerate(digests) if digest is not None]
+        
+        found = np.zeros(len(values), dtype=bool)
+        if valid:
+            valid_digests = [digests[i] for i in valid]
+            if since is None:
+                found[valid] = self._contains_many(field, valid_digests)
+            else:
+                found[valid] = self.segments.lookup_breaches(field, valid_digests, since=since)[0]
+        return found
+    
+    def detect_many(self, emails: Optional[List[str]] = None,
+                    phones: Optional[List[str]] = None,
+                    names: Optional[List[str]] = None,
+                    since: Optional[str] = None) -> Dict:
+        """여러 식별자 일괄 탐지 - 타입별로 한 번씩 배치 조회 후 detect_all과 같은 형식의 결과 목록 반환
+        since(YYYY-MM-DD)를 주면 그 날짜 이후 처음 알려진 유출 사고만 대상 (정기 재점검에서 새 노출만 확인)"""
+        evidence = f"정적 DB에서 발견됨 ({since} 이후 유출 사고)" if since else "정적 DB에서 발견됨"
+        results = {'emails': [], 'phones': [], 'names': [], 'total_time': 0}
         start_time = time.time()
-        email_hash = self._hash_value(email)
-        is_leaked = email_hash in self.email_trie
+        
+        for key, field, values in (('emails', 'email', emails), ('phones', 'phone', phones), ('names', 'name', names)):
+            if not values:
+                continue
+            
+            field_start = time.time()
+            found = self._digest_many(field, values, since=since)
+            # 배치 조회 시간을 항목 수로 나눈 평균 탐지 시간
+            detection_time = (time.time() - field_start) * 1000 / len(values)
+            
+            results[key] = [
+                {
+                    'target': value,
+                    'is_leaked': bool(is_leaked),
+                    'risk_score': 1.0 if is_leaked else 0.0,
+                    'detection_time': detection_time,
+                    'evidence': evidence if is_leaked else None
+                }
+                for value, is_leaked in zip(values, found)
+            ]
+        
+        results['total_time'] = (time.time() - start_time) * 1000  # ms 단위
+        return results
+    
+    def _describe_breaches(self, breach_ids) -> List[Dict]:
+        """유출 사고 번호를 카탈로그 정보(이름, 처음 알려진 날짜)로 변환 (날짜순)"""
+        catalog = self.segments.breaches
+        breaches = [
+            {'id': breach_id, 'name': catalog[breach_id].get('name'), 'first_seen': catalog[breach_id].get('first_seen')}
+            for breach_id in breach_ids if breach_id in catalog
+        ]
+        return sorted(breaches, key=lambda breach: (breach['first_seen'] or '', breach['id']))
+    
+    def _lookup_breaches(self, field: str, digest: Optional[bytes]) -> Tuple[bool, List[Dict]]:
+        """단일 다이제스트의 발견 여부와 출처 유출 사고 목록 (샤드 모드는 발견 여부만)"""
+        if digest is None:
+            return False, []
+        if self.router:
+            return bool(self._contains_many(field, [digest])[0]), []
+        found, breach_ids = self.segments.lookup_breaches(field, [digest])
+        return bool(found[0]), self._describe_breaches(breach_ids[0])
+    
+    def _static_result(self, target: str, field: str, digest: Optional[bytes], start_time: float) -> Dict:
+        """정적 탐지 결과 (출처 유출 사고 이름/날짜 포함)"""
+        is_leaked, breaches = self._lookup_breaches(field, digest)
+        
+        evidence = None
+        if is_leaked:
+            evidence = "정적 DB에서 발견됨"
+            if breaches:
+                sources = ', '.join(f"{breach['name']}({breach['first_seen']})" for breach in breaches)
+                evidence += f" - 유출 {len(breaches)}건: {sources}"
         
         detection_time = (time.time() - start_time) * 1000  # ms 단위
         
         return {
-            'target': email,
+            'target': target,
             'is_leaked': is_leaked,
             'risk_score': 1.0 if is_leaked else 0.0,
             'detection_time': detection_time,
-            'evidence': f"정적 DB에서 발견됨" if is_leaked else None
+            'evidence': evidence,
+            'breaches': breaches,
+            'breach_count': len(breaches)
         }
     
+    def detect_email(self, email: str) -> Dict:
+        """이메일 유출 탐지"""
+        start_time = time.time()
+        return self._static_result(email, 'email', digest_identifier('email', email), start_time)
+    
     def detect_phone(self, phone: str) -> Dict:
         """전화번호 유출 탐지"""
         start_time = time.time()
-        normalized_phone = self._normalize_phone(phone)
-        phone_hash = self._hash_value(normalized_phone)
-        is_leaked = phone_hash in self.phone_trie
+        return self._static_result(phone, 'phone', digest_identifier('phone', phone), start_time)
+    
+    def detect_name(self, name: str,
+                    max_jamo_distance: int = settings.NAME_MAX_JAMO_DISTANCE,
+                    roman_threshold: float = settings.NAME_ROMAN_THRESHOLD) -> Dict:
+        """이름 유출 탐지 (정확히 일치하지 않으면 자모 분해/로마자 표기 인덱스로 띄어쓰기, 오타, 한글-영문 표기 차이 탐지)"""
+        start_time = time.time()
+        result = self._static_result(name, 'name', digest_identifier('name', name), start_time)
+        if result['is_leaked'] or not name or not name.strip():
+            return result
+        
+        match = self.segments.closest_name(name, max_jamo_distance, roman_threshold)
+        if match is None:
+            return result
+        
+        # 일치한 이름의 출처 유출 사고를 붙이고 유사도만큼 위험도를 낮춤
+        similarity, matched_name, method = match
+        approximate = self._static_result(name, 'name', digest_identifier('name', matched_name), start_time)
+        if not approximate['is_leaked']:
+            return result
+        description = '자모 분해' if method == 'jamo' else '로마자 표기'
+        approximate['evidence'] = f"유사한 이름 발견 ({description} 유사도 {similarity:.2f}) - {approximate['evidence']}"
+        approximate['risk_score'] = round(0.8 * similarity, 2)
+        return approximate
+    
+    def detect_password_pattern(self, password: str,
+                                max_distance: int = settings.PASSWORD_MAX_EDIT_DISTANCE,
+                                ngram_threshold: float = settings.PASSWORD_NGRAM_THRESHOLD) -> Dict:
+        """비밀번호 패턴 유사도 탐지 (Levenshtein distance BK-트리 → n-gram LSH 후보의 Jaccard 유사도 순)"""
+        start_time = time.time()
         
+        evidence, risk_score = None, 0.0
+        match = self.segments.closest_password(password, max_distance)
+        if match is not None:
+            risk_score = 1.0 if match[0] == 0 else 0.8
+            evidence = f"유사한 패턴 발견 (편집 거리 {match[0]})"
+        else:
+            # 편집 거리로는 멀지만 부분 문자열을 많이 공유하는 패턴 (예: sunny97! / Sunny1997!)
+            ngram_match = self.segments.best_password_ngram_match(password, ngram_threshold)
+            if ngram_match is not None:
+                risk_score = 0.6
+                evidence = f"공통 부분 문자열 패턴 발견 (n-gram 유사도 {ngram_match[0]:.2f})"
+        
+        is_similar = evidence is not None
         detection_time = (time.time() - start_time) * 1000  # ms 단위
         
         return {
-            'target': phone,
-            'is_leaked': is_leaked,
-            'risk_score': 1.0 if is_leaked else 0.0,
+            'target': password,
+            'is_leaked': is_similar,
+            'risk_score': risk_score,
             'detection_time': detection_time,
-            'evidence': f"정적 DB에서 발견됨" if is_leaked else None
+            'evidence': evidence
         }
     
-    def detect_name(self, name: str) -> Dict:
-        """이름 유출 탐지"""
+    def detect_password(self, password: str) -> Dict:
+        """정확한 비밀번호 유출 탐지 - 정렬 해시 파일에서 출현 횟수 조회 (많이 나온 비밀번호일수록 위험도 높음)"""
         start_time = time.time()
-        name_hash = self._hash_value(name)
-        is_leaked = name_hash in self.name_trie
+        
+        occurrences = self.password_hashes.count(password) if self.password_hashes is not None and password else 0
+        is_leaked = occurrences > 0
         
         detection_time = (time.time() - start_time) * 1000  # ms 단위
         
         return {
-            'target': name,
+            'target': password,
             'is_leaked': is_leaked,
-            'risk_score': 1.0 if is_leaked else 0.0,
+            'risk_score': min(1.0, 0.7 + 0.1 * math.log10(occurrences)) if is_leaked else 0.0,
             'detection_time': detection_time,
-            'evidence': f"정적 DB에서 발견됨" if is_leaked else None
+            'evidence': f"유출 비밀번호 목록에서 {occurrences:,}회 발견됨" if is_leaked else None,
+            'occurrences': occurrences
         }
     
-    def detect_password_pattern(self, password: str) -> Dict:
-        """비밀번호 패턴 유사도 탐지 (Levenshtein distance)"""
+    def correlate_records(self, email: Optional[str] = None, phone: Optional[str] = None,
+                          name: Optional[str] = None, limit: int = 100) -> Dict:
+        """주어진 식별자가 모두 한 유출 레코드에 함께 있는지 조회하고, 그 레코드에서 함께 노출된 항목 반환"""
         start_time = time.time()
+        criteria = {field: value for field, value in (('email', email), ('phone', phone), ('name', name)) if value}
+        if not criteria:
+            raise ValueError("이메일, 전화번호, 이름 중 하나 이상이 필요합니다")
         
-        # 간단한 패턴 매칭 (실제로는 더 정교한 알고리즘 필요)
-        is_similar = any(self._calculate_similarity(password, pattern) > 0.8 
-                        for pattern in self.password_patterns)
-        
-        detection_time = (time.time() - start_time) * 1000  # ms 단위
+        records = self.records.find_records(criteria, limit=limit) if self.records is not None else []
+        exposed = sorted({field for record in records for field in record['exposed_fields']} - set(criteria))
         
         return {
-            'target': password,
-            'is_leaked': is_similar,
-            'risk_score': 0.8 if is_similar else 0.0,
-            'detection_time': detection_time,
-            'evidence': f"유사한 패턴 발견" if is_similar else None
+            'criteria': sorted(criteria),
+            'is_leaked': bool(records),
+            'record_count': len(records),
+            'records': records,
+            'exposed_fields': exposed,
+            'evidence': f"{len(records)}개 유출 레코드에 함께 노출됨 (추가 노출 항목: {', '.join(exposed) or '없음'})" if records else None,
+            'detection_time': (time.time() - start_time) * 1000  # ms 단위
         }
     
-    def _calculate_similarity(self, str1: str, str2: str) -> float:
-        """간단한 문자열 유사도 계산"""
-        if not str1 or not str2:
-            return 0.0
+    def domain_exposure(self, domain: str, include_members: bool = False) -> Dict:
+        """조직 도메인의 유출 사고별 노출 계정 수 (구성원을 하나씩 조회하지 않고 도메인 집계를 한 번 조회)
+        include_members이고 구성원 다이제스트를 저장한 경우 고유 계정 수와 이메일 다이제스트(16진수) 목록도 반환"""
+        start_time = time.time()
+        domain = canonical_domain(domain)
+        if not domain or '@' in domain or '.' not in domain:
+            raise ValueError(f"올바른 도메인이 아닙니다: {domain}")
         
-        # 간단한 Jaccard 유사도
-        set1 = set(str1.lower())
-        set2 = set(str2.lower())
+        digest = domain_digest(domain)
+        counts = self.segments.domain_breach_counts(digest)
+        catalog = self.segments.breaches
+        breaches = sorted(
+            ({'id': breach_id, 'name': catalog.get(breach_id, {}).get('name'),
+              'first_seen': catalog.get(breach_id, {}).get('first_seen'), 'accounts': count}
+             for breach_id, count in counts.items()),
+            key=lambda breach: (breach['first_seen'] or '', breach['id'])
+        )
+        total = sum(counts.values())
         
-        intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
+        result = {
+            'domain': domain,
+            'is_exposed': bool(counts),
+            'breach_count': len(breaches),
+            'total_accounts': total,
+            'distinct_accounts': None,
+            'breaches': breaches,
+            'evidence': f"유출 {len(breaches)}건에서 계정 {total:,}개 노출 (유출 사고별 합계)" if counts else None
+        }
+        if include_members:
+            members = self.segments.domain_members(digest)
+            if members is not None:
+                result['distinct_accounts'] = len(members)
+                result['member_digests'] = [member.hex() for member in members]
+        result['detection_time'] = (time.time() - start_time) * 1000  # ms 단위
+        return result
+    
+    def match_breach(self, breach_id: int, identifiers: Iterable[Tuple[int, str, Optional[str]]]) -> Dict:
+        """새 유출 사고 하나와 감시 식별자((사용자 번호, 탐지 타입, 값) 목록)의 역방향 조인
+        사용자마다 조회하지 않고 감시 목록을 다이제스트 순으로 정렬해 유출 사고 다이제스트와 한 번에 병합"""
+        start_time = time.time()
+        breach = self.segments.breaches.get(breach_id)
+        if breach is None:
+            raise ValueError(f"유출 사고를 찾을 수 없습니다: {breach_id}")
         
-        return intersection / union if union > 0 else 0.0
+        watchlist = build_watchlist(identifiers)
+        matches = join_breach(self.segments, breach_id, watchlist)
+        return {
+            'breach': {'id': breach_id, 'name': breach.get('name'), 'first_seen': breach.get('first_seen')},
+            'monitored': sum(len(entries) for entries in watchlist.values()),
+            'matches': [{'field': field, 'user_id': user_id, 'value': value} for field, user_id, value in matches],
+            'join_time': (time.time() - start_time) * 1000  # ms 단위
+        }
     
     def detect_all(self, email: Optional[str] = None, 
                    phone: Optional[str] = None, 
@@ -156,6 +441,8 @@ class StaticLeakDetector:
         
         if password:
             results['password'] = self.detect_password_pattern(password)
+            if self.password_hashes is not None:
+                results['password_exposure'] = self.detect_password(password)
         
         results['total_time'] = (time.time() - start_time) * 1000  # ms 단위
         
@@ -0,0 +1,169 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from app.core.canonicalize import canonical_email, canonical_name, canonical_phone
+
+# 발견 항목: (탐지 타입, 본문에 나온 값, 시작 위치, 끝 위치, 일치한 대상의 대표형)
+TargetHit = Tuple[str, str, int, int, str]
+
+# 구조형 개인정보(이메일/전화번호) 후보를 한 번에 찾는 통합 정규식
+# 앞 문자 조건으로 토큰 중간에서는 시도하지 않아 긴 토큰에서도 선형으로 진행
+STRUCTURAL_PATTERN = re.compile(r'''
+    (?P<email>(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)
+  | (?P<phone>(?<![\w+])
+        (?:\+82[-\s]?\d{1,2}[-\s]?\d{3,4}[-\s]?\d{4}   # +82-10-1234-5678
+          | \d{2,3}-\d{3,4}-\d{4}                     # 010-1234-5678, 02-123-4567
+          | \d{10,11}                                 # 01012345678
+        )(?!\w))
+''', re.VERBOSE)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _is_hangul(char: str) -> bool:
+    return '가' <= char <= '힣'
+
+
+def fold_case(text: str) -> str:
+    """대소문자 무시 비교용 소문자 변환 (길이가 바뀌는 문자는 그대로 두어 위치를 원문과 맞춤)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+class AhoCorasick:
+    """Aho-Corasick 다중 문자열 검색 오토마톤
+    키워드 수와 무관하게 본문을 한 번만 훑어 모든 키워드 출현 위치를 찾음"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for keyword in keywords:
+            if keyword and keyword not in self.keywords:
+                self._add(keyword)
+        self._build()
+
+    def _add(self, keyword: str):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self.keywords))
+        self.keywords.append(keyword)
+
+    def _build(self):
+        """너비 우선으로 실패 링크를 만들고, 실패 링크 쪽 출력을 합쳐 검색 중 링크를 따라가지 않게 함"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(끝 위치, 키워드 번호) - 끝 위치는 매칭 다음 문자 위치"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                yield position + 1, keyword
+
+
+def target_key(target_type: str, target_value: str) -> str:
+    """매처가 발견 항목에 붙이는 대상 대표형 (발견 항목을 어느 대상의 것인지 찾을 때 사용)"""
+    if target_type == 'email':
+        return canonical_email(target_value)
+    if target_type == 'phone':
+        return canonical_phone(target_value)
+    if target_type == 'name':
+        return canonical_name(target_value)
+    return ''
+
+
+class TargetMatcher:
+    """탐색 대상 전체를 한 번에 찾는 매처 (대상 설정 시 한 번만 구성)
+    이메일/전화번호는 통합 정규식으로 후보를 찾아 대표형 집합과 비교하고,
+    이름은 대표형 오토마톤으로 찾아 단어 경계와 한국어 호칭/조사 확장을 확인"""
+
+    def __init__(self, targets: Iterable[Tuple[str, str]]):
+        self.structural: Dict[str, Set[str]] = {'email': set(), 'phone': set()}
+        names = []
+        for target_type, target_value in targets:
+            if not target_value:
+                continue
+            key = target_key(target_type, target_value)
+            if not key:
+                continue
+            if target_type == 'name':
+                names.append(key)
+            else:
+                self.structural[target_type].add(key)
+        self.names = AhoCorasick(names)
+
+    def __bool__(self) -> bool:
+        return bool(self.structural['email'] or self.structural['phone'] or len(self.names))
+
+    def _structural_hits(self, text: str) -> Iterator[TargetHit]:
+        if not (self.structural['email'] or self.structural['phone']):
+            return
+        for match in STRUCTURAL_PATTERN.finditer(text):
+            target_type = match.lastgroup
+            value = match.group()
+            normalized = canonical_email(value) if target_type == 'email' else canonical_phone(value)
+            if normalized in self.structural[target_type]:
+                yield target_type, value, match.start(), match.end(), normalized
+
+    def _name_hits(self, text: str) -> Iterator[TargetHit]:
+        if not len(self.names):
+            return
+        folded = fold_case(text)
+        length = len(text)
+        for end, keyword in self.names.iter_matches(folded):
+            start = end - len(self.names.keywords[keyword])
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            # 이름 뒤에 붙은 한글(씨/님/조사 등)은 값에 포함
+            while end < length and _is_hangul(text[end]):
+                end += 1
+            if end < length and _is_word_char(text[end]):
+                continue
+            yield 'name', text[start:end], start, end, self.names.keywords[keyword]
+
+    def find(self, text: str) -> List[TargetHit]:
+        """본문의 모든 대상 출현 위치 (시작 위치 순, 같은 구간은 한 번만)"""
+        if not text:
+            return []
+        hits = {(start, end, target_type): (value, key)
+                for target_type, value, start, end, key in self._structural_hits(text)}
+        for target_type, value, start, end, key in self._name_hits(text):
+            hits.setdefault((start, end, target_type), (value, key))
+        return [(target_type, value, start, end, key)
+                for (start, end, target_type), (value, key) in sorted(hits.items())]
+
+
+def extract_context(text: str, start: int, end: int, context_length: int) -> str:
+    """발견 위치 주변 컨텍스트 (앞뒤 context_length 문자)"""
+    return text[max(0, start - context_length):min(len(text), end + context_length)].replace('\n', ' ').strip()
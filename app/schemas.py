@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
+from app.config import settings
 
 # 요청 스키마
 class DetectionRequestSchema(BaseModel):
@@ -8,6 +9,12 @@ class DetectionRequestSchema(BaseModel):
     phone: Optional[str] = None
     name: Optional[str] = None
 
+class BulkDetectionRequestSchema(BaseModel):
+    emails: List[str] = Field(default_factory=list, max_length=settings.BULK_DETECTION_MAX_ITEMS)
+    phones: List[str] = Field(default_factory=list, max_length=settings.BULK_DETECTION_MAX_ITEMS)
+    names: List[str] = Field(default_factory=list, max_length=settings.BULK_DETECTION_MAX_ITEMS)
+    since: Optional[str] = Field(default=None, pattern=r'^\d{4}-\d{2}-\d{2}$')  # 이 날짜 이후 처음 알려진 유출 사고만
+
 class UserCreateSchema(BaseModel):
     email: EmailStr
     phone: Optional[str] = None
@@ -42,6 +49,52 @@ class DetectionRequestResponseSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkDetectionItemSchema(BaseModel):
+    target: str
+    is_leaked: bool
+    risk_score: float
+    evidence: Optional[str] = None
+
+class BulkDetectionResponseSchema(BaseModel):
+    emails: List[BulkDetectionItemSchema] = []
+    phones: List[BulkDetectionItemSchema] = []
+    names: List[BulkDetectionItemSchema] = []
+    total_count: int
+    leaked_count: int
+    total_time: float
+
+class CorrelatedRecordSchema(BaseModel):
+    breach: Optional[str] = None
+    first_seen: Optional[str] = None
+    row: int
+    exposed_fields: List[str]
+
+class CorrelationResponseSchema(BaseModel):
+    criteria: List[str]
+    is_leaked: bool
+    record_count: int
+    records: List[CorrelatedRecordSchema] = []
+    exposed_fields: List[str] = []
+    evidence: Optional[str] = None
+    detection_time: float
+
+class DomainBreachSchema(BaseModel):
+    id: int
+    name: Optional[str] = None
+    first_seen: Optional[str] = None
+    accounts: int
+
+class DomainExposureResponseSchema(BaseModel):
+    domain: str
+    is_exposed: bool
+    breach_count: int
+    total_accounts: int
+    distinct_accounts: Optional[int] = None
+    breaches: List[DomainBreachSchema] = []
+    member_digests: Optional[List[str]] = None
+    evidence: Optional[str] = None
+    detection_time: float
+
 class UnsolvedCaseSchema(BaseModel):
     id: int
     user_id: int
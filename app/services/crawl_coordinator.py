@@ -0,0 +1,192 @@
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.crawl_pipeline import CrawlPipeline
+from app.core.osint_crawler import OSINTCrawler
+from app.core.target_matcher import TargetMatcher, target_key
+
+Target = Tuple[str, str]
+
+
+class CrawlSubscriber:
+    """크롤링 라운드에 참여한 탐지 요청 하나 (대상 + 모인 결과)"""
+
+    def __init__(self, targets: List[Target]):
+        self.targets = targets
+        self.keys = {(target_type, target_key(target_type, value)) for target_type, value in targets}
+        self.results: List[Dict] = []
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class CrawlRound:
+    """공유 크롤링 한 회차
+    전체 소스 사이트는 라운드마다 한 번만 가져오고, 가져온 페이지는 참여 중인 모든 요청의 대상을 합친 매처로 한 번에 검색
+    크롤링 도중 참여한 요청은 이미 가져온 페이지를 다시 검색하고 이후 페이지부터 함께 받음"""
+
+    def __init__(self, crawler: OSINTCrawler, window: float):
+        self.crawler = crawler
+        self.window = window
+        self.subscribers: List[CrawlSubscriber] = []
+        self.pages: List[Tuple[Dict, str]] = []
+        self.pipeline: Optional[CrawlPipeline] = None
+        self.finished = False
+        self.late_joins = 0
+        self._matcher = TargetMatcher([])
+        self._owners: Dict[Tuple[str, str], List[CrawlSubscriber]] = {}
+        self._replays: List[asyncio.Task] = []
+
+    @property
+    def accepting(self) -> bool:
+        """새 요청이 참여할 수 있는지 (참여 대기 중이거나 크롤링이 아직 진행 중)"""
+        return not self.finished and (self.pipeline is None or self.pipeline.running)
+
+    def _rebuild_matcher(self):
+        """참여 요청이 바뀔 때 전체 대상 매처와 (타입, 대표형) → 요청 목록 재구성"""
+        self._owners = {}
+        targets = []
+        for subscriber in self.subscribers:
+            targets.extend(subscriber.targets)
+            for key in subscriber.keys:
+                self._owners.setdefault(key, []).append(subscriber)
+        self._matcher = TargetMatcher(targets)
+
+    def join(self, targets: List[Target]) -> CrawlSubscriber:
+        """요청 참여 (크롤링 중이면 해당 요청의 Dork 검색을 추가하고 이미 가져온 페이지 재검색)"""
+        subscriber = CrawlSubscriber(targets)
+        self.subscribers.append(subscriber)
+        self._rebuild_matcher()
+
+        if self.pipeline is not None:
+            self.late_joins += 1
+            for job in self.crawler._dork_jobs(targets):
+                self.pipeline.add(job)
+            if self.pages:
+                self._replays.append(asyncio.create_task(self._replay(subscriber, list(self.pages))))
+        return subscriber
+
+    async def _replay(self, subscriber: CrawlSubscriber, pages: List[Tuple[Dict, str]]):
+        """늦게 참여한 요청의 대상으로 이미 가져온 페이지 검색 (스레드에서 실행)"""
+        matcher = TargetMatcher(subscriber.targets)
+
+        def search() -> List[Dict]:
+            results = []
+            for job, text in pages:
+                results.extend(self.crawler._hit_result(job, text, hit) for hit in matcher.find(text))
+            return results
+
+        subscriber.results.extend(await asyncio.to_thread(search))
+
+    def _match(self, job: Dict, text: str) -> List[Dict]:
+        """매칭 단계: 전체 대상을 한 번에 검색하고 발견 항목을 대상별 요청에 분배"""
+        self.pages.append((job, text))
+        for hit in self._matcher.find(text):
+            result = self.crawler._hit_result(job, text, hit)
+            for subscriber in self._owners.get((hit[0], hit[4]), ()):
+                subscriber.results.append(result)
+        return []
+
+    async def run(self):
+        """참여 대기 → 전체 소스 + 참여 요청 Dork 크롤링 → 모든 참여 요청에 결과 전달"""
+        try:
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+
+            self.pipeline = CrawlPipeline(
+                self.crawler.session, self.crawler._parse_page, self._match,
+                scheduler=self.crawler.scheduler, should_skip=self.crawler._should_skip_url,
+                max_links=self.crawler.max_pages, cache=self.crawler.cache
+            )
+            jobs = self.crawler._source_jobs()
+            for subscriber in self.subscribers:
+                jobs.extend(self.crawler._dork_jobs(subscriber.targets))
+            await self.pipeline.run(jobs)
+        except Exception as e:
+            print(f"❌ 공유 크롤링 오류: {e}")
+        finally:
+            self.finished = True
+            await asyncio.gather(*self._replays, return_exceptions=True)
+            for subscriber in self.subscribers:
+                if not subscriber.future.done():
+                    subscriber.future.set_result(subscriber.results)
+
+
+class CrawlCoordinator:
+    """여러 탐지 요청이 함께 쓰는 OSINT 크롤링 조정자
+    요청마다 크롤러 세션을 따로 열지 않고, 진행 중인 라운드에 대상을 등록해 같은 페이지를 한 번만 가져옴
+    (가져오는 페이지 수가 요청 수가 아니라 고유 URL 수에 비례)
+
+    요청은 각자 다른 이벤트 루프(백그라운드 작업 스레드의 asyncio.run 등)에서 오므로,
+    크롤러 세션과 라운드는 조정자 전용 스레드의 이벤트 루프 하나에서만 다룸"""
+
+    def __init__(self, window: float = settings.SHARED_CRAWL_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._crawler: Optional[OSINTCrawler] = None
+        self._round: Optional[CrawlRound] = None
+        self.stats = {'rounds': 0, 'requests': 0, 'late_joins': 0, 'fetched': 0, 'fetches_saved': 0}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """조정자 이벤트 루프 스레드 시작 (처음 요청 시 한 번)"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="crawl-coordinator", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    async def crawl(self, email: Optional[str] = None, phone: Optional[str] = None,
+                    name: Optional[str] = None) -> List[Dict]:
+        """대상을 진행 중인(없으면 새) 라운드에 등록하고, 라운드가 끝나면 해당 대상의 크롤링 결과 반환"""
+        targets = [(target_type, value) for target_type, value in
+                   (('email', email), ('phone', phone), ('name', name)) if value]
+        if not targets:
+            return []
+        future = asyncio.run_coroutine_threadsafe(self._register(targets), self._ensure_loop())
+        return await asyncio.wrap_future(future)
+
+    async def _register(self, targets: List[Target]) -> List[Dict]:
+        """(조정자 루프) 라운드 참여 후 결과 대기"""
+        if self._crawler is None:
+            self._crawler = await OSINTCrawler().__aenter__()
+
+        if self._round is None or not self._round.accepting:
+            self._round = CrawlRound(self._crawler, self.window)
+            asyncio.create_task(self._run_round(self._round))
+        subscriber = self._round.join(targets)
+        self.stats['requests'] += 1
+        return await subscriber.future
+
+    async def _run_round(self, crawl_round: CrawlRound):
+        await crawl_round.run()
+        fetched = crawl_round.pipeline.stats['fetched'] if crawl_round.pipeline else 0
+        self.stats['rounds'] += 1
+        self.stats['late_joins'] += crawl_round.late_joins
+        self.stats['fetched'] += fetched
+        # 요청마다 따로 크롤링했다면 추가로 가져왔을 페이지 수
+        self.stats['fetches_saved'] += fetched * (len(crawl_round.subscribers) - 1)
+        print(f"🌐 공유 크롤링 완료: 요청 {len(crawl_round.subscribers)}건, 페이지 {fetched}개 "
+              f"({crawl_round.pipeline.get_statistics()['elapsed'] if crawl_round.pipeline else 0}초)")
+        if self._crawler.cache:
+            cache_stats = self._crawler.cache.get_statistics()
+            print(f"💾 HTTP 캐시: 적중률 {cache_stats['hit_rate'] * 100:.1f}%, 절약 {cache_stats['bytes_saved']:,}바이트")
+
+    def get_statistics(self) -> Dict:
+        return {**self.stats, 'active': bool(self._round and self._round.accepting)}
+
+    def close(self):
+        """크롤러 세션 종료 및 루프 스레드 정지"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._crawler is not None:
+            asyncio.run_coroutine_threadsafe(self._crawler.__aexit__(None, None, None), loop).result()
+            self._crawler = None
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
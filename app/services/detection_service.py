@@ -1,12 +1,17 @@
+import os
 import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.models import DetectionRequest, DetectionResult, UnsolvedCase
+from app.models import DetectionRequest, DetectionResult, UnsolvedCase, User
 from app.core.static_detector import StaticLeakDetector
+from app.services.static_index_registry import StaticIndexRegistry
 from app.core.enhanced_osint_crawler import EnhancedOSINTCrawler
-from app.core.demo_data_generator import DemoDataGenerator
+from app.services.crawl_coordinator import CrawlCoordinator
 from app.core.demo_ai_analyzer import DemoAIAnalyzer
 from app.core.free_detector import FreeDetector
 from app.core.gemini_analyzer import GeminiAnalyzer
@@ -14,24 +19,144 @@ from app.config import settings
 
 class DetectionService:
     def __init__(self):
-        self.static_detector = StaticLeakDetector()
         self.gemini_analyzer = GeminiAnalyzer()
-        self.demo_generator = DemoDataGenerator()
         self.demo_ai_analyzer = DemoAIAnalyzer()
         
-        # 유출 데이터베이스 자동 로드 (기존 데이터 사용)
-        try:
-            from scripts.generate_breach_data import load_breach_data_to_system
-            # 기존 데이터가 있으면 사용, 없으면 새로 생성
-            leak_data = load_breach_data_to_system(force_regenerate=False)
-            self.load_leak_database(leak_data)
-            print("✅ 탐지 서비스 초기화 완료 - 유출 데이터베이스 로드됨")
-        except Exception as e:
-            print(f"⚠️ 유출 데이터베이스 로드 실패: {e}")
+        # 버전 관리되는 정적 인덱스 (새 인덱스는 백그라운드 로드 후 무중단 교체)
+        self.static_index = StaticIndexRegistry(loader=self._create_static_detector)
+        
+        # k-익명성 범위 조회 응답 캐시 (인덱스 버전 + 접두사 버킷 단위 LRU)
+        self._range_cache: OrderedDict = OrderedDict()
+        self._range_cache_lock = threading.Lock()
         
-    def load_leak_database(self, leak_data: Dict):
-        """유출 데이터베이스 로드"""
-        self.static_detector.load_leak_database(leak_data)
+        # 동시 탐지 요청이 함께 쓰는 실제 웹 크롤링 (같은 페이지는 한 번만 가져와 모든 요청 대상과 매칭)
+        self.crawl_coordinator = CrawlCoordinator()
+        
+    @property
+    def static_detector(self) -> StaticLeakDetector:
+        """현재 활성 버전의 정적 탐지기"""
+        return self.static_index.active.detector
+        
+    def _create_static_detector(self) -> StaticLeakDetector:
+        """정적 탐지기 생성 (바이너리 스냅샷 → 디스크 세그먼트 인덱스 → JSON 유출 데이터 순)"""
+        # 미리 빌드한 스냅샷이 있으면 mmap만으로 즉시 사용 (코퍼스 크기와 무관하게 밀리초 단위 시작)
+        if settings.STATIC_SNAPSHOT_PATH and os.path.exists(settings.STATIC_SNAPSHOT_PATH):
+            try:
+                detector = StaticLeakDetector(snapshot_path=settings.STATIC_SNAPSHOT_PATH,
+                                              shard_addresses=settings.STATIC_SHARD_ADDRESSES,
+                                              password_hash_path=settings.PASSWORD_HASH_PATH,
+                                              record_store_dir=settings.RECORD_STORE_DIR)
+                print("✅ 탐지 서비스 초기화 완료 - 정적 인덱스 스냅샷 로드됨")
+                return detector
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 정적 인덱스 스냅샷 로드 실패: {e}")
+        
+        detector = StaticLeakDetector(index_dir=settings.STATIC_INDEX_DIR,
+                                      shard_addresses=settings.STATIC_SHARD_ADDRESSES,
+                                      password_hash_path=settings.PASSWORD_HASH_PATH,
+                                      record_store_dir=settings.RECORD_STORE_DIR)
+        
+        # 디스크 인덱스가 이미 있으면 mmap으로 바로 사용 (JSON 재로딩 생략)
+        if detector.is_loaded():
+            print("✅ 탐지 서비스 초기화 완료 - 정적 인덱스 mmap 로드됨")
+            return detector
+        
+        # 여러 워커 프로세스가 동시에 시작해도 JSON 로드는 한 프로세스만 수행
+        # (나머지는 생성된 세그먼트를 mmap으로 열어 같은 페이지 캐시를 공유)
+        with detector.segments.build_lock():
+            detector.segments.refresh()
+            if detector.is_loaded():
+                print("✅ 탐지 서비스 초기화 완료 - 다른 프로세스가 생성한 정적 인덱스 mmap 로드됨")
+                return detector
+            
+            # 유출 데이터베이스 자동 로드 (기존 데이터 사용)
+            try:
+                from scripts.generate_breach_data import load_breach_data_to_system
+                # 기존 데이터가 있으면 사용, 없으면 새로 생성
+                leak_data = load_breach_data_to_system(force_regenerate=False)
+                detector.load_leak_database(leak_data)
+                print("✅ 탐지 서비스 초기화 완료 - 유출 데이터베이스 로드됨")
+            except Exception as e:
+                print(f"⚠️ 유출 데이터베이스 로드 실패: {e}")
+        
+        return detector
+        
+    def load_leak_database(self, leak_data: Dict) -> int:
+        """유출 데이터베이스 로드 (활성 인덱스에 새 세그먼트로 추가, 반환값: 새 유출 사고 번호)"""
+        with self.static_index.acquire() as detector:
+            if not detector.segments.persistent:
+                # 스냅샷은 읽기 전용 - 추가한 세그먼트가 이 프로세스 메모리에만 남아 다른 워커/역방향 조인에서 보이지 않음
+                raise RuntimeError("스냅샷 모드에서는 유출 데이터베이스를 추가할 수 없습니다. "
+                                   "인덱스 디렉터리에 추가한 뒤 scripts/build_index_snapshot.py로 스냅샷을 다시 빌드하세요.")
+            stats = detector.load_leak_database(leak_data)
+        return stats['segment']['id']
+    
+    def reload_static_index(self) -> Dict:
+        """정적 인덱스 새 버전을 백그라운드에서 로드하여 교체"""
+        started = self.static_index.reload_async()
+        status = self.static_index.get_status()
+        status['reload_started'] = started
+        return status
+    
+    def perform_bulk_detection(self, emails: Optional[List[str]] = None,
+                               phones: Optional[List[str]] = None,
+                               names: Optional[List[str]] = None,
+                               since: Optional[str] = None) -> Dict:
+        """정적 DB 일괄 탐지 (타입별 배치 조회 1회, DB 기록 없음, since 지정 시 그 날짜 이후 유출 사고만)"""
+        self.static_index.check_for_update()
+        
+        with self.static_index.acquire() as detector:
+            results = detector.detect_many(emails=emails, phones=phones, names=names, since=since)
+        
+        items = results['emails'] + results['phones'] + results['names']
+        results['total_count'] = len(items)
+        results['leaked_count'] = sum(1 for item in items if item['is_leaked'])
+        return results
+    
+    def correlate_records(self, email: Optional[str] = None, phone: Optional[str] = None,
+                          name: Optional[str] = None) -> Dict:
+        """유출 레코드 교차 조회 (같은 레코드에 함께 유출된 식별자와 추가 노출 항목, DB 기록 없음)"""
+        self.static_index.check_for_update()
+        
+        with self.static_index.acquire() as detector:
+            return detector.correlate_records(email=email, phone=phone, name=name,
+                                              limit=settings.RECORD_CORRELATION_LIMIT)
+    
+    def domain_exposure(self, domain: str, include_members: bool = False) -> Dict:
+        """조직 도메인 노출 조회 (도메인 집계 한 번으로 유출 사고별 계정 수, DB 기록 없음)"""
+        self.static_index.check_for_update()
+        
+        with self.static_index.acquire() as detector:
+            return detector.domain_exposure(domain, include_members=include_members)
+    
+    def range_query(self, field: str, prefix: str) -> Dict:
+        """k-익명성 범위 조회 (평문 없이 해시 접두사만 받음) - 결과는 접두사 버킷별로 캐시"""
+        self.static_index.check_for_update()
+        
+        # 버전 번호는 빌린 버전에서 읽음 (조회 도중 교체되어도 이전 인덱스 결과가 새 버전 키로 캐시되지 않음)
+        # 같은 버전에도 이 프로세스에서 세그먼트가 추가될 수 있으므로 세그먼트 저장소 버전과 해시 파일 시각도 키에 포함
+        with self.static_index.acquire_version() as version:
+            detector = version.detector
+            key = (version.version, detector.segments.version, detector.password_hash_mtime, field, prefix.upper())
+            with self._range_cache_lock:
+                cached = self._range_cache.get(key)
+                if cached is not None:
+                    self._range_cache.move_to_end(key)
+                    return cached
+            
+            suffixes = detector.range_query(field, prefix)
+        
+        body = ''.join(f"{suffix}\n" for suffix in suffixes)
+        entry = {
+            'body': body,
+            'count': len(suffixes),
+            'etag': f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+        }
+        with self._range_cache_lock:
+            self._range_cache[key] = entry
+            while len(self._range_cache) > settings.RANGE_CACHE_SIZE:
+                self._range_cache.popitem(last=False)
+        return entry
     
     async def perform_api_detection(self, email: Optional[str] = None,
                                    phone: Optional[str] = None,
@@ -237,13 +362,17 @@ class DetectionService:
     def _perform_static_detection_sync(self, email: Optional[str], 
                                        phone: Optional[str], 
                                        name: Optional[str]) -> List[Dict]:
-        """정적 DB 탐지 수행 (동기 버전) - 데모 최적화"""
+        """정적 DB 탐지 수행 (동기 버전)"""
         print("🔍 정적 DB 탐지 시작...")
         
+        # 다른 프로세스에서 인덱스가 갱신되었으면 백그라운드 교체 시작
+        self.static_index.check_for_update()
+        
         # 기존 정적 탐지 수행
-        static_results = self.static_detector.detect_all(
-            email=email, phone=phone, name=name
-        )
+        with self.static_index.acquire() as detector:
+            static_results = detector.detect_all(
+                email=email, phone=phone, name=name
+            )
         
         results = []
         for result_type, result in static_results.items():
@@ -258,13 +387,7 @@ class DetectionService:
                     'detection_time': result['detection_time']
                 })
         
-        # 데모용 향상된 정적 탐지 결과 추가
-        enhanced_results = self.demo_generator.generate_enhanced_static_results(
-            email=email, phone=phone, name=name
-        )
-        results.extend(enhanced_results)
-        
-        print(f"✅ 정적 DB 탐지 완료: {len(results)}개 결과 (향상된 데모 모드)")
+        print(f"✅ 정적 DB 탐지 완료: {len(results)}개 결과")
         return results
     
     async def _perform_static_detection(self, email: Optional[str], 
@@ -273,9 +396,12 @@ class DetectionService:
         """정적 DB 탐지 수행"""
         print("정적 DB 탐지 시작...")
         
-        static_results = self.static_detector.detect_all(
-            email=email, phone=phone, name=name
-        )
+        self.static_index.check_for_update()
+        
+        with self.static_index.acquire() as detector:
+            static_results = detector.detect_all(
+                email=email, phone=phone, name=name
+            )
         
         results = []
         for result_type, result in static_results.items():
@@ -299,9 +425,20 @@ class DetectionService:
         """Enhanced OSINT 크롤링 수행 (데모 최적화)"""
         print("🔍 Enhanced OSINT 크롤링 시작...")
         
-        async with EnhancedOSINTCrawler() as crawler:
-            crawler.set_search_targets(email=email, phone=phone, name=name)
-            crawled_data = await crawler.crawl_all_sources()
+        if settings.SHARED_CRAWL_ENABLED:
+            # 실제 사이트 크롤링 (시뮬레이션 크롤러 대신, 진행 중인 다른 요청과 같은 페이지를 한 번만 가져옴)
+            try:
+                crawled_data = await asyncio.wait_for(
+                    self.crawl_coordinator.crawl(email=email, phone=phone, name=name),
+                    settings.DETECTION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                print(f"⚠️ 공유 크롤링 시간 초과 ({settings.DETECTION_TIMEOUT}초) - 크롤링 결과 없이 진행")
+                crawled_data = []
+        else:
+            async with EnhancedOSINTCrawler() as crawler:
+                crawler.set_search_targets(email=email, phone=phone, name=name)
+                crawled_data = await crawler.crawl_all_sources()
         
         print(f"✅ Enhanced OSINT 크롤링 완료: {len(crawled_data)}개 데이터")
         return crawled_data
@@ -425,6 +562,106 @@ class DetectionService:
         
         db.commit()
     
+    def _monitored_identifiers(self, db: Session):
+        """감시 대상 식별자 (사용자 번호, 탐지 타입, 값) - users 테이블과 과거 탐지 요청 대상"""
+        for user_id, email, phone, name in db.query(User.id, User.email, User.phone, User.name).yield_per(1000):
+            yield user_id, 'email', email
+            yield user_id, 'phone', phone
+            yield user_id, 'name', name
+        
+        requests = db.query(DetectionRequest.user_id, DetectionRequest.target_email,
+                            DetectionRequest.target_phone, DetectionRequest.target_name)
+        for user_id, email, phone, name in requests.yield_per(1000):
+            if user_id is None:
+                continue
+            yield user_id, 'email', email
+            yield user_id, 'phone', phone
+            yield user_id, 'name', name
+    
+    def scan_new_breach(self, db: Session, breach_id: int) -> Dict:
+        """새 유출 사고를 모든 감시 대상과 역방향 조인하여 영향받은 사용자마다 탐지 결과/미제사건 생성
+        같은 유출 사고로 이미 기록한 (사용자, 값)은 건너뛰므로 여러 번 실행해도 중복 생성되지 않음"""
+        self.static_index.check_for_update()
+        
+        # 수집 스크립트/다른 워커가 방금 추가한 유출 사고면 활성 버전에 아직 없음 - 백그라운드 재로딩을 기다리지 않고 바로 반영
+        with self.static_index.acquire() as detector:
+            known = breach_id in detector.segments.breaches
+        if not known:
+            self.static_index.reload_if_stale()
+        
+        with self.static_index.acquire() as detector:
+            joined = detector.match_breach(breach_id, self._monitored_identifiers(db))
+        
+        breach = joined['breach']
+        source = f"breach://{breach_id}"
+        already_recorded = set(
+            db.query(DetectionRequest.user_id, DetectionResult.target_value)
+            .join(DetectionRequest, DetectionRequest.id == DetectionResult.request_id)
+            .filter(DetectionResult.source_url == source)
+            .all()
+        )
+        
+        by_user: Dict[int, List[Dict]] = {}
+        for match in joined['matches']:
+            if (match['user_id'], match['value']) not in already_recorded:
+                by_user.setdefault(match['user_id'], []).append(match)
+        
+        now = datetime.utcnow()
+        evidence = f"신규 유출 사고에서 발견됨: {breach['name']}({breach['first_seen']})"
+        for user_id, matches in by_user.items():
+            values = {match['field']: match['value'] for match in matches}
+            detection_request = DetectionRequest(
+                user_id=user_id,
+                target_email=values.get('email'),
+                target_phone=values.get('phone'),
+                target_name=values.get('name'),
+                status="completed",
+                completed_at=now
+            )
+            db.add(detection_request)
+            db.flush()
+            
+            for match in matches:
+                db_result = DetectionResult(
+                    request_id=detection_request.id,
+                    detection_type='static_db',
+                    target_value=match['value'],
+                    is_leaked=True,
+                    risk_score=1.0,
+                    evidence=evidence,
+                    source_url=source
+                )
+                db.add(db_result)
+                db.flush()
+                
+                db.add(UnsolvedCase(
+                    user_id=user_id,
+                    detection_result_id=db_result.id,
+                    case_type="confirmed_leak",
+                    description=f"신규 유출 사고 탐지: {match['value']}",
+                    evidence_data={
+                        'target_value': match['value'],
+                        'detection_type': match['field'],
+                        'breach': breach,
+                        'risk_score': 1.0,
+                        'evidence': evidence,
+                        'source_url': source
+                    }
+                ))
+        
+        db.commit()
+        print(f"✅ 유출 사고 #{breach_id} 역방향 조인 완료: 감시 {joined['monitored']:,}건, "
+              f"영향 사용자 {len(by_user)}명 ({joined['join_time']:.1f}ms)")
+        
+        return {
+            'breach': breach,
+            'monitored': joined['monitored'],
+            'matches': len(joined['matches']),
+            'affected_users': len(by_user),
+            'new_results': sum(len(matches) for matches in by_user.values()),
+            'join_time': joined['join_time']
+        }
+    
     def get_detection_summary(self, db: Session, user_id: int) -> Dict:
         """탐지 요약 정보 조회"""
         from sqlalchemy import func
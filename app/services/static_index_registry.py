@@ -0,0 +1,137 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+from app.config import settings
+from app.core.static_detector import StaticLeakDetector
+
+
+class StaticIndexVersion:
+    """정적 인덱스 버전 (탐지기 + 진행 중인 조회 참조 수)"""
+
+    def __init__(self, version: int, detector: StaticLeakDetector):
+        self.version = version
+        self.detector = detector
+        self.loaded_at = time.time()
+        self.refs = 0
+        self.retired = False
+
+
+class StaticIndexRegistry:
+    """정적 인덱스 핫 스왑 관리자 (더블 버퍼링 + 참조 카운트 기반 해제)"""
+
+    def __init__(self, loader: Callable[[], StaticLeakDetector],
+                 check_interval: float = settings.STATIC_INDEX_CHECK_INTERVAL):
+        self.loader = loader
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._next_version = 1
+        self._last_check = time.time()
+        self._active = self._new_version(loader())
+
+    def _new_version(self, detector: StaticLeakDetector) -> StaticIndexVersion:
+        version = StaticIndexVersion(self._next_version, detector)
+        self._next_version += 1
+        return version
+
+    @property
+    def active(self) -> StaticIndexVersion:
+        return self._active
+
+    @contextmanager
+    def acquire(self) -> Iterator[StaticLeakDetector]:
+        """현재 활성 버전의 탐지기를 빌려 사용 (사용 중에는 해제되지 않음)"""
+        with self.acquire_version() as version:
+            yield version.detector
+
+    @contextmanager
+    def acquire_version(self) -> Iterator[StaticIndexVersion]:
+        """현재 활성 버전을 빌려 사용 (탐지기와 버전 번호를 같은 시점으로 묶어야 할 때)"""
+        with self._lock:
+            version = self._active
+            version.refs += 1
+        try:
+            yield version
+        finally:
+            with self._lock:
+                version.refs -= 1
+                release = version.retired and version.refs == 0
+            if release:
+                self._release(version)
+
+    def swap(self, detector: StaticLeakDetector) -> StaticIndexVersion:
+        """새 탐지기를 원자적으로 활성화하고, 이전 버전은 조회가 모두 끝나면 해제"""
+        with self._lock:
+            old = self._active
+            self._active = self._new_version(detector)
+            old.retired = True
+            release = old.refs == 0
+
+        print(f"🔄 정적 인덱스 교체: v{old.version} → v{self._active.version}")
+        if release:
+            self._release(old)
+        return self._active
+
+    def _release(self, version: StaticIndexVersion):
+        """이전 버전 자원 해제 (병합 스레드 대기가 있을 수 있어 별도 스레드에서 수행)"""
+        def close():
+            version.detector.close()
+            print(f"🧹 정적 인덱스 v{version.version} 해제 완료")
+
+        threading.Thread(target=close, name=f"static-index-release-{version.version}", daemon=True).start()
+
+    def reload(self) -> Optional[StaticIndexVersion]:
+        """새 버전을 로드한 뒤 교체 (이미 다른 재로딩이 진행 중이면 None)"""
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            detector = self.loader()
+            return self.swap(detector)
+        finally:
+            self._reload_lock.release()
+
+    def reload_if_stale(self) -> bool:
+        """디스크 인덱스가 활성 버전보다 새로우면 즉시 재로딩 후 교체 (진행 중인 재로딩이 있으면 끝날 때까지 대기)
+        방금 추가된 세그먼트를 바로 조회해야 하는 작업용 - 주기 확인/백그라운드 재로딩을 기다리지 않음"""
+        with self._reload_lock:
+            if not self._active.detector.index_changed():
+                return False
+            self.swap(self.loader())
+            return True
+
+    def reload_async(self) -> bool:
+        """백그라운드에서 새 버전 로드 후 교체 (로드 중에도 기존 버전으로 계속 조회)"""
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.reload, name='static-index-reload', daemon=True).start()
+        return True
+
+    def check_for_update(self) -> bool:
+        """다른 프로세스가 인덱스(세그먼트/레코드 저장소)를 갱신했는지 주기적으로 확인하고 변경 시 백그라운드 재로딩"""
+        now = time.time()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        try:
+            if not self._active.detector.index_changed():
+                return False
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 정적 인덱스 버전 확인 실패: {e}")
+            return False
+
+        return self.reload_async()
+
+    def get_status(self) -> Dict:
+        """활성 버전 상태 정보"""
+        active = self._active
+        return {
+            'version': active.version,
+            'index_version': active.detector.segments.version,
+            'loaded_at': active.loaded_at,
+            'in_flight': active.refs,
+            'reloading': self._reload_lock.locked()
+        }
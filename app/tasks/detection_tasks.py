@@ -1,5 +1,6 @@
 from app.services.detection_service import DetectionService
 from app.database import SessionLocal
+from app.config import settings
 from celery_app import celery_app
 import asyncio
 
@@ -83,6 +84,20 @@ def run_detection_task(self, user_id: int, request_id: int, email: str = None, p
         
         raise e
 
+@celery_app.task(bind=True, max_retries=settings.BREACH_SCAN_MAX_RETRIES,
+                 default_retry_delay=settings.BREACH_SCAN_RETRY_DELAY)
+def scan_new_breach_task(self, breach_id: int):
+    """새 유출 사고를 모든 감시 대상(users, 과거 탐지 요청)과 역방향 조인하여 영향받은 사용자에게 결과 생성
+    재로딩 후에도 유출 사고가 없으면(매니페스트 기록 전 등) 잠시 뒤 재시도"""
+    db = SessionLocal()
+    try:
+        return detection_service.scan_new_breach(db, breach_id)
+    except ValueError as e:
+        print(f"⚠️ 유출 사고 #{breach_id} 역방향 조인 재시도 예정: {e}")
+        raise self.retry(exc=e)
+    finally:
+        db.close()
+
 @celery_app.task
 def monitor_ongoing_leaks():
     """지속적인 유출 모니터링 작업"""
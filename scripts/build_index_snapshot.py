@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+정적 유출 DB 바이너리 스냅샷 생성 스크립트
+세그먼트 인덱스를 하나로 병합해 버전이 기록된 단일 스냅샷 파일로 저장합니다.
+API/워커는 이 파일을 mmap으로 열어 JSON 파싱이나 해시 계산 없이 바로 조회합니다.
+"""
+
+import sys
+import os
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.core.segment_store import SegmentStore
+from app.core.index_snapshot import write_snapshot
+from scripts.build_static_index import build_static_index
+
+def main():
+    parser = argparse.ArgumentParser(description="정적 인덱스 바이너리 스냅샷 생성")
+    parser.add_argument('--index-dir', default=settings.STATIC_INDEX_DIR, help="원본 세그먼트 인덱스 디렉터리")
+    parser.add_argument('--output', default=settings.STATIC_SNAPSHOT_PATH, help="스냅샷 파일 경로")
+    args = parser.parse_args()
+
+    store = SegmentStore(args.index_dir, background_compaction=False)
+    if not store.segments:
+        # 세그먼트 인덱스가 없으면 JSON 유출 데이터로 먼저 생성
+        store.close()
+        build_static_index(args.index_dir)
+        store = SegmentStore(args.index_dir, background_compaction=False)
+
+    try:
+        print(f"📦 스냅샷 생성 중: {args.index_dir} → {args.output}")
+        info = write_snapshot(store, args.output)
+    finally:
+        store.close()
+
+    print(f"✅ 스냅샷 생성 완료: v{info['version']}, {info['size_bytes']:,}바이트, {info['elapsed']:.2f}초")
+    print(f"   필드별 항목 수: {info['counts']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+비밀번호 해시 파일 생성 스크립트
+유출 비밀번호를 평문 없이 (해시, 출현 횟수) 고정 폭 레코드로 정렬 저장합니다.
+- Pwned Passwords 형식 해시 목록('해시:횟수', 해시 순 정렬)은 스트리밍으로 변환 (수십억 건도 메모리 일정)
+- 평문 비밀번호 목록(rockyou.txt 등)은 청크별로 집계 후 외부 병합 정렬하여 저장 (메모리 상한 INGEST_SORT_BUFFER_RECORDS)
+"""
+
+import sys
+import os
+import gzip
+import time
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.core.password_hashes import count_passwords, parse_hash_lines, write_password_hashes
+
+def open_text(path: str):
+    """텍스트 파일 열기 (.gz 지원, 깨진 바이트는 무시)"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='ignore')
+    return open(path, 'r', encoding='utf-8', errors='ignore')
+
+def main():
+    parser = argparse.ArgumentParser(description="정렬된 비밀번호 해시 + 출현 횟수 파일 생성")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--hash-list', help="Pwned Passwords 형식 해시 목록 ('16진수해시:횟수', 해시 순 정렬)")
+    source.add_argument('--passwords', help="평문 비밀번호 목록 (한 줄에 하나, 같은 비밀번호 반복 시 횟수 증가)")
+    parser.add_argument('--algorithm', choices=['sha1', 'sha256'], default='sha1', help="해시 알고리즘")
+    parser.add_argument('--output', default=settings.PASSWORD_HASH_PATH, help="출력 파일 경로")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    if args.hash_list:
+        print(f"📥 해시 목록 변환 중: {args.hash_list}")
+        with open_text(args.hash_list) as f:
+            count = write_password_hashes(args.output, parse_hash_lines(f), algorithm=args.algorithm)
+    else:
+        if args.passwords:
+            print(f"📥 비밀번호 목록 집계 중: {args.passwords}")
+            with open_text(args.passwords) as f:
+                passwords = (line.rstrip('\r\n') for line in f)
+                count = write_password_hashes(args.output, count_passwords(passwords, args.algorithm),
+                                              algorithm=args.algorithm)
+        else:
+            # 입력이 없으면 기존 유출 데이터의 비밀번호 사용
+            from scripts.generate_breach_data import load_breach_data_to_system
+            passwords = load_breach_data_to_system(force_regenerate=False).get('passwords', [])
+            count = write_password_hashes(args.output, count_passwords(passwords, args.algorithm),
+                                          algorithm=args.algorithm)
+
+    print(f"✅ 비밀번호 해시 파일 생성 완료: {args.output}")
+    print(f"   {args.algorithm} 해시 {count:,}개, {os.path.getsize(args.output):,}바이트, {time.time() - start_time:.2f}초")
+
+if __name__ == "__main__":
+    main()
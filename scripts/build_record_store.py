@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+컬럼형 유출 레코드 저장소 생성 스크립트
+레코드(email, name, phone, birthday, gender, ip, address, password_pattern)를 행 구조 그대로
+컬럼별 파일과 식별자 다이제스트 인덱스로 저장합니다.
+- CSV (batch.py가 만든 breach_sample_data.csv 등, 헤더에 컬럼 이름)
+- 입력이 없으면 breach_database.json의 records 사용
+"""
+
+import sys
+import os
+import csv
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.core.record_store import RECORD_COLUMNS, RecordStore
+from scripts.generate_breach_data import load_breach_data_to_system
+
+def iter_csv_records(path: str):
+    """CSV 행을 레코드로 읽기 (알 수 없는 컬럼은 무시)"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {column: row.get(column) for column in RECORD_COLUMNS}
+
+def main():
+    parser = argparse.ArgumentParser(description="컬럼형 유출 레코드 저장소 생성")
+    parser.add_argument('csv_files', nargs='*', help="레코드 CSV 파일 (파일 하나 = 유출 사고 하나)")
+    parser.add_argument('--output', default=settings.RECORD_STORE_DIR, help="레코드 저장소 디렉터리")
+    parser.add_argument('--name', help="유출 사고 이름 (기본: 파일 이름)")
+    parser.add_argument('--first-seen', help="유출 사고가 처음 알려진 날짜 (YYYY-MM-DD, 기본 오늘)")
+    args = parser.parse_args()
+
+    store = RecordStore(args.output)
+    try:
+        if args.csv_files:
+            for path in args.csv_files:
+                batch = store.add_batch(iter_csv_records(path), name=args.name or os.path.basename(path),
+                                        first_seen=args.first_seen)
+                print(f"✅ {path}: 레코드 {batch.row_count:,}개 → 배치 #{batch.batch_id}")
+        else:
+            breach_data = load_breach_data_to_system(force_regenerate=False)
+            records = (breach_data or {}).get('records')
+            if not records:
+                print("❌ breach_database.json에 레코드가 없습니다 (generate_breach_data.py로 다시 생성하거나 CSV를 지정하세요)")
+                sys.exit(1)
+            batch = store.add_batch(records, name=args.name or "breach_database.json", first_seen=args.first_seen)
+            print(f"✅ breach_database.json: 레코드 {batch.row_count:,}개 → 배치 #{batch.batch_id}")
+
+        stats = store.get_statistics()
+        print(f"📦 레코드 저장소: {args.output} (배치 {len(stats['batches'])}개, 레코드 {stats['rows']:,}개)")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
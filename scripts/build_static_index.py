@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+정적 유출 DB 다이제스트 인덱스 생성 스크립트
+breach_database.json을 정렬된 SHA256 다이제스트 파일로 변환합니다.
+"""
+
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.core.static_detector import StaticLeakDetector
+from scripts.generate_breach_data import load_breach_data_to_system
+
+def build_static_index(index_dir: str = settings.STATIC_INDEX_DIR):
+    """유출 데이터를 mmap 다이제스트 인덱스로 저장"""
+
+    breach_data = load_breach_data_to_system(force_regenerate=False)
+    if not breach_data:
+        print("❌ 유출 데이터를 불러오지 못했습니다.")
+        sys.exit(1)
+
+    print(f"🔧 다이제스트 인덱스 생성 중: {index_dir}")
+    detector = StaticLeakDetector(index_dir=index_dir)
+    detector.load_leak_database(breach_data, name="breach_database.json")
+
+    print(f"✅ 인덱스 생성 완료: {index_dir}")
+
+if __name__ == "__main__":
+    build_static_index(sys.argv[1] if len(sys.argv) > 1 else settings.STATIC_INDEX_DIR)
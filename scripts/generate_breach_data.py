@@ -37,7 +37,8 @@ def create_breach_database(num_samples=1000):
         'emails': [],
         'phones': [],
         'names': [],
-        'passwords': []
+        'passwords': [],
+        'records': []  # 레코드 단위 원본 (컬럼형 레코드 저장소용)
     }
     
     for i in range(num_samples):
@@ -54,22 +55,31 @@ def create_breach_database(num_samples=1000):
         breach_data['phones'].append(phone)
         breach_data['names'].append(name)
         breach_data['passwords'].extend(password_patterns)
+        breach_data['records'].append({
+            'email': email,
+            'name': name,
+            'phone': phone,
+            'birthday': fake.date_of_birth(minimum_age=18, maximum_age=65).strftime("%Y-%m-%d"),
+            'gender': random.choice(["M", "F"]),
+            'ip': fake.ipv4(),
+            'address': fake.address().split('\n')[0],
+            'password_pattern': ','.join(password_patterns)
+        })
         
         # 진행률 표시
         if (i + 1) % 100 == 0:
             print(f"   {i + 1}/{num_samples} 완료...")
     
-    # 중복 제거
-    breach_data['emails'] = list(set(breach_data['emails']))
-    breach_data['phones'] = list(set(breach_data['phones']))
-    breach_data['names'] = list(set(breach_data['names']))
-    breach_data['passwords'] = list(set(breach_data['passwords']))
+    # 중복 제거 (샘플 데이터는 이미 메모리에 있으므로 집합으로 충분, 정렬해 두면 재생성 결과 비교가 쉬움)
+    for key in ('emails', 'phones', 'names', 'passwords'):
+        breach_data[key] = sorted(set(breach_data[key]))
     
     print(f"✅ 유출 데이터 생성 완료!")
     print(f"   📧 이메일: {len(breach_data['emails'])}개")
     print(f"   📞 전화번호: {len(breach_data['phones'])}개")
     print(f"   👤 이름: {len(breach_data['names'])}개")
     print(f"   🔑 비밀번호 패턴: {len(breach_data['passwords'])}개")
+    print(f"   🗂️ 레코드: {len(breach_data['records'])}개")
     
     return breach_data
 
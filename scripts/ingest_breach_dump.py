@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+대용량 유출 덤프 수집 스크립트
+콤보 리스트(email:password), CSV, gzip/zip 압축 파일을 스트리밍으로 읽어
+정적 유출 DB 인덱스에 새 세그먼트로 추가합니다.
+"""
+
+import sys
+import os
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.core.breach_ingest import BreachDumpIngestor
+
+def main():
+    parser = argparse.ArgumentParser(description="유출 덤프 파일을 정적 인덱스로 수집")
+    parser.add_argument('paths', nargs='+', help="덤프 파일 경로 (.txt, .csv, .gz, .zip)")
+    parser.add_argument('--index-dir', default=settings.STATIC_INDEX_DIR, help="인덱스 디렉터리")
+    parser.add_argument('--workers', type=int, default=None, help="해시 워커 프로세스 수")
+    parser.add_argument('--chunk-lines', type=int, default=settings.INGEST_CHUNK_LINES, help="청크당 줄 수")
+    parser.add_argument('--merge-fan-in', type=int, default=settings.INGEST_MERGE_FAN_IN,
+                        help="한 번에 병합할 런 파일 수 (초과 시 워커들이 단계별로 병렬 병합)")
+    parser.add_argument('--name', default=None, help="유출 사고 이름 (세그먼트 메타데이터)")
+    parser.add_argument('--first-seen', default=None, help="유출 사고가 처음 알려진 날짜 (YYYY-MM-DD, 기본: 오늘)")
+    parser.add_argument('--format', choices=['combo', 'csv'], default=None, help="덤프 형식 (기본: 확장자로 추정)")
+    parser.add_argument('--no-scan', action='store_true', help="수집 후 등록 사용자 역방향 조인 작업을 예약하지 않음")
+    args = parser.parse_args()
+
+    ingestor = BreachDumpIngestor(
+        index_dir=args.index_dir,
+        workers=args.workers,
+        chunk_lines=args.chunk_lines,
+        merge_fan_in=args.merge_fan_in
+    )
+    result = ingestor.ingest(args.paths, dump_format=args.format, name=args.name or os.path.basename(args.paths[0]),
+                             first_seen=args.first_seen)
+
+    if not args.no_scan:
+        # 새 유출 사고에 포함된 등록 사용자 찾기는 Celery 워커가 수행 (이 스크립트에서 탐지 서비스를 띄우지 않음)
+        try:
+            from celery_app import celery_app
+            celery_app.send_task('app.tasks.detection_tasks.scan_new_breach_task', args=[result['segment_id']])
+            print(f"✅ 역방향 조인 작업이 큐에 추가됨: 유출 사고 #{result['segment_id']}")
+        except Exception as e:
+            print(f"⚠️ 역방향 조인 작업 큐 추가 실패: {e} (POST /detection/breaches/{result['segment_id']}/scan 으로 다시 실행)")
+
+if __name__ == "__main__":
+    main()
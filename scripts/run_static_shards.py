@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+정적 유출 DB 샤드 실행 스크립트
+기존 인덱스를 다이제스트 접두사 범위별 샤드로 분할하고,
+샤드마다 조회 서버 프로세스를 띄웁니다 (한 대의 리눅스 서버에서 모두 실행 가능).
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.core.shard_server import partition_index, serve_shard, shard_bits_for, shard_dir_for
+
+def main():
+    parser = argparse.ArgumentParser(description="해시 접두사 샤드 분할 및 샤드 서버 실행")
+    parser.add_argument('--shards', type=int, default=4, help="샤드 수 (2의 거듭제곱)")
+    parser.add_argument('--source-dir', default=settings.STATIC_INDEX_DIR, help="분할할 원본 인덱스 디렉터리")
+    parser.add_argument('--shard-root', default='data/static_shards', help="샤드 인덱스 루트 디렉터리")
+    parser.add_argument('--host', default='127.0.0.1', help="바인드 주소")
+    parser.add_argument('--base-port', type=int, default=7100, help="첫 샤드 포트 (샤드 번호만큼 증가)")
+    parser.add_argument('--partition', action='store_true', help="원본 인덱스를 샤드로 분할한 뒤 실행")
+    parser.add_argument('--only', type=int, default=None, help="지정한 샤드 하나만 실행 (노드별 배치용)")
+    args = parser.parse_args()
+
+    shard_bits_for(args.shards)
+
+    if args.partition:
+        print(f"🔪 인덱스 분할 중: {args.source_dir} → {args.shard_root} ({args.shards}개)")
+        for result in partition_index(args.source_dir, args.shard_root, args.shards):
+            print(f"  shard-{result['shard']:02d}: {result['counts']}")
+
+    shards = [args.only] if args.only is not None else range(args.shards)
+    processes = []
+    for shard in shards:
+        process = multiprocessing.Process(
+            target=serve_shard,
+            args=(shard_dir_for(args.shard_root, shard), args.host, args.base_port + shard),
+            name=f"static-shard-{shard}"
+        )
+        process.start()
+        processes.append(process)
+
+    addresses = ','.join(f"{args.host}:{args.base_port + shard}" for shard in range(args.shards))
+    print(f"📡 STATIC_SHARD_ADDRESSES={addresses}")
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+if __name__ == "__main__":
+    main()